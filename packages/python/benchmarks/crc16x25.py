@@ -0,0 +1,59 @@
+"""Compare the CRC-16/X.25 implementation against the original bitwise loop.
+
+Run from packages/python:
+
+    python benchmarks/crc16x25.py
+"""
+from __future__ import annotations
+
+import random
+import timeit
+
+from qraudio.codec.crc16x25 import Crc16X25, crc16X25
+
+
+def bitwise_crc16X25(data: bytes) -> int:
+    crc = 0xFFFF
+    for byte in data:
+        x = byte
+        for _ in range(8):
+            bit = (crc ^ x) & 0x01
+            crc >>= 1
+            if bit:
+                crc ^= 0x8408
+            x >>= 1
+    return (~crc) & 0xFFFF
+
+
+def main() -> None:
+    rng = random.Random(0)
+    # Candidate spans as the deframer emits them in noise: mostly short junk,
+    # plus a few full-size frames.
+    spans = [bytes(rng.randrange(256) for _ in range(rng.randrange(10, 64))) for _ in range(2000)]
+    spans += [bytes(rng.randrange(256) for _ in range(2048)) for _ in range(20)]
+    total_bytes = sum(len(span) for span in spans)
+    assert all(crc16X25(span) == bitwise_crc16X25(span) for span in spans)
+
+    def streamed() -> None:
+        for span in spans:
+            crc = Crc16X25()
+            for start in range(0, len(span), 16):
+                crc.update(span[start : start + 16])
+            crc.value
+
+    cases = [
+        ("bitwise", lambda: [bitwise_crc16X25(span) for span in spans]),
+        ("crc16X25", lambda: [crc16X25(span) for span in spans]),
+        ("Crc16X25, 16-byte updates", streamed),
+    ]
+    baseline = None
+    print(f"{len(spans)} spans, {total_bytes} bytes")
+    for name, run in cases:
+        seconds = min(timeit.repeat(run, number=1, repeat=5))
+        baseline = baseline or seconds
+        rate = total_bytes / seconds / 1e6
+        print(f"{name:28s} {seconds * 1000:9.2f} ms  {rate:8.2f} MB/s  {baseline / seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from .profiles import ProfileName, PROFILE_NAMES, DEFAULT_PROFILE, isProfile, normalizeProfile
 from .encode import encode
-from .decode import decode, scan
+from .decode import FrameCache, decode, locateBursts, probe, scan
+from .streamScanner import StreamScanner
 from .io.wav import (
     encodeWav,
     decodeWav,
@@ -11,6 +12,8 @@ from .io.wav import (
     encodeWavSamples,
     decodeWavSamples,
 )
+from .io.wavReader import WavReader, openWav
+from .io.batch import encodeMany, scanMany
 from .io.fs import (
     encodeWavFile,
     decodeWavFile,
@@ -21,9 +24,14 @@ from .types import (
     EncodeResult,
     DecodeResult,
     ScanResult,
+    ProbeRegion,
     EncodeWavResult,
     PrependWavResult,
+    BatchEncodeResult,
+    BatchScanResult,
     WavData,
+    Samples,
+    SamplesFormat,
 )
 
 __all__ = [
@@ -35,20 +43,33 @@ __all__ = [
     "encode",
     "decode",
     "scan",
+    "probe",
+    "locateBursts",
+    "FrameCache",
+    "StreamScanner",
     "encodeWav",
     "decodeWav",
     "scanWav",
     "prependPayloadToWav",
     "encodeWavSamples",
     "decodeWavSamples",
+    "WavReader",
+    "openWav",
     "encodeWavFile",
     "decodeWavFile",
     "scanWavFile",
     "prependPayloadToWavFile",
+    "encodeMany",
+    "scanMany",
     "EncodeResult",
     "DecodeResult",
     "ScanResult",
+    "ProbeRegion",
     "EncodeWavResult",
     "PrependWavResult",
+    "BatchEncodeResult",
+    "BatchScanResult",
     "WavData",
+    "Samples",
+    "SamplesFormat",
 ]
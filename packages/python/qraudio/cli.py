@@ -4,9 +4,10 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import IO, Iterator, Optional
 
-from . import PROFILE_NAMES, decodeWav, encodeWav, prependPayloadToWav, scanWav
+from . import PROFILE_NAMES, decodeWav, encodeMany, encodeWav, prependPayloadToWav, scanMany, scanWav, scanWavFile
+from .types import BatchScanResult
 
 PROFILE_CHOICES = [profile.value for profile in PROFILE_NAMES]
 
@@ -20,6 +21,74 @@ def _read_json(path: Optional[str]) -> object:
     return json.loads(data)
 
 
+def _read_jsonl(path: str) -> Iterator[object]:
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _scan_inputs(in_dir: Optional[str], pattern: str, file_list: Optional[str]) -> list[str]:
+    if in_dir:
+        return [str(path) for path in sorted(Path(in_dir).glob(pattern)) if path.is_file()]
+    handle = sys.stdin if file_list == "-" else open(str(file_list), encoding="utf-8")
+    with handle:
+        return [line.strip() for line in handle if line.strip()]
+
+
+def _scanned_files(path: str) -> set[str]:
+    """Files already finished in a JSONL scan output, which is only ever appended to.
+
+    Each file's detections are followed by one status record, so records
+    after the last status record belong to a file that was interrupted. They
+    are left in place and closed off with an ``interrupted`` status record,
+    and lines cut off mid-write are skipped, so the resumed run's records
+    start a fresh block.
+    """
+    done: set[str] = set()
+    pending = False
+    last = b"\n"
+    with open(path, "rb") as handle:
+        for line in handle:
+            last = line
+            if not line.strip():
+                continue
+            pending = True
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "status" in record:
+                pending = False
+                if record["status"] == "done":
+                    done.add(record["file"])
+    if pending:
+        with open(path, "a", encoding="utf-8") as handle:
+            if not last.endswith(b"\n"):
+                handle.write("\n")
+            handle.write(json.dumps({"status": "interrupted"}) + "\n")
+    return done
+
+
+def _write_scan_records(out: IO[str], batch: BatchScanResult) -> None:
+    records = [
+        {
+            "file": batch.path,
+            "profile": result.profile.value,
+            "startSample": result.startSample,
+            "endSample": result.endSample,
+            "payload": result.json,
+        }
+        for result in batch.results
+    ]
+    status: dict[str, object] = {"file": batch.path, "status": "done", "detections": len(batch.results)}
+    if batch.error is not None:
+        status = {"file": batch.path, "status": "error", "error": batch.error}
+    records.append(status)
+    out.write("".join(json.dumps(record) + "\n" for record in records))
+    out.flush()
+
+
 def _read_wav(path: Optional[str]) -> bytes:
     if path:
         return Path(path).read_bytes()
@@ -47,6 +116,9 @@ def main(argv: Optional[list[str]] = None) -> int:
     encode_parser.add_argument("--format", dest="wav_format", choices=["pcm16", "float32"], default="pcm16")
     encode_parser.add_argument("--gzip", action="store_true")
     encode_parser.add_argument("--no-fec", action="store_true")
+    encode_parser.add_argument("--batch", dest="batch_file", help="Path to JSONL file with one payload per line")
+    encode_parser.add_argument("--out-dir", dest="out_dir", help="Directory for --batch WAVs and manifest.jsonl")
+    encode_parser.add_argument("--workers", type=int, help="Worker processes for --batch")
 
     decode_parser = subparsers.add_parser("decode", help="Decode WAV to JSON payload")
     decode_parser.add_argument("--in", dest="in_path", help="Path to input WAV file")
@@ -55,6 +127,12 @@ def main(argv: Optional[list[str]] = None) -> int:
     scan_parser = subparsers.add_parser("scan", help="Scan WAV for payloads")
     scan_parser.add_argument("--in", dest="in_path", help="Path to input WAV file")
     scan_parser.add_argument("--profile", choices=PROFILE_CHOICES)
+    scan_parser.add_argument("--in-dir", dest="in_dir", help="Scan every WAV in this directory")
+    scan_parser.add_argument("--pattern", default="**/*.wav", help="Glob for --in-dir (default: **/*.wav)")
+    scan_parser.add_argument("--files", dest="file_list", help="Text file listing one WAV path per line ('-' for stdin)")
+    scan_parser.add_argument("--workers", type=int, help="Worker processes for --in-dir/--files")
+    scan_parser.add_argument("--out", dest="out_path", help="JSONL output for --in-dir/--files (default: stdout)")
+    scan_parser.add_argument("--resume", action="store_true", help="Skip files already finished in --out")
 
     prepend_parser = subparsers.add_parser("prepend", help="Prepend payload to an existing WAV")
     prepend_parser.add_argument("--in", dest="in_path", required=True, help="Path to input WAV file")
@@ -71,6 +149,33 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = parser.parse_args(argv)
 
     try:
+        if args.command == "encode" and args.batch_file:
+            if not args.out_dir:
+                raise ValueError("--batch requires --out-dir")
+            Path(args.out_dir).mkdir(parents=True, exist_ok=True)
+            results = encodeMany(
+                _read_jsonl(args.batch_file),
+                out_dir=args.out_dir,
+                workers=args.workers,
+                profile=args.profile,
+                wav_format=args.wav_format,
+                gzip=args.gzip,
+                fec=not args.no_fec,
+            )
+            with open(Path(args.out_dir) / "manifest.jsonl", "w", encoding="utf-8") as manifest:
+                for result in results:
+                    entry = {
+                        "index": result.index,
+                        "path": Path(result.path).name if result.path else None,
+                        "profile": result.profile.value,
+                        "durationMs": result.durationMs,
+                        "payloadBytes": result.payloadBytes,
+                        "wavBytes": result.wavBytes,
+                    }
+                    manifest.write(json.dumps(entry) + "\n")
+                    manifest.flush()
+            return 0
+
         if args.command == "encode":
             payload = _read_json(args.payload_file)
             result = encodeWav(
@@ -79,6 +184,7 @@ def main(argv: Optional[list[str]] = None) -> int:
                 wav_format=args.wav_format,
                 gzip=args.gzip,
                 fec=not args.no_fec,
+                return_samples=False,
             )
             _write_wav(result.wav, args.out_path)
             return 0
@@ -89,9 +195,28 @@ def main(argv: Optional[list[str]] = None) -> int:
             sys.stdout.write(json.dumps(decoded.json))
             return 0
 
+        if args.command == "scan" and (args.in_dir or args.file_list):
+            paths = _scan_inputs(args.in_dir, args.pattern, args.file_list)
+            if args.resume:
+                if not args.out_path:
+                    raise ValueError("--resume requires --out")
+                if Path(args.out_path).exists():
+                    finished = _scanned_files(args.out_path)
+                    paths = [path for path in paths if path not in finished]
+            out = open(args.out_path, "a" if args.resume else "w", encoding="utf-8") if args.out_path else sys.stdout
+            try:
+                for batch in scanMany(paths, workers=args.workers, profile=args.profile):
+                    _write_scan_records(out, batch)
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+            return 0
+
         if args.command == "scan":
-            wav_bytes = _read_wav(args.in_path)
-            results = scanWav(wav_bytes=wav_bytes, profile=args.profile)
+            if args.in_path and args.in_path != "-":
+                results = scanWavFile(path=args.in_path, profile=args.profile)
+            else:
+                results = scanWav(wav_bytes=_read_wav(None), profile=args.profile)
             payloads = [result.json for result in results]
             sys.stdout.write(json.dumps(payloads))
             return 0
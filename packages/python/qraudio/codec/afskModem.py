@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 import math
+from operator import ge
+from typing import Optional, Sequence
 
 from .envelope import applyFade
+from .goertzel import goertzelBank, symbolWindows
+from .tone import cachedTones, synthesizeTones
+from .toneCorrelator import ToneCorrelator
 
 
 def tonesToSamples(
@@ -14,26 +19,36 @@ def tonesToSamples(
     space_freq: float,
     level_db: float,
     fade_ms: float,
+    cached_prefix: int = 0,
 ) -> list[float]:
+    """Phase-continuous AFSK audio, one bit per tone, faded in and out.
+
+    The first ``cached_prefix`` tones are the same in every call (the
+    preamble flags), so their audio comes from ``cachedTones`` and the rest
+    is synthesized on from the phase where they end.
+    """
     samples_per_bit = sample_rate / baud
     total_samples = math.ceil(len(tones) * samples_per_bit)
-    out: list[float] = [0.0] * total_samples
     amplitude = 10 ** (level_db / 20.0)
+    freqs = [mark_freq if tone == 1 else space_freq for tone in tones]
+    prefix = max(0, min(cached_prefix, len(freqs) - 1))
 
-    phase = 0.0
-    sample_index = 0
-    boundary = samples_per_bit
-
-    for tone in tones:
-        freq = mark_freq if tone == 1 else space_freq
-        phase_step = (2 * math.pi * freq) / sample_rate
-        while sample_index < boundary and sample_index < total_samples:
-            phase += phase_step
-            if phase > math.pi * 2:
-                phase -= math.pi * 2
-            out[sample_index] = math.sin(phase) * amplitude
-            sample_index += 1
-        boundary += samples_per_bit
+    out, state = cachedTones(
+        freqs[:prefix],
+        sample_rate=sample_rate,
+        samples_per_symbol=samples_per_bit,
+        amplitude=amplitude,
+    )
+    rest, _ = synthesizeTones(
+        freqs[prefix:],
+        sample_rate=sample_rate,
+        samples_per_symbol=samples_per_bit,
+        amplitude=amplitude,
+        limit=total_samples,
+        state=state,
+    )
+    out.extend(rest)
+    out.extend([0.0] * (total_samples - len(out)))
 
     applyFade(out, sample_rate, fade_ms)
     return out
@@ -47,45 +62,23 @@ def demodAfsk(
     offset: int,
     mark_freq: float,
     space_freq: float,
-) -> list[int]:
+    correlator: Optional[ToneCorrelator] = None,
+) -> bytes:
+    """Tone per bit at ``offset``, one byte each: 1 for mark, 0 for space."""
     samples_per_bit = sample_rate / baud
-    tones: list[int] = []
-
-    start = offset
-    boundary = start + samples_per_bit
-
-    while boundary <= len(samples):
-        end = math.floor(boundary)
-        length = end - start
-        if length <= 1:
-            start = end
-            boundary += samples_per_bit
-            continue
-        mark_energy = goertzel(samples=samples, start=start, length=length, freq=mark_freq, sample_rate=sample_rate)
-        space_energy = goertzel(samples=samples, start=start, length=length, freq=space_freq, sample_rate=sample_rate)
-        tones.append(1 if mark_energy >= space_energy else 0)
-        start = end
-        boundary += samples_per_bit
+    windows = symbolWindows(sample_count=len(samples), samples_per_symbol=samples_per_bit, offset=offset)
+    if correlator is not None:
+        mark_energy, space_energy = correlator.energies(windows, [mark_freq, space_freq])
+    else:
+        mark_energy, space_energy = goertzelBank(
+            samples=samples,
+            windows=windows,
+            freqs=[mark_freq, space_freq],
+            sample_rate=sample_rate,
+        )
+    return sliceTones(mark_energy, space_energy)
 
-    return tones
 
-
-def goertzel(
-    *,
-    samples: list[float],
-    start: int,
-    length: int,
-    freq: float,
-    sample_rate: float,
-) -> float:
-    omega = (2 * math.pi * freq) / sample_rate
-    coeff = 2 * math.cos(omega)
-    s0 = 0.0
-    s1 = 0.0
-    s2 = 0.0
-    end = start + length
-    for i in range(start, end):
-        s0 = samples[i] + coeff * s1 - s2
-        s2 = s1
-        s1 = s0
-    return s1 * s1 + s2 * s2 - coeff * s1 * s2
+def sliceTones(mark_energy: Sequence[float], space_energy: Sequence[float]) -> bytes:
+    """1 where the mark energy is at least the space energy, else 0, one byte per window."""
+    return bytes(map(ge, mark_energy, space_energy))
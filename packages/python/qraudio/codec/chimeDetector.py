@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from itertools import accumulate
+from operator import mul
+from typing import Sequence
+
+from .decimator import decimate
+from .energyGate import SILENCE_POWER
+from .toneCorrelator import ToneCorrelator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Spacing of the candidate chime starts tried by the matched filter.
+CHIME_STEP_MS = 2.5
+# The filter reads every ``stride``-th sample of the low-passed audio, keeping
+# at least this many samples per cycle of the highest chime tone, so the tones
+# sit well inside the decimator's passband.
+CHIME_MIN_SAMPLES_PER_CYCLE = 4
+# Input samples per matched-filter pass (about 87 s at 48 kHz); bounds the
+# prefix-power table and correlator built over each strided batch.
+CHIME_BATCH_SAMPLES = 1 << 22
+
+
+@dataclass(frozen=True)
+class ChimeSignature:
+    """Two consecutive tones of ``toneSamples`` each, ``gapSamples`` apart."""
+
+    firstFreq: float
+    secondFreq: float
+    toneSamples: int
+    gapSamples: int
+
+    @property
+    def length(self) -> int:
+        return 2 * self.toneSamples + self.gapSamples
+
+
+def chimeScores(
+    samples: Sequence[float],
+    sample_rate: float,
+    signatures: Sequence[ChimeSignature],
+    starts: Sequence[int],
+    stride: int = 1,
+) -> list[list[float]]:
+    """Matched-filter score of every signature at every candidate start.
+
+    Each tone's window is scored by the fraction of its energy at the tone's
+    frequency, normalized so a steady sine scores 1.0 and noise about
+    ``2 / toneSamples``. A chime scores the lower of its two tones, so a
+    single long tone, or the right tones in the wrong order, stay low.
+    With ``stride`` above 1 the audio is low-passed by ``decimate`` before
+    every ``stride``-th sample is read, so out-of-band audio does not fold
+    onto the tones. Starts must be multiples of ``stride`` and leave room for
+    the whole signature in ``samples``.
+    """
+    freqs = sorted({freq for signature in signatures for freq in (signature.firstFreq, signature.secondFreq)})
+    data = decimate(samples, stride) if stride > 1 else samples
+    if np is not None:
+        data = np.asarray(data, dtype=np.float64)
+        power = np.zeros(len(data) + 1, dtype=np.float64)
+        np.cumsum(data * data, out=power[1:])
+        power = power.tolist()
+    else:
+        power = list(accumulate(map(mul, data, data), initial=0.0))
+    correlator = ToneCorrelator(data, sample_rate / stride, freqs)
+    starts = [start // stride for start in starts]
+
+    out: list[list[float]] = []
+    for signature in signatures:
+        length = max(1, round(signature.toneSamples / stride))
+        second = length + round(signature.gapSamples / stride)
+        first_energy = correlator.energies([(start, length) for start in starts], [signature.firstFreq])[0]
+        second_energy = correlator.energies([(start + second, length) for start in starts], [signature.secondFreq])[0]
+        floor = SILENCE_POWER * length
+        scale = 2.0 / length
+        scores: list[float] = []
+        for start, energy_a, energy_b in zip(starts, first_energy, second_energy):
+            power_a = power[start + length] - power[start]
+            power_b = power[start + second + length] - power[start + second]
+            if power_a <= floor or power_b <= floor:
+                scores.append(0.0)
+            else:
+                scores.append(scale * min(energy_a / power_a, energy_b / power_b))
+        out.append(scores)
+    return out
+
+
+def chimePeaks(
+    starts: Sequence[int],
+    scores: Sequence[float],
+    threshold: float,
+    min_distance: int,
+) -> list[tuple[int, float]]:
+    """Best ``(start, score)`` of each cluster of starts scoring at least ``threshold``.
+
+    Starts closer than ``min_distance`` samples to the current best belong to
+    the same cluster, so a chime yields a single peak.
+    """
+    peaks: list[tuple[int, float]] = []
+    for start, score in zip(starts, scores):
+        if score < threshold:
+            continue
+        if peaks and start - peaks[-1][0] < min_distance:
+            if score > peaks[-1][1]:
+                peaks[-1] = (start, score)
+            continue
+        peaks.append((start, score))
+    return peaks
+
+
+def chimeStride(sample_rate: float, signatures: Sequence[ChimeSignature]) -> int:
+    highest = max(max(signature.firstFreq, signature.secondFreq) for signature in signatures)
+    return max(1, math.floor(sample_rate / (CHIME_MIN_SAMPLES_PER_CYCLE * highest)))
+
+
+def chimeStep(sample_rate: float, stride: int) -> int:
+    """Candidate spacing in samples, a whole number of strides."""
+    return stride * max(1, round((CHIME_STEP_MS / 1000.0) * sample_rate / stride))
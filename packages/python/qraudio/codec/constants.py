@@ -13,3 +13,5 @@ PROFILE_SMOOTH = 3 << PROFILE_SHIFT
 RS_DATA_LEN = 223
 RS_PARITY_LEN = 32
 RS_BLOCK_LEN = RS_DATA_LEN + RS_PARITY_LEN
+
+MAX_PAYLOAD_LENGTH = 0xFFFF
@@ -1,15 +1,49 @@
 from __future__ import annotations
 
+from binascii import crc_hqx
+
+# CRC-16/X.25 is the bit-reflected form of the CRC-CCITT that binascii.crc_hqx
+# computes in C (polynomial 0x1021, MSB first). Feeding it bit-reversed bytes
+# and reversing the 16-bit register gives the X.25 value, with init and final
+# XOR 0xFFFF unaffected by the reversal.
+_REVERSE_BITS = bytes(int(f"{value:08b}"[::-1], 2) for value in range(256))
+_INIT = 0xFFFF
+
 
 def crc16X25(data: bytes) -> int:
-    crc = 0xFFFF
-    for byte in data:
-        x = byte
-        for _ in range(8):
-            bit = (crc ^ x) & 0x01
-            crc >>= 1
-            if bit:
-                crc ^= 0x8408
-            x >>= 1
-    crc = (~crc) & 0xFFFF
-    return crc
+    return _finish(crc_hqx(bytes(data).translate(_REVERSE_BITS), _INIT))
+
+
+class Crc16X25:
+    """Incremental CRC-16/X.25 over data that arrives in pieces.
+
+    ``Crc16X25(a + b).value == Crc16X25(a).update(b).value == crc16X25(a + b)``.
+    ``digest()`` returns the CRC in frame order (low byte first).
+    """
+
+    def __init__(self, data: bytes = b"") -> None:
+        self._register = _INIT
+        if data:
+            self.update(data)
+
+    def update(self, data: bytes) -> Crc16X25:
+        self._register = crc_hqx(bytes(data).translate(_REVERSE_BITS), self._register)
+        return self
+
+    @property
+    def value(self) -> int:
+        return _finish(self._register)
+
+    def digest(self) -> bytes:
+        value = self.value
+        return bytes([value & 0xFF, (value >> 8) & 0xFF])
+
+    def copy(self) -> Crc16X25:
+        other = Crc16X25()
+        other._register = self._register
+        return other
+
+
+def _finish(register: int) -> int:
+    reflected = (_REVERSE_BITS[register & 0xFF] << 8) | _REVERSE_BITS[register >> 8]
+    return (~reflected) & 0xFFFF
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import math
+from array import array
+from operator import mul
+from typing import Sequence
+
+from .segmentCache import segmentCache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Low-pass taps per unit of decimation factor; the transition band narrows as
+# the filter grows, so the stopband starts near the decimated Nyquist rate.
+DECIMATE_TAPS_PER_FACTOR = 24
+# Passband edge (the -6 dB point) as a fraction of the decimated Nyquist rate.
+DECIMATE_CUTOFF = 0.8
+# Samples per symbol, divided by the modulation index, that the correlator
+# and the discriminator need to slice bits at whole-sample offsets without errors.
+DECIMATE_EYE_SAMPLES = 7.0
+# Output samples computed per block, bounding the float64 working set.
+DECIMATE_BLOCK_SAMPLES = 1 << 15
+
+
+def decimateTaps(factor: int) -> tuple[float, ...]:
+    """Blackman-windowed sinc low-pass for decimating by ``factor``, unit DC gain.
+
+    The taps are symmetric with an odd count, so output ``k`` is centred on
+    input sample ``k * factor`` with no group delay to correct.
+    """
+    return segmentCache.get(("decimate", factor), lambda: _windowedSinc(factor))
+
+
+def decimate(samples: Sequence[float], factor: int):
+    """Band-limit ``samples`` and keep every ``factor``-th sample.
+
+    Only the kept outputs are filtered, the polyphase saving, and the input
+    is read in blocks, so it can be any sliceable container including a
+    ``WavReader``. The edges are zero-padded. Returns ``ceil(len / factor)``
+    samples as a NumPy ``float64`` array when NumPy is installed and an
+    ``array('d')`` otherwise.
+    """
+    taps = decimateTaps(factor)
+    half = len(taps) // 2
+    length = len(samples)
+    count = -(-length // factor)
+    if np is not None:
+        out = np.zeros(count, dtype=np.float64)
+        weights = np.asarray(taps, dtype=np.float64)
+    else:
+        out = array("d")
+    for first in range(0, count, DECIMATE_BLOCK_SAMPLES):
+        last = min(count, first + DECIMATE_BLOCK_SAMPLES)
+        lo = first * factor - half
+        hi = (last - 1) * factor + half + 1
+        block = samples[max(0, lo) : min(length, hi)]
+        pad_left = max(0, -lo)
+        pad_right = max(0, hi - length)
+        if np is not None:
+            padded = np.concatenate(
+                [np.zeros(pad_left), np.asarray(block, dtype=np.float64), np.zeros(pad_right)]
+            )
+            windows = np.lib.stride_tricks.sliding_window_view(padded, len(taps))[::factor]
+            out[first:last] = windows @ weights
+            continue
+        padded = [0.0] * pad_left + list(block) + [0.0] * pad_right
+        out.extend(
+            sum(map(mul, taps, padded[start : start + len(taps)]))
+            for start in range(0, (last - first) * factor, factor)
+        )
+    return out
+
+
+def _windowedSinc(factor: int) -> tuple[float, ...]:
+    count = DECIMATE_TAPS_PER_FACTOR * factor + 1
+    center = count // 2
+    cutoff = DECIMATE_CUTOFF * 0.5 / factor
+    taps = []
+    for n in range(count):
+        x = n - center
+        ideal = 2 * cutoff if x == 0 else math.sin(2 * math.pi * cutoff * x) / (math.pi * x)
+        window = 0.42 - 0.5 * math.cos(2 * math.pi * n / (count - 1)) + 0.08 * math.cos(4 * math.pi * n / (count - 1))
+        taps.append(ideal * window)
+    total = sum(taps)
+    return tuple(tap / total for tap in taps)
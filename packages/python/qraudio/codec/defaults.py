@@ -2,3 +2,6 @@ DEFAULT_SAMPLE_RATE = 48000
 DEFAULT_PREAMBLE_MS = 500
 DEFAULT_FADE_MS = 10
 DEFAULT_LEVEL_DB = -12
+DEFAULT_GATE_THRESHOLD = 0.4
+DEFAULT_GATE_MARGIN_MS = 50
+DEFAULT_CHIME_THRESHOLD = 0.5
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import math
+from operator import mul
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Blocks quieter than this mean power (about -70 dBFS) never count as in-band.
+SILENCE_POWER = 1e-7
+
+GATE_BLOCK_MS = 20
+GATE_BRIDGE_MS = 60
+GATE_MIN_MS = 100
+# Blocks scored per pass: 3000 of GATE_BLOCK_MS is one minute of audio, so the
+# per-block tone scores of a long recording are computed a minute at a time.
+GATE_BATCH_BLOCKS = 3000
+
+
+def blockToneScores(
+    samples: Sequence[float],
+    sample_rate: float,
+    freqs: Sequence[float],
+    window: int,
+    windows_per_block: int,
+) -> list[float]:
+    """Fraction of each block's energy that sits on the tones in ``freqs``.
+
+    Every block is split into ``windows_per_block`` windows of ``window``
+    samples (about one symbol). The tone energies of each window are summed
+    incoherently, so a keyed FSK signal on these tones scores close to 1.0
+    while white noise scores about ``2 * len(freqs) / window`` and silence 0.
+    Trailing samples that do not fill a whole block are ignored.
+    """
+    block_size = window * windows_per_block
+    block_count = len(samples) // block_size
+    if block_count == 0:
+        return []
+    scale = 2.0 / window
+    omegas = [(2 * math.pi * freq) / sample_rate for freq in freqs]
+
+    if np is not None:
+        frames = np.asarray(samples[: block_count * block_size], dtype=np.float64).reshape(-1, window)
+        power = np.einsum("ij,ij->i", frames, frames).reshape(block_count, windows_per_block).sum(axis=1)
+        index = np.arange(window, dtype=np.float64)
+        tone_energy = np.zeros(len(frames), dtype=np.float64)
+        for omega in omegas:
+            in_phase = frames @ np.cos(omega * index)
+            quadrature = frames @ np.sin(omega * index)
+            tone_energy += in_phase * in_phase + quadrature * quadrature
+        tone_energy = tone_energy.reshape(block_count, windows_per_block).sum(axis=1)
+        quiet = power <= SILENCE_POWER * block_size
+        scores = scale * tone_energy / np.where(quiet, 1.0, power)
+        return np.where(quiet, 0.0, scores).tolist()
+
+    tables = [
+        ([math.cos(omega * n) for n in range(window)], [math.sin(omega * n) for n in range(window)])
+        for omega in omegas
+    ]
+    scores = [0.0] * block_count
+    for b in range(block_count):
+        block_start = b * block_size
+        power = 0.0
+        tone_energy = 0.0
+        for w in range(windows_per_block):
+            frame = samples[block_start + w * window : block_start + (w + 1) * window]
+            power += sum(map(mul, frame, frame))
+            for cos_table, sin_table in tables:
+                in_phase = sum(map(mul, frame, cos_table))
+                quadrature = sum(map(mul, frame, sin_table))
+                tone_energy += in_phase * in_phase + quadrature * quadrature
+        if power > SILENCE_POWER * block_size:
+            scores[b] = scale * tone_energy / power
+    return scores
+
+
+def candidateSpans(
+    scores: Sequence[float],
+    threshold: float,
+    bridge: int,
+    min_length: int,
+) -> list[tuple[int, int]]:
+    """Merge runs of blocks scoring at least ``threshold`` into [start, end) spans.
+
+    Runs separated by at most ``bridge`` low-scoring blocks are joined, and
+    spans shorter than ``min_length`` blocks are dropped.
+    """
+    spans: list[tuple[int, int]] = []
+    start = -1
+    last = -1
+    for index, score in enumerate(scores):
+        if score < threshold:
+            continue
+        if start >= 0 and index - last - 1 <= bridge:
+            last = index
+            continue
+        if start >= 0 and last + 1 - start >= min_length:
+            spans.append((start, last + 1))
+        start = index
+        last = index
+    if start >= 0 and last + 1 - start >= min_length:
+        spans.append((start, last + 1))
+    return spans
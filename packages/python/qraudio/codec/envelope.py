@@ -3,13 +3,23 @@ from __future__ import annotations
 import math
 from typing import MutableSequence
 
+from .segmentCache import segmentCache
+
 
 def applyFade(samples: MutableSequence[float], sample_rate: float, fade_ms: float) -> None:
     fade_samples = max(0, round((fade_ms / 1000.0) * sample_rate))
     if fade_samples == 0 or fade_samples * 2 > len(samples):
         return
-    for i in range(fade_samples):
-        t = i / fade_samples
-        gain = 0.5 * (1 - math.cos(math.pi * t))
+    last = len(samples) - 1
+    for i, gain in enumerate(fadeCurve(fade_samples)):
         samples[i] *= gain
-        samples[len(samples) - 1 - i] *= gain
+        samples[last - i] *= gain
+
+
+def fadeCurve(fade_samples: int) -> tuple[float, ...]:
+    """Raised-cosine gains for a fade-in of ``fade_samples``, shared between calls."""
+    return segmentCache.get(("fade", fade_samples), lambda: _raisedCosine(fade_samples))
+
+
+def _raisedCosine(fade_samples: int) -> tuple[float, ...]:
+    return tuple(0.5 * (1 - math.cos(math.pi * (i / fade_samples))) for i in range(fade_samples))
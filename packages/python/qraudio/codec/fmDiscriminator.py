@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import math
+from itertools import accumulate
+from operator import add, mul, sub
+from typing import Optional, Sequence
+
+from .goertzel import symbolWindows
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+class FmDiscriminator:
+    """Instantaneous frequency of a two-tone FSK signal, summed for bit slicing.
+
+    The samples are mixed to complex baseband at the midpoint of the two
+    tones and low-passed with a centred boxcar one period of twice that
+    frequency long, which nulls the mixing image. The phase step between
+    neighbouring baseband samples is the instantaneous frequency offset; the
+    steps are accumulated, so the mean offset of any window at any symbol
+    offset is read out with one subtraction.
+    """
+
+    def __init__(self, samples: Sequence[float], sample_rate: float, mark_freq: float, space_freq: float) -> None:
+        self.sampleRate = sample_rate
+        self.markFreq = mark_freq
+        self.spaceFreq = space_freq
+        self.length = len(samples)
+        center = (mark_freq + space_freq) / 2.0
+        half = max(1, round(sample_rate / (4.0 * center)))
+        omega = (2 * math.pi * center) / sample_rate
+        if np is not None:
+            self._steps = _phase_steps_numpy(samples, self.length, omega, half)
+        else:
+            self._steps = _phase_steps(samples, self.length, omega, half)
+
+    def deviations(self, windows: Sequence[tuple[int, int]]) -> list[float]:
+        """Summed phase steps per (start, length) window: positive above the centre frequency."""
+        steps = self._steps
+        if np is not None:
+            starts = np.fromiter((start for start, _ in windows), dtype=np.intp, count=len(windows))
+            ends = starts + np.fromiter((length for _, length in windows), dtype=np.intp, count=len(windows))
+            return (steps[ends] - steps[starts]).tolist()
+        return [steps[start + length] - steps[start] for start, length in windows]
+
+
+def demodFm(
+    *,
+    samples: Sequence[float],
+    sample_rate: float,
+    baud: float,
+    offset: int,
+    mark_freq: float,
+    space_freq: float,
+    discriminator: Optional[FmDiscriminator] = None,
+) -> bytes:
+    """Tone per bit at ``offset``, one byte each, like ``demodAfsk``: 1 for mark, 0 for space."""
+    if discriminator is None:
+        discriminator = FmDiscriminator(samples, sample_rate, mark_freq, space_freq)
+    windows = symbolWindows(sample_count=discriminator.length, samples_per_symbol=sample_rate / baud, offset=offset)
+    deviations = discriminator.deviations(windows)
+    if mark_freq > space_freq:
+        return bytes(deviation > 0 for deviation in deviations)
+    return bytes(deviation <= 0 for deviation in deviations)
+
+
+def _phase_steps(samples: Sequence[float], length: int, omega: float, half: int) -> list[float]:
+    phases = [omega * n for n in range(length)]
+    cum_i = list(accumulate(map(mul, samples, map(math.cos, phases)), initial=0.0))
+    cum_q = list(accumulate(map(mul, samples, map(math.sin, phases)), initial=0.0))
+    base_i = _boxcar(cum_i, length, half)
+    base_q = _boxcar(cum_q, length, half)
+    # The signal is mixed with e^{+j omega n}, so a tone above the centre
+    # turns clockwise at baseband. The phase step from n - 1 to n is taken as
+    # the angle of conj(z[n]) * z[n - 1], positive above the centre.
+    cross = map(sub, map(mul, base_i[1:], base_q), map(mul, base_q[1:], base_i))
+    dot = map(add, map(mul, base_i[1:], base_i), map(mul, base_q[1:], base_q))
+    return [0.0] + list(accumulate(map(math.atan2, cross, dot), initial=0.0))
+
+
+def _boxcar(cum: list[float], length: int, half: int) -> list[float]:
+    """Centred boxcar sums: sample n sums n - half .. n + half - 1, clipped at the edges."""
+    if length <= 2 * half:
+        return [cum[min(length, n + half)] - cum[max(0, n - half)] for n in range(length)]
+    head = [cum[n + half] for n in range(half)]
+    middle = list(map(sub, cum[2 * half :], cum[: length + 1 - 2 * half]))
+    tail = [cum[length] - cum[n - half] for n in range(length + 1 - half, length)]
+    return head + middle + tail
+
+
+def _phase_steps_numpy(samples: Sequence[float], length: int, omega: float, half: int):
+    data = np.asarray(samples, dtype=np.float64)
+    phase = omega * np.arange(length, dtype=np.float64)
+    cum_i = np.zeros(length + 1, dtype=np.float64)
+    cum_q = np.zeros(length + 1, dtype=np.float64)
+    np.cumsum(data * np.cos(phase), out=cum_i[1:])
+    np.cumsum(data * np.sin(phase), out=cum_q[1:])
+    index = np.arange(length, dtype=np.intp)
+    ends = np.minimum(length, index + half)
+    starts = np.maximum(0, index - half)
+    base_i = cum_i[ends] - cum_i[starts]
+    base_q = cum_q[ends] - cum_q[starts]
+    cross = base_i[1:] * base_q[:-1] - base_q[1:] * base_i[:-1]
+    dot = base_i[:-1] * base_i[1:] + base_q[:-1] * base_q[1:]
+    steps = np.zeros(length + 1, dtype=np.float64)
+    np.cumsum(np.arctan2(cross, dot), out=steps[2:])
+    return steps
@@ -5,10 +5,22 @@ from typing import Optional
 
 from .bytes import concatBytes
 from .crc16x25 import crc16X25
-from .constants import FLAG_FEC, FLAG_GZIP, MAGIC, VERSION
+from .constants import (
+    FLAG_FEC,
+    FLAG_GZIP,
+    MAGIC,
+    MAX_PAYLOAD_LENGTH,
+    RS_BLOCK_LEN,
+    RS_DATA_LEN,
+    VERSION,
+)
 from .profile import profileFromFlags
 from ..profiles import Profile
 
+# Magic, version, flags and big-endian payload length.
+HEADER_LENGTH = 4 + 1 + 1 + 2
+CRC_LENGTH = 2
+
 
 @dataclass
 class FrameHeader:
@@ -29,7 +41,7 @@ class ParsedFrame:
 
 
 def buildFrame(payloadWithFec: bytes, payloadLength: int, flags: int) -> bytes:
-    header = bytearray(4 + 1 + 1 + 2)
+    header = bytearray(HEADER_LENGTH)
     header[0:4] = MAGIC
     header[4] = VERSION
     header[5] = flags & 0xFF
@@ -43,19 +55,19 @@ def buildFrame(payloadWithFec: bytes, payloadLength: int, flags: int) -> bytes:
 
 
 def parseFrame(data: bytes) -> Optional[ParsedFrame]:
-    if len(data) < 4 + 1 + 1 + 2 + 2:
-        return None
-    if not _has_magic(data):
+    if len(data) < HEADER_LENGTH + CRC_LENGTH:
         return None
-    if data[4] != VERSION:
+    # The header is checked and the length matched against it before the
+    # CRC is computed, so garbage spans are rejected without hashing them.
+    if frameLength(data) != len(data):
         return None
 
     flags = data[5]
     payloadLength = (data[6] << 8) | data[7]
-    payloadWithFec = data[8:-2]
+    payloadWithFec = data[HEADER_LENGTH:-CRC_LENGTH]
 
     crcExpected = (data[-1] << 8) | data[-2]
-    crcActual = crc16X25(data[:-2])
+    crcActual = crc16X25(data[:-CRC_LENGTH])
 
     profile = profileFromFlags(flags)
     if not profile:
@@ -76,6 +88,30 @@ def parseFrame(data: bytes) -> Optional[ParsedFrame]:
     )
 
 
+def frameLength(header: bytes) -> Optional[int]:
+    """Total byte length of the frame that starts with ``header``.
+
+    Only the first ``HEADER_LENGTH`` bytes are read. Returns ``None`` when
+    the magic, version or profile flags are not those of a valid frame.
+    """
+    if len(header) < HEADER_LENGTH or not _has_magic(header) or header[4] != VERSION:
+        return None
+    flags = header[5]
+    if not profileFromFlags(flags):
+        return None
+    payload_length = (header[6] << 8) | header[7]
+    if flags & FLAG_FEC:
+        payload_length = (payload_length + RS_DATA_LEN - 1) // RS_DATA_LEN * RS_BLOCK_LEN
+    return HEADER_LENGTH + payload_length + CRC_LENGTH
+
+
+def maxFrameBits(payload_length: int = MAX_PAYLOAD_LENGTH) -> int:
+    """Upper bound on the stuffed bit length of a frame carrying ``payload_length`` bytes."""
+    blocks = (payload_length + RS_DATA_LEN - 1) // RS_DATA_LEN
+    frame_bits = (HEADER_LENGTH + blocks * RS_BLOCK_LEN + CRC_LENGTH) * 8
+    return frame_bits + frame_bits // 5
+
+
 def _has_magic(data: bytes) -> bool:
     if len(data) < 4:
         return False
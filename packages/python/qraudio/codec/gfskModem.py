@@ -1,9 +1,22 @@
 from __future__ import annotations
 
 import math
+from array import array
+from itertools import accumulate
+from operator import add
 from typing import Optional
 
 from .envelope import applyFade
+from .segmentCache import segmentCache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Samples whose phase steps ``np.cumsum`` adds up before the phase is reduced
+# modulo 2π; blocks are aligned to the burst, so a resumed synthesis matches.
+PHASE_BLOCK_SAMPLES = 4096
 
 
 def gfskTonesToSamples(
@@ -17,70 +30,101 @@ def gfskTonesToSamples(
     fade_ms: float,
     bt: Optional[float] = None,
     span_symbols: Optional[int] = None,
+    cached_prefix: int = 0,
 ) -> list[float]:
-    samples_per_bit = sample_rate / baud
-    total_samples = math.ceil(len(tones) * samples_per_bit)
-
-    nrz = [0.0] * total_samples
-    sample_index = 0
-    boundary = samples_per_bit
-    for bit in tones:
-        level = 1.0 if bit == 1 else -1.0
-        while sample_index < boundary and sample_index < total_samples:
-            nrz[sample_index] = level
-            sample_index += 1
-        boundary += samples_per_bit
+    """Gaussian-shaped FSK audio, one bit per tone, faded in and out.
 
-    shaped = gaussianFilter(
-        nrz,
-        samples_per_bit,
-        bt if bt is not None else 1.0,
-        span_symbols if span_symbols is not None else 4,
-    )
+    The first ``cached_prefix`` tones are the same in every call (the
+    preamble flags). Their audio, up to where the filter starts to see the
+    tones after them, comes from the segment cache, and the rest is
+    synthesized on from the phase where it ends.
+    """
+    samples_per_bit = sample_rate / baud
+    resolved_bt = bt if bt is not None else 1.0
+    resolved_span = span_symbols if span_symbols is not None else 4
+    starts = _bitStarts(len(tones), samples_per_bit)
+    shaped = gaussianShape(tones, starts, samples_per_bit, resolved_bt, resolved_span)
 
     amplitude = 10 ** (level_db / 20.0)
     center_freq = (mark_freq + space_freq) / 2.0
     deviation = (mark_freq - space_freq) / 2.0
 
-    out = [0.0] * total_samples
+    prefix = max(0, min(cached_prefix, len(tones) - 1))
+    cut = max(0, starts[prefix] - len(_stepCorrection(samples_per_bit, resolved_bt, resolved_span)) // 2)
     phase = 0.0
-    for i in range(total_samples):
-        freq = center_freq + deviation * shaped[i]
-        phase += (2 * math.pi * freq) / sample_rate
-        if phase > math.pi * 2:
-            phase -= math.pi * 2
-        out[i] = math.sin(phase) * amplitude
+    out: list[float] = []
+    if cut > 0:
+        key = ("gfsk", sample_rate, baud, center_freq, deviation, amplitude, resolved_bt, resolved_span, bytes(tones[:prefix]))
+
+        def build() -> tuple[array, float]:
+            head, end_phase = _frequencyModulate(shaped[:cut], sample_rate, center_freq, deviation, amplitude, 0.0)
+            return array("d", head), end_phase
+
+        head, phase = segmentCache.get(key, build)
+        out = head.tolist()
+
+    body, _ = _frequencyModulate(shaped[cut:], sample_rate, center_freq, deviation, amplitude, phase, cut)
+    out.extend(body)
 
     if fade_ms > 0:
         fade_samples = round((fade_ms / 1000.0) * sample_rate)
         if fade_samples > 0:
-            padded = out + [0.0] * fade_samples
-            applyFade(padded, sample_rate, fade_ms)
-            return padded
+            out.extend([0.0] * fade_samples)
+            applyFade(out, sample_rate, fade_ms)
 
     return out
 
 
+def gaussianShape(
+    tones: list[int],
+    starts: list[int],
+    samples_per_bit: float,
+    bt: float,
+    span_symbols: int,
+) -> list[float]:
+    """``gaussianFilter`` of the ±1 NRZ signal for ``tones``, built from its transitions.
+
+    The NRZ signal is constant within a bit, so its filtered form is the
+    signal itself plus, at each transition, a scaled copy of the difference
+    between the filter's step response and an ideal step. That difference is
+    a table of one kernel length, cached per (samples_per_bit, bt,
+    span_symbols), and adding it per transition replaces the per-sample
+    convolution. Bit ``j`` covers samples ``starts[j]`` to ``starts[j + 1]``.
+    """
+    shaped: list[float] = []
+    for index, bit in enumerate(tones):
+        shaped.extend([1.0 if bit == 1 else -1.0] * (starts[index + 1] - starts[index]))
+    if bt <= 0:
+        return shaped
+
+    correction = _stepCorrection(samples_per_bit, bt, span_symbols)
+    rise = [2.0 * value for value in correction]
+    fall = [-2.0 * value for value in correction]
+    half = len(correction) // 2
+    total = len(shaped)
+    for index in range(1, len(tones)):
+        if tones[index] == tones[index - 1] or starts[index] >= total:
+            continue
+        table = rise if tones[index] == 1 else fall
+        low = starts[index] - half
+        first = max(0, low)
+        last = min(total, starts[index] + half + 1)
+        shaped[first:last] = map(add, shaped[first:last], table[first - low : last - low])
+    return shaped
+
+
 def gaussianFilter(
     samples: list[float],
     samples_per_bit: float,
     bt: float,
     span_symbols: int,
 ) -> list[float]:
+    """Direct Gaussian convolution, holding the end values past either edge."""
     if bt <= 0:
         return samples[:]
-    sigma = (samples_per_bit * math.sqrt(math.log(2))) / (2 * math.pi * bt)
-    kernel_length = max(3, round(span_symbols * samples_per_bit))
-    size = kernel_length + 1 if kernel_length % 2 == 0 else kernel_length
+    kernel = _gaussianKernel(samples_per_bit, bt, span_symbols)
+    size = len(kernel)
     half = size // 2
-    kernel = [0.0] * size
-    total = 0.0
-    for i in range(size):
-        x = i - half
-        value = math.exp(-0.5 * (x / sigma) ** 2)
-        kernel[i] = value
-        total += value
-    kernel = [value / total for value in kernel]
 
     out = [0.0] * len(samples)
     for i in range(len(samples)):
@@ -94,3 +138,98 @@ def gaussianFilter(
             acc += samples[idx] * kernel[k]
         out[i] = acc
     return out
+
+
+def _bitStarts(bit_count: int, samples_per_bit: float) -> list[int]:
+    """First sample of each bit, plus the total sample count at the end."""
+    total_samples = math.ceil(bit_count * samples_per_bit)
+    starts = [0]
+    boundary = samples_per_bit
+    for _ in range(bit_count):
+        starts.append(min(math.ceil(boundary), total_samples))
+        boundary += samples_per_bit
+    return starts
+
+
+def _frequencyModulate(
+    shaped: list[float],
+    sample_rate: float,
+    center_freq: float,
+    deviation: float,
+    amplitude: float,
+    phase: float,
+    start: int = 0,
+) -> tuple[list[float], float]:
+    """Sine whose frequency follows ``shaped``, resuming at burst sample ``start`` from ``phase``.
+
+    The phase is kept within 2π as it accumulates, so long bursts do not
+    lose precision. Returns the samples and the phase to resume from.
+    """
+    if np is not None:
+        return _frequencyModulateNumpy(shaped, sample_rate, center_freq, deviation, amplitude, phase, start)
+    two_pi = math.pi * 2
+    sin = math.sin
+    out: list[float] = []
+    append = out.append
+    for value in shaped:
+        freq = center_freq + deviation * value
+        phase += (2 * math.pi * freq) / sample_rate
+        if phase > two_pi:
+            phase -= two_pi
+        append(sin(phase) * amplitude)
+    return out, phase
+
+
+def _frequencyModulateNumpy(
+    shaped: list[float],
+    sample_rate: float,
+    center_freq: float,
+    deviation: float,
+    amplitude: float,
+    phase: float,
+    start: int,
+) -> tuple[list[float], float]:
+    steps = (2 * math.pi * (center_freq + deviation * np.asarray(shaped, dtype=np.float64))) / sample_rate
+    phases = np.empty(len(steps), dtype=np.float64)
+    first = 0
+    while first < len(steps):
+        last = min(len(steps), first + PHASE_BLOCK_SAMPLES - (start + first) % PHASE_BLOCK_SAMPLES)
+        # A leading ``phase`` makes cumsum add sequentially from it, as the loop does.
+        block = np.cumsum(np.concatenate(([phase], steps[first:last])))[1:]
+        phases[first:last] = block
+        phase = float(block[-1])
+        if (start + last) % PHASE_BLOCK_SAMPLES == 0:
+            phase %= 2 * math.pi
+        first = last
+    return (np.sin(phases) * amplitude).tolist(), phase
+
+
+def _stepCorrection(samples_per_bit: float, bt: float, span_symbols: int) -> tuple[float, ...]:
+    """Filtered unit step minus the unit step, for offsets ``-half..half`` from the transition."""
+    key = ("gfsk-step", samples_per_bit, bt, span_symbols)
+
+    def build() -> tuple[float, ...]:
+        kernel = _gaussianKernel(samples_per_bit, bt, span_symbols)
+        half = len(kernel) // 2
+        # The step response at offset d is the kernel's mass from index half - d onward.
+        tail = list(accumulate(reversed(kernel)))[::-1]
+        return tuple(tail[half - d] - (1.0 if d >= 0 else 0.0) for d in range(-half, half + 1))
+
+    return segmentCache.get(key, build)
+
+
+def _gaussianKernel(samples_per_bit: float, bt: float, span_symbols: int) -> list[float]:
+    if bt <= 0:
+        return [1.0]
+    sigma = (samples_per_bit * math.sqrt(math.log(2))) / (2 * math.pi * bt)
+    kernel_length = max(3, round(span_symbols * samples_per_bit))
+    size = kernel_length + 1 if kernel_length % 2 == 0 else kernel_length
+    half = size // 2
+    kernel = [0.0] * size
+    total = 0.0
+    for i in range(size):
+        x = i - half
+        value = math.exp(-0.5 * (x / sigma) ** 2)
+        kernel[i] = value
+        total += value
+    return [value / total for value in kernel]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import math
+from fractions import Fraction
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Upper bound on the number of symbol windows materialized at once by the
+# NumPy filter bank, keeps the (windows x window_length) matrix small.
+_NUMPY_BATCH_WINDOWS = 1 << 15
+# Samples per symbol is sample_rate / baud; this bound recovers that ratio
+# from its float value for any practical baud rate.
+_MAX_SYMBOL_DENOMINATOR = 1 << 16
+
+
+def goertzel(
+    *,
+    samples: Sequence[float],
+    start: int,
+    length: int,
+    freq: float,
+    sample_rate: float,
+) -> float:
+    omega = (2 * math.pi * freq) / sample_rate
+    coeff = 2 * math.cos(omega)
+    s0 = 0.0
+    s1 = 0.0
+    s2 = 0.0
+    end = start + length
+    for i in range(start, end):
+        s0 = samples[i] + coeff * s1 - s2
+        s2 = s1
+        s1 = s0
+    return s1 * s1 + s2 * s2 - coeff * s1 * s2
+
+
+def symbolWindows(
+    *,
+    sample_count: int,
+    samples_per_symbol: float,
+    offset: int,
+) -> list[tuple[int, int]]:
+    """Return the (start, length) of every symbol window demodulated at ``offset``.
+
+    Window ``k`` ends at ``floor(offset + k * samples_per_symbol)``, computed
+    exactly from the rational samples-per-symbol so the grid never drifts and
+    is the same whether a recording is demodulated whole or from any whole
+    number of symbols in. Windows of one sample or less are skipped, matching
+    the demodulators.
+    """
+    ratio = symbolRatio(samples_per_symbol)
+    numerator = ratio.numerator
+    denominator = ratio.denominator
+    limit = (sample_count - offset) * denominator
+    windows: list[tuple[int, int]] = []
+    start = offset
+    k = 1
+    while k * numerator <= limit:
+        end = offset + (k * numerator) // denominator
+        length = end - start
+        if length > 1:
+            windows.append((start, length))
+        start = end
+        k += 1
+    return windows
+
+
+def symbolRatio(samples_per_symbol: float) -> Fraction:
+    """Samples per symbol as an exact fraction (``sample_rate / baud``)."""
+    return Fraction(samples_per_symbol).limit_denominator(_MAX_SYMBOL_DENOMINATOR)
+
+
+def goertzelBank(
+    *,
+    samples: Sequence[float],
+    windows: Sequence[tuple[int, int]],
+    freqs: Sequence[float],
+    sample_rate: float,
+) -> list[list[float]]:
+    """Goertzel energy of every tone in ``freqs`` for every window.
+
+    Returns one list per tone. Uses a batched NumPy filter bank when NumPy is
+    installed; the recurrence is evaluated in the same order as ``goertzel`` so
+    both paths return identical energies.
+    """
+    if not windows:
+        return [[] for _ in freqs]
+    if np is not None:
+        return _goertzel_bank_numpy(samples, windows, freqs, sample_rate)
+    return [
+        [
+            goertzel(samples=samples, start=start, length=length, freq=freq, sample_rate=sample_rate)
+            for start, length in windows
+        ]
+        for freq in freqs
+    ]
+
+
+def strongestTone(energies: Sequence[Sequence[float]]) -> list[int]:
+    """Index of the highest-energy tone per window (first tone wins ties)."""
+    count = len(energies[0]) if energies else 0
+    best: list[int] = [0] * count
+    for i in range(count):
+        best_energy = -1.0
+        for idx, tone_energies in enumerate(energies):
+            energy = tone_energies[i]
+            if energy > best_energy:
+                best_energy = energy
+                best[i] = idx
+    return best
+
+
+def _goertzel_bank_numpy(
+    samples: Sequence[float],
+    windows: Sequence[tuple[int, int]],
+    freqs: Sequence[float],
+    sample_rate: float,
+) -> list[list[float]]:
+    data = np.asarray(samples, dtype=np.float64)
+    coeffs = np.array(
+        [2 * math.cos((2 * math.pi * freq) / sample_rate) for freq in freqs],
+        dtype=np.float64,
+    )[:, None]
+    last_index = len(data) - 1
+
+    out: list[list[float]] = [[] for _ in freqs]
+    for batch_start in range(0, len(windows), _NUMPY_BATCH_WINDOWS):
+        batch = windows[batch_start : batch_start + _NUMPY_BATCH_WINDOWS]
+        starts = np.fromiter((start for start, _ in batch), dtype=np.intp, count=len(batch))
+        lengths = np.fromiter((length for _, length in batch), dtype=np.intp, count=len(batch))
+        max_length = int(lengths.max())
+        index = starts[:, None] + np.arange(max_length, dtype=np.intp)[None, :]
+        np.minimum(index, last_index, out=index)
+        frames = data[index]
+        uniform = bool((lengths == max_length).all())
+
+        s1 = np.zeros((len(freqs), len(batch)), dtype=np.float64)
+        s2 = np.zeros_like(s1)
+        for k in range(max_length):
+            s0 = frames[:, k] + coeffs * s1 - s2
+            if uniform:
+                s2 = s1
+                s1 = s0
+            else:
+                active = k < lengths
+                s2 = np.where(active, s1, s2)
+                s1 = np.where(active, s0, s1)
+        energies = s1 * s1 + s2 * s2 - coeffs * s1 * s2
+        for idx in range(len(freqs)):
+            out[idx].extend(energies[idx].tolist())
+    return out
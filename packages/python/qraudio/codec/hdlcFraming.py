@@ -1,8 +1,25 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from .frame import CRC_LENGTH, HEADER_LENGTH
 
 FLAG_BITS = [0, 1, 1, 1, 1, 1, 1, 0]
+# Received bitstreams are bytes holding one 0/1 bit each, so flags are found
+# with bytes.find and destuffing and packing run in C.
+FLAG_PATTERN = bytes(FLAG_BITS)
+
+# A stuffed zero follows a run of exactly five ones.
+_STUFFED_ZERO = re.compile(b"(?<!\x01)\x01{5}\x00")
+_FIVE_ONES = b"\x01" * 5
+_BIT_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+# Stuffed bits that always hold the whole frame header.
+_HEADER_STUFFED_BITS = HEADER_LENGTH * 8 + (HEADER_LENGTH * 8) // 5
+
+# Predicts a frame's total byte length from its header, or rejects it (None).
+FrameLength = Callable[[bytes], Optional[int]]
 
 
 @dataclass
@@ -16,38 +33,128 @@ def buildBitstream(frame_bytes: bytes, preamble_ms: float, baud: float) -> list[
     bits = _bytes_to_bits_lsb(frame_bytes)
     stuffed = _bit_stuff(bits)
 
-    preamble_flags = max(1, round((preamble_ms / 1000.0) * baud / 8.0))
-    out: list[int] = []
-    for _ in range(preamble_flags):
-        out.extend(FLAG_BITS)
-    out.extend(FLAG_BITS)
+    out: list[int] = FLAG_BITS * (preambleBitCount(preamble_ms, baud) // len(FLAG_BITS))
     out.extend(stuffed)
     out.extend(FLAG_BITS)
     return out
 
 
-def extractFrames(bits: list[int]) -> list[BitFrame]:
+def preambleBitCount(preamble_ms: float, baud: float) -> int:
+    """Bits before the first frame bit: the preamble flags and the opening flag."""
+    preamble_flags = max(1, round((preamble_ms / 1000.0) * baud / 8.0))
+    return (preamble_flags + 1) * len(FLAG_BITS)
+
+
+def extractFrames(bits: Sequence[int], frame_length: Optional[FrameLength] = None) -> list[BitFrame]:
+    """Frames between consecutive flags in a bitstream of 0/1 values (bytes or ints).
+
+    With ``frame_length``, each span is parsed header first: only the header
+    bits are destuffed, and the span is dropped unless the header is valid and
+    the span has the length it predicts. Just the survivors are fully
+    destuffed and packed.
+    """
+    if not isinstance(bits, bytes):
+        bits = bytes(bits)
     flags = _find_flag_indices(bits)
     if len(flags) < 2:
         return []
 
     frames: list[BitFrame] = []
     for i in range(len(flags) - 1):
-        start = flags[i] + 8
-        end = flags[i + 1]
-        if end <= start:
-            continue
-        raw_bits = bits[start:end]
-        if len(raw_bits) < 16:
-            continue
-        data_bits = _bit_destuff(raw_bits)
-        data_bytes = _bits_to_bytes_lsb(data_bits)
-        if len(data_bytes) < 4 + 1 + 1 + 2 + 2:
-            continue
-        frames.append(BitFrame(bytes=data_bytes, startBit=start, endBit=end))
+        frame = _frame_between(bits, flags[i] + 8, flags[i + 1], 0, frame_length)
+        if frame is not None:
+            frames.append(frame)
     return frames
 
 
+class HdlcDeframer:
+    """Incremental ``extractFrames`` over a bitstream delivered in pieces.
+
+    Bits are pushed as they are demodulated and frames are returned as soon as
+    their closing flag arrives, with bit positions counted from the first bit
+    ever pushed. Only the bits after the last flag are retained; a span that
+    grows past ``max_frame_bits`` without a closing flag is dropped.
+    ``frame_length`` enables header-first parsing as in ``extractFrames``.
+    """
+
+    def __init__(self, max_frame_bits: Optional[int] = None, frame_length: Optional[FrameLength] = None) -> None:
+        self.maxFrameBits = max_frame_bits
+        self.frameLength = frame_length
+        self.reset()
+
+    def reset(self) -> None:
+        self._pending = bytearray()
+        self._pending_start = 0
+        self._search = 0
+        self._frame_start: Optional[int] = None
+
+    @property
+    def bitCount(self) -> int:
+        return self._pending_start + len(self._pending)
+
+    def push(self, bits: Sequence[int]) -> list[BitFrame]:
+        pending = self._pending
+        pending.extend(bits)
+        base = self._pending_start
+        frames: list[BitFrame] = []
+
+        i = self._search
+        flag = pending.find(FLAG_PATTERN, i)
+        while flag >= 0:
+            if self._frame_start is not None:
+                start = self._frame_start - base
+                frame = _frame_between(pending, start, flag, base, self.frameLength)
+                if frame is not None:
+                    frames.append(frame)
+            self._frame_start = base + flag + 8
+            i = flag + 8
+            flag = pending.find(FLAG_PATTERN, i)
+        # A flag can still begin in the last seven bits once more arrive.
+        i = max(i, len(pending) - 7)
+        self._search = i
+
+        keep_from = i
+        if self._frame_start is not None:
+            if self.maxFrameBits is not None and base + i - self._frame_start > self.maxFrameBits:
+                self._frame_start = None
+            else:
+                keep_from = min(keep_from, self._frame_start - base)
+        if keep_from > 0:
+            del pending[:keep_from]
+            self._pending_start = base + keep_from
+            self._search = i - keep_from
+        return frames
+
+
+def _frame_between(
+    bits: bytes,
+    start: int,
+    end: int,
+    base: int,
+    frame_length: Optional[FrameLength] = None,
+) -> Optional[BitFrame]:
+    if end - start < 16:
+        return None
+    expected: Optional[int] = None
+    if frame_length is not None:
+        header_bits = _bit_destuff(bytes(bits[start : min(end, start + _HEADER_STUFFED_BITS)]))
+        expected = frame_length(_bits_to_bytes_lsb(header_bits[: HEADER_LENGTH * 8]))
+        if expected is None:
+            return None
+        # Destuffed, the span must pack into exactly ``expected`` bytes, and
+        # stuffing adds at most one bit per five.
+        data_length = expected * 8 + 7
+        if not expected * 8 <= end - start <= data_length + data_length // 5:
+            return None
+    data_bits = _bit_destuff(bytes(bits[start:end]))
+    data_bytes = _bits_to_bytes_lsb(data_bits)
+    if len(data_bytes) < HEADER_LENGTH + CRC_LENGTH:
+        return None
+    if expected is not None and len(data_bytes) != expected:
+        return None
+    return BitFrame(bytes=data_bytes, startBit=base + start, endBit=base + end)
+
+
 def _bytes_to_bits_lsb(data: bytes) -> list[int]:
     bits: list[int] = []
     for byte in data:
@@ -56,15 +163,14 @@ def _bytes_to_bits_lsb(data: bytes) -> list[int]:
     return bits
 
 
-def _bits_to_bytes_lsb(bits: list[int]) -> bytes:
+def _bits_to_bytes_lsb(bits: bytes) -> bytes:
+    # Read LSB first, the whole bitstream is one little-endian integer whose
+    # binary digits are the bits reversed.
     byte_count = len(bits) // 8
-    out = bytearray(byte_count)
-    for i in range(byte_count):
-        value = 0
-        for bit in range(8):
-            value |= (bits[i * 8 + bit] & 1) << bit
-        out[i] = value
-    return bytes(out)
+    if byte_count == 0:
+        return b""
+    digits = bits[: byte_count * 8][::-1].translate(_BIT_DIGITS)
+    return int(digits, 2).to_bytes(byte_count, "little")
 
 
 def _bit_stuff(bits: list[int]) -> list[int]:
@@ -82,35 +188,14 @@ def _bit_stuff(bits: list[int]) -> list[int]:
     return out
 
 
-def _bit_destuff(bits: list[int]) -> list[int]:
-    out: list[int] = []
-    ones = 0
-    for bit in bits:
-        if bit == 1:
-            ones += 1
-            out.append(bit)
-        else:
-            if ones == 5:
-                ones = 0
-                continue
-            ones = 0
-            out.append(bit)
-    return out
+def _bit_destuff(bits: bytes) -> bytes:
+    return _STUFFED_ZERO.sub(_FIVE_ONES, bits)
 
 
-def _find_flag_indices(bits: list[int]) -> list[int]:
+def _find_flag_indices(bits: bytes) -> list[int]:
     indices: list[int] = []
-    limit = len(bits) - 8
-    i = 0
-    while i <= limit:
-        match = True
-        for j in range(8):
-            if bits[i + j] != FLAG_BITS[j]:
-                match = False
-                break
-        if match:
-            indices.append(i)
-            i += 8
-        else:
-            i += 1
+    i = bits.find(FLAG_PATTERN)
+    while i >= 0:
+        indices.append(i)
+        i = bits.find(FLAG_PATTERN, i + 8)
     return indices
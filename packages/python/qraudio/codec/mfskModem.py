@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import math
+from typing import Optional, Sequence
 
 from .envelope import applyFade
+from .goertzel import goertzelBank, strongestTone, symbolWindows
+from .tone import cachedTones, synthesizeTones
+from .toneCorrelator import ToneCorrelator
+
+_SYMBOL_BITS: dict[int, list[bytes]] = {}
 
 
 def mfskBitsToSamples(
@@ -14,7 +20,14 @@ def mfskBitsToSamples(
     bits_per_symbol: int,
     level_db: float,
     fade_ms: float,
+    cached_prefix: int = 0,
 ) -> list[float]:
+    """Phase-continuous MFSK audio, ``bits_per_symbol`` bits per tone, LSB first.
+
+    The symbols made entirely of the first ``cached_prefix`` bits (the
+    preamble flags) come from ``cachedTones``; the rest are synthesized on
+    from the phase where they end.
+    """
     if bits_per_symbol <= 0:
         raise ValueError("bits_per_symbol must be >= 1")
     required_tones = 1 << bits_per_symbol
@@ -25,14 +38,10 @@ def mfskBitsToSamples(
     samples_per_bit = sample_rate / baud
     samples_per_symbol = samples_per_bit * bits_per_symbol
     total_samples = math.ceil(symbol_count * samples_per_symbol)
-    out: list[float] = [0.0] * total_samples
     amplitude = 10 ** (level_db / 20.0)
 
-    phase = 0.0
-    sample_index = 0
-    boundary = samples_per_symbol
     symbol_mask = (1 << bits_per_symbol) - 1
-
+    freqs: list[float] = []
     for symbol_index in range(symbol_count):
         symbol = 0
         bit_offset = symbol_index * bits_per_symbol
@@ -40,23 +49,30 @@ def mfskBitsToSamples(
             bit = bits[bit_offset + i] if bit_offset + i < len(bits) else 0
             symbol |= (bit & 1) << i
         symbol &= symbol_mask
-        freq = tones[symbol] if symbol < len(tones) else tones[0]
-        phase_step = (2 * math.pi * freq) / sample_rate
-
-        while sample_index < boundary and sample_index < total_samples:
-            phase += phase_step
-            if phase > math.pi * 2:
-                phase -= math.pi * 2
-            out[sample_index] = math.sin(phase) * amplitude
-            sample_index += 1
-        boundary += samples_per_symbol
+        freqs.append(tones[symbol] if symbol < len(tones) else tones[0])
+    prefix = max(0, min(cached_prefix // bits_per_symbol, symbol_count - 1))
+
+    out, state = cachedTones(
+        freqs[:prefix],
+        sample_rate=sample_rate,
+        samples_per_symbol=samples_per_symbol,
+        amplitude=amplitude,
+    )
+    rest, _ = synthesizeTones(
+        freqs[prefix:],
+        sample_rate=sample_rate,
+        samples_per_symbol=samples_per_symbol,
+        amplitude=amplitude,
+        limit=total_samples,
+        state=state,
+    )
+    out.extend(rest)
+    out.extend([0.0] * (total_samples - len(out)))
 
     if fade_ms > 0:
         fade_samples = round((fade_ms / 1000.0) * sample_rate)
         if fade_samples > 0:
-            padded = out + [0.0] * fade_samples
-            applyFade(padded, sample_rate, fade_ms)
-            return padded
+            out.extend([0.0] * fade_samples)
 
     applyFade(out, sample_rate, fade_ms)
     return out
@@ -70,61 +86,40 @@ def demodMfsk(
     offset: int,
     tones: list[float],
     bits_per_symbol: int,
-) -> list[int]:
+    correlator: Optional[ToneCorrelator] = None,
+) -> bytes:
+    """Data bits at ``offset``, one byte per bit, LSB of each symbol first."""
     if bits_per_symbol <= 0:
-        return []
+        return b""
     required_tones = 1 << bits_per_symbol
     if len(tones) < required_tones:
-        return []
+        return b""
 
     samples_per_bit = sample_rate / baud
     samples_per_symbol = samples_per_bit * bits_per_symbol
-    bits: list[int] = []
-
-    start = offset
-    boundary = start + samples_per_symbol
-
-    while boundary <= len(samples):
-        end = math.floor(boundary)
-        length = end - start
-        if length <= 1:
-            start = end
-            boundary += samples_per_symbol
-            continue
-
-        best_index = 0
-        best_energy = -1.0
-        for idx in range(required_tones):
-            energy = goertzel(samples=samples, start=start, length=length, freq=tones[idx], sample_rate=sample_rate)
-            if energy > best_energy:
-                best_energy = energy
-                best_index = idx
-
-        for bit in range(bits_per_symbol):
-            bits.append((best_index >> bit) & 1)
-
-        start = end
-        boundary += samples_per_symbol
-
-    return bits
-
-
-def goertzel(
-    *,
-    samples: list[float],
-    start: int,
-    length: int,
-    freq: float,
-    sample_rate: float,
-) -> float:
-    omega = (2 * math.pi * freq) / sample_rate
-    coeff = 2 * math.cos(omega)
-    s0 = 0.0
-    s1 = 0.0
-    s2 = 0.0
-    end = start + length
-    for i in range(start, end):
-        s0 = samples[i] + coeff * s1 - s2
-        s2 = s1
-        s1 = s0
-    return s1 * s1 + s2 * s2 - coeff * s1 * s2
+    windows = symbolWindows(sample_count=len(samples), samples_per_symbol=samples_per_symbol, offset=offset)
+    if correlator is not None:
+        energies = correlator.energies(windows, tones[:required_tones])
+    else:
+        energies = goertzelBank(
+            samples=samples,
+            windows=windows,
+            freqs=tones[:required_tones],
+            sample_rate=sample_rate,
+        )
+
+    return symbolsToBits(strongestTone(energies), bits_per_symbol)
+
+
+def symbolsToBits(symbols: Sequence[int], bits_per_symbol: int) -> bytes:
+    """Expand tone indices into data bits, one byte per bit, LSB first."""
+    table = _symbol_bits(bits_per_symbol)
+    return b"".join(table[symbol] for symbol in symbols)
+
+
+def _symbol_bits(bits_per_symbol: int) -> list[bytes]:
+    table = _SYMBOL_BITS.get(bits_per_symbol)
+    if table is None:
+        table = [bytes((symbol >> bit) & 1 for bit in range(bits_per_symbol)) for symbol in range(1 << bits_per_symbol)]
+        _SYMBOL_BITS[bits_per_symbol] = table
+    return table
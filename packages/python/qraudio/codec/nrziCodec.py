@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from typing import Optional, Sequence
+
+# Maps an XOR of neighbouring tones to a data bit: equal tones (0) are a 1.
+_SAME_TONE = bytes([1]) + bytes(255)
+
 
 def nrziEncode(bits: list[int]) -> list[int]:
     out: list[int] = []
@@ -11,12 +16,18 @@ def nrziEncode(bits: list[int]) -> list[int]:
     return out
 
 
-def nrziDecode(tones: list[int]) -> list[int]:
+def nrziDecode(tones: Sequence[int], prev: Optional[int] = None) -> bytes:
+    """Data bits, one byte per bit, for a tone sequence.
+
+    ``prev`` is the tone before ``tones[0]`` when decoding a stream in pieces;
+    by default the first bit is a 1. Neighbouring tones are compared as one
+    big-integer XOR, so no per-bit Python work is done.
+    """
+    tones = bytes(tones)
     if not tones:
-        return []
-    out: list[int] = []
-    prev = tones[0]
-    for tone in tones:
-        out.append(1 if tone == prev else 0)
-        prev = tone
-    return out
+        return b""
+    first = tones[0] if prev is None else prev
+    count = len(tones)
+    shifted = bytes((first,)) + tones[:-1]
+    diff = int.from_bytes(tones, "big") ^ int.from_bytes(shifted, "big")
+    return diff.to_bytes(count, "big").translate(_SAME_TONE)
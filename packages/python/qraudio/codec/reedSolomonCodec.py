@@ -1,50 +1,92 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import List, Optional
 
 from .constants import RS_BLOCK_LEN, RS_DATA_LEN, RS_PARITY_LEN
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
 GF_EXP = [0] * 512
 GF_LOG = [0] * 256
 GF_READY = False
 RS_GENERATOR: Optional[list[int]] = None
+PARITY_FEEDBACK = [0] * 256
+SYNDROME_MUL: List[bytes] = [b""] * RS_PARITY_LEN
+GF_MUL_TABLES: List[Optional[bytes]] = [None] * 256
+CHIEN_ROWS: dict[int, bytes] = {}
+
+# Below this many blocks the per-step NumPy overhead outweighs batching.
+_NUMPY_MIN_BLOCKS = 8
 
 
 def rsEncode(payload: bytes) -> bytes:
     _init_gf()
-    gen = _get_rs_generator()
     blocks = (len(payload) + RS_DATA_LEN - 1) // RS_DATA_LEN
+    data = bytearray(blocks * RS_DATA_LEN)
+    data[0 : len(payload)] = payload
+
+    if np is not None and blocks >= _NUMPY_MIN_BLOCKS:
+        data_blocks = np.frombuffer(bytes(data), dtype=np.uint8).reshape(blocks, RS_DATA_LEN)
+        parity_blocks = _rs_parity_blocks_numpy(data_blocks)
+        return np.hstack([data_blocks, parity_blocks]).tobytes()
+
     out = bytearray(blocks * RS_BLOCK_LEN)
     out_offset = 0
-
     for b in range(blocks):
-        start = b * RS_DATA_LEN
-        chunk = payload[start : start + RS_DATA_LEN]
-        data = bytearray(RS_DATA_LEN)
-        data[0 : len(chunk)] = chunk
-        parity = _rs_compute_parity(data, gen)
-        out[out_offset : out_offset + RS_DATA_LEN] = data
+        chunk = data[b * RS_DATA_LEN : (b + 1) * RS_DATA_LEN]
+        out[out_offset : out_offset + RS_DATA_LEN] = chunk
         out_offset += RS_DATA_LEN
-        out[out_offset : out_offset + RS_PARITY_LEN] = parity
+        out[out_offset : out_offset + RS_PARITY_LEN] = _rs_compute_parity(chunk)
         out_offset += RS_PARITY_LEN
 
     return bytes(out)
 
 
 def rsDecode(encoded: bytes, decoded_length: int) -> bytes:
+    return rsDecodeBlocks(encoded, decoded_length).payload
+
+
+@dataclass
+class RsDecodeResult:
+    payload: bytes
+    # The corrected codewords (data and parity of every block), as sent.
+    codewords: bytes
+    # Symbols corrected in each block.
+    correctedSymbols: List[int]
+
+
+def rsDecodeBlocks(encoded: bytes, decoded_length: int) -> RsDecodeResult:
+    """Decode every block and report how many symbols each one needed fixed."""
     _init_gf()
     if len(encoded) % RS_BLOCK_LEN != 0:
         raise ValueError("Invalid RS payload length")
     blocks = len(encoded) // RS_BLOCK_LEN
+    syndromes = _rs_syndromes_blocks(encoded, blocks)
+    codewords = bytearray(encoded)
     out = bytearray(blocks * RS_DATA_LEN)
-    out_offset = 0
+    corrected_symbols = [0] * blocks
     for b in range(blocks):
         start = b * RS_BLOCK_LEN
-        block = encoded[start : start + RS_BLOCK_LEN]
-        decoded = _rs_decode_block(block)
-        out[out_offset : out_offset + RS_DATA_LEN] = decoded
-        out_offset += RS_DATA_LEN
-    return bytes(out[:decoded_length])
+        if any(syndromes[b]):
+            block, corrected_symbols[b] = _rs_correct_block(encoded[start : start + RS_BLOCK_LEN], syndromes[b])
+            codewords[start : start + RS_BLOCK_LEN] = block
+        out[b * RS_DATA_LEN : (b + 1) * RS_DATA_LEN] = codewords[start : start + RS_DATA_LEN]
+    return RsDecodeResult(
+        payload=bytes(out[:decoded_length]),
+        codewords=bytes(codewords),
+        correctedSymbols=corrected_symbols,
+    )
+
+
+def rsStripParity(encoded: bytes) -> bytes:
+    """The data symbols of every block, without checking or correcting them."""
+    if len(encoded) % RS_BLOCK_LEN != 0:
+        raise ValueError("Invalid RS payload length")
+    return b"".join(encoded[start : start + RS_DATA_LEN] for start in range(0, len(encoded), RS_BLOCK_LEN))
 
 
 def _init_gf() -> None:
@@ -62,6 +104,16 @@ def _init_gf() -> None:
         GF_EXP[i] = GF_EXP[i - 255]
     GF_READY = True
 
+    gen = _get_rs_generator()
+    # PARITY_FEEDBACK[f]: the generator taps times feedback symbol f, packed
+    # big-endian into one int so the parity register shifts as a single int.
+    for feedback in range(256):
+        taps = bytes(_gf_mul(gen[j + 1], feedback) for j in range(RS_PARITY_LEN))
+        PARITY_FEEDBACK[feedback] = int.from_bytes(taps, "big")
+    # SYNDROME_MUL[i][s] = s * alpha^i, one Horner step of syndrome i.
+    for i in range(RS_PARITY_LEN):
+        SYNDROME_MUL[i] = bytes(_gf_mul(value, GF_EXP[i]) for value in range(256))
+
 
 def _gf_mul(a: int, b: int) -> int:
     if a == 0 or b == 0:
@@ -103,7 +155,7 @@ def _poly_add(a: List[int], b: List[int]) -> List[int]:
 
 
 def _poly_scale(p: List[int], x: int) -> List[int]:
-    return [_gf_mul(c, x) for c in p]
+    return list(bytes(p).translate(_gf_mul_table(x)))
 
 
 def _poly_mul(a: List[int], b: List[int]) -> List[int]:
@@ -114,13 +166,6 @@ def _poly_mul(a: List[int], b: List[int]) -> List[int]:
     return out
 
 
-def _poly_eval(p: List[int], x: int) -> int:
-    y = p[0]
-    for i in range(1, len(p)):
-        y = _gf_mul(y, x) ^ p[i]
-    return y
-
-
 def _get_rs_generator() -> List[int]:
     global RS_GENERATOR
     if RS_GENERATOR is not None:
@@ -133,25 +178,34 @@ def _get_rs_generator() -> List[int]:
     return gen
 
 
-def _rs_compute_parity(data: bytes, gen: List[int]) -> bytes:
-    parity = bytearray(RS_PARITY_LEN)
+def _rs_compute_parity(data: bytes) -> bytes:
+    # The register holds parity[0] in its top byte; each data byte shifts it
+    # left one symbol and folds in the generator taps for the feedback.
+    table = PARITY_FEEDBACK
+    shift = 8 * (RS_PARITY_LEN - 1)
+    mask = (1 << (8 * RS_PARITY_LEN)) - 1
+    register = 0
     for value in data:
-        feedback = value ^ parity[0]
-        for j in range(RS_PARITY_LEN - 1):
-            parity[j] = parity[j + 1]
-        parity[RS_PARITY_LEN - 1] = 0
-        if feedback != 0:
-            for j in range(RS_PARITY_LEN):
-                parity[j] ^= _gf_mul(gen[j + 1], feedback)
-    return bytes(parity)
-
-
-def _rs_decode_block(block: bytes) -> bytes:
-    synd = _rs_calc_syndromes(block, RS_PARITY_LEN)
-    has_error = any(v != 0 for v in synd)
-    if not has_error:
-        return block[:RS_DATA_LEN]
-
+        register = ((register << 8) & mask) ^ table[value ^ (register >> shift)]
+    return register.to_bytes(RS_PARITY_LEN, "big")
+
+
+def _rs_parity_blocks_numpy(data_blocks):
+    """Parity of every row of a (blocks x RS_DATA_LEN) uint8 array at once."""
+    taps = np.array(
+        [list(feedback.to_bytes(RS_PARITY_LEN, "big")) for feedback in PARITY_FEEDBACK], dtype=np.uint8
+    )
+    parity = np.zeros((len(data_blocks), RS_PARITY_LEN), dtype=np.uint8)
+    for i in range(RS_DATA_LEN):
+        feedback = data_blocks[:, i] ^ parity[:, 0]
+        parity[:, :-1] = parity[:, 1:]
+        parity[:, -1] = 0
+        parity ^= taps[feedback]
+    return parity
+
+
+def _rs_correct_block(block: bytes, synd: List[int]) -> tuple[bytes, int]:
+    """Correct a block with nonzero syndromes; returns the codeword and symbols fixed."""
     err_loc = _rs_find_error_locator(synd, RS_PARITY_LEN)
     err_pos = _rs_find_errors(err_loc, len(block))
     if not err_pos:
@@ -159,23 +213,52 @@ def _rs_decode_block(block: bytes) -> bytes:
     if len(err_pos) > RS_PARITY_LEN // 2:
         raise ValueError("RS decode failed: too many errors")
 
-    corrected = _rs_correct_errors(block, synd, err_pos)
+    magnitudes = _forney_magnitudes(err_pos, synd, len(block))
+    corrected = bytearray(block)
+    for pos, magnitude in zip(err_pos, magnitudes):
+        corrected[pos] ^= magnitude
 
-    synd_after = _rs_calc_syndromes(corrected, RS_PARITY_LEN)
-    if any(v != 0 for v in synd_after):
-        raise ValueError("RS decode failed: could not correct")
+    # Syndromes are linear, so the corrected block's syndromes are the
+    # received ones minus those of the error pattern; all must vanish.
+    msg_len = len(block)
+    for i in range(RS_PARITY_LEN):
+        residue = synd[i + 1]
+        for pos, magnitude in zip(err_pos, magnitudes):
+            if magnitude:
+                residue ^= GF_EXP[(GF_LOG[magnitude] + i * (msg_len - 1 - pos)) % 255]
+        if residue:
+            raise ValueError("RS decode failed: could not correct")
 
-    return corrected[:RS_DATA_LEN]
+    return bytes(corrected), len(err_pos)
 
 
 def _rs_calc_syndromes(msg: bytes, nsym: int) -> List[int]:
     synd = [0] * (nsym + 1)
-    msg_array = list(msg)
     for i in range(nsym):
-        synd[i + 1] = _poly_eval(msg_array, GF_EXP[i])
+        table = SYNDROME_MUL[i]
+        y = 0
+        for value in msg:
+            y = table[y] ^ value
+        synd[i + 1] = y
     return synd
 
 
+def _rs_syndromes_blocks(encoded: bytes, blocks: int) -> List[List[int]]:
+    """Syndromes of every RS_BLOCK_LEN block, in ``_rs_calc_syndromes`` layout."""
+    if np is None or blocks < _NUMPY_MIN_BLOCKS:
+        return [
+            _rs_calc_syndromes(encoded[b * RS_BLOCK_LEN : (b + 1) * RS_BLOCK_LEN], RS_PARITY_LEN)
+            for b in range(blocks)
+        ]
+    table = np.frombuffer(b"".join(SYNDROME_MUL), dtype=np.uint8).reshape(RS_PARITY_LEN, 256)
+    rows = np.arange(RS_PARITY_LEN)[None, :]
+    data = np.frombuffer(bytes(encoded), dtype=np.uint8).reshape(blocks, RS_BLOCK_LEN)
+    synd = np.zeros((blocks, RS_PARITY_LEN), dtype=np.uint8)
+    for k in range(RS_BLOCK_LEN):
+        synd = table[rows, synd] ^ data[:, k : k + 1]
+    return [[0] + row for row in synd.tolist()]
+
+
 def _rs_find_error_locator(synd: List[int], nsym: int) -> List[int]:
     err_loc = [1]
     old_loc = [1]
@@ -199,59 +282,81 @@ def _rs_find_error_locator(synd: List[int], nsym: int) -> List[int]:
 
 
 def _rs_find_errors(err_loc: List[int], msg_len: int) -> Optional[List[int]]:
+    # Table-driven Chien search: the values of coefficient c * x^power at
+    # x = alpha^0 .. alpha^(msg_len - 1) are CHIEN_ROWS[power] translated by
+    # the multiply-by-c table, so every term is one bytes.translate and the
+    # sum over terms is an XOR of ints. Roots are the zero bytes.
+    degree = len(err_loc) - 1
+    total = 0
+    for m, coeff in enumerate(err_loc):
+        if coeff:
+            total ^= int.from_bytes(_chien_row(degree - m)[:msg_len].translate(_gf_mul_table(coeff)), "big")
+    values = total.to_bytes(msg_len, "big")
     err_pos: List[int] = []
-    for i in range(msg_len):
-        x = GF_EXP[i]
-        if _poly_eval(err_loc, x) == 0:
-            err_pos.append(msg_len - 1 - i)
-    if len(err_pos) != len(err_loc) - 1:
+    i = values.find(0)
+    while i >= 0:
+        err_pos.append(msg_len - 1 - i)
+        i = values.find(0, i + 1)
+    if len(err_pos) != degree:
         return None
     return err_pos
 
 
-def _rs_correct_errors(msg: bytes, synd: List[int], err_pos: List[int]) -> bytes:
-    msg_out = bytearray(msg)
-    msg_len = len(msg)
-    magnitudes = _solve_error_magnitudes(err_pos, synd, msg_len)
-    for i, pos in enumerate(err_pos):
-        msg_out[pos] ^= magnitudes[i]
-    return bytes(msg_out)
-
-
-def _solve_error_magnitudes(err_pos: List[int], synd: List[int], msg_len: int) -> List[int]:
-    t = len(err_pos)
-    A = [[0] * t for _ in range(t)]
-    b = [0] * t
-
-    for row in range(t):
-        b[row] = synd[row + 1]
-        for col in range(t):
-            power = (msg_len - 1 - err_pos[col]) * row
-            A[row][col] = 1 if row == 0 else _gf_pow(power)
-
-    for col in range(t):
-        pivot = col
-        while pivot < t and A[pivot][col] == 0:
-            pivot += 1
-        if pivot == t:
+def _chien_row(power: int) -> bytes:
+    row = CHIEN_ROWS.get(power)
+    if row is None:
+        row = bytes(GF_EXP[(i * power) % 255] for i in range(RS_BLOCK_LEN))
+        CHIEN_ROWS[power] = row
+    return row
+
+
+def _gf_mul_table(value: int) -> bytes:
+    table = GF_MUL_TABLES[value]
+    if table is None:
+        table = bytes(_gf_mul(value, other) for other in range(256))
+        GF_MUL_TABLES[value] = table
+    return table
+
+
+def _forney_magnitudes(err_pos: List[int], synd: List[int], msg_len: int) -> List[int]:
+    """Error values by the Forney algorithm (first consecutive root alpha^0).
+
+    Polynomials here are lowest degree first. With locators X_k = alpha^j for
+    an error at degree j, Lambda(x) = prod(1 + X_k x), Omega = S * Lambda mod
+    x^nsym, and e_k = X_k * Omega(X_k^-1) / Lambda'(X_k^-1).
+    """
+    nsym = len(synd) - 1
+    locators = [GF_EXP[msg_len - 1 - pos] for pos in err_pos]
+
+    locator_poly = [1]
+    for x in locators:
+        locator_poly = [
+            (locator_poly[i] if i < len(locator_poly) else 0) ^ (_gf_mul(locator_poly[i - 1], x) if i > 0 else 0)
+            for i in range(len(locator_poly) + 1)
+        ]
+
+    # Omega with byte d of a little-endian int holding the degree-d
+    # coefficient: each Lambda term adds a scaled copy of S shifted up.
+    syndromes = bytes(synd[1:])
+    product = 0
+    for i, lam in enumerate(locator_poly):
+        if lam and i < nsym:
+            product ^= int.from_bytes(syndromes[: nsym - i].translate(_gf_mul_table(lam)), "little") << (8 * i)
+    evaluator = product.to_bytes(nsym, "little")
+
+    magnitudes: List[int] = []
+    for x in locators:
+        x_inv = _gf_inverse(x)
+        log_x_inv = GF_LOG[x_inv]
+        numerator = 0
+        for m, coeff in enumerate(evaluator):
+            if coeff:
+                numerator ^= GF_EXP[(GF_LOG[coeff] + m * log_x_inv) % 255]
+        # Formal derivative in characteristic 2: only odd powers survive.
+        denominator = 0
+        for i in range(1, len(locator_poly), 2):
+            denominator ^= _gf_mul(locator_poly[i], _gf_pow(GF_LOG[x_inv] * (i - 1)))
+        if denominator == 0:
             raise ValueError("RS decode failed: singular matrix")
-        if pivot != col:
-            A[pivot], A[col] = A[col], A[pivot]
-            b[pivot], b[col] = b[col], b[pivot]
-
-        inv = _gf_div(1, A[col][col])
-        for j in range(col, t):
-            A[col][j] = _gf_mul(A[col][j], inv)
-        b[col] = _gf_mul(b[col], inv)
-
-        for row in range(t):
-            if row == col:
-                continue
-            factor = A[row][col]
-            if factor == 0:
-                continue
-            for j in range(col, t):
-                A[row][j] ^= _gf_mul(factor, A[col][j])
-            b[row] ^= _gf_mul(factor, b[col])
-
-    return b
+        magnitudes.append(_gf_mul(x, _gf_div(numerator, denominator)))
+    return magnitudes
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Hashable, TypeVar
+
+# Enough for every profile's chimes, preamble and fade at a few sample
+# rates and levels; a long preamble at 48 kHz is a few hundred kB.
+SEGMENT_CACHE_ENTRIES = 64
+
+T = TypeVar("T")
+
+
+class SegmentCache:
+    """Bounded LRU of synthesized audio that only depends on its settings.
+
+    Chimes, preamble flags and fade curves come out the same for every
+    payload with the same profile, sample rate and level, so the encoder
+    builds them once. Entries must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = SEGMENT_CACHE_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.maxEntries = max_entries
+        self._entries: OrderedDict[Hashable, object] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get(self, key: Hashable, build: Callable[[], T]) -> T:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]  # type: ignore[return-value]
+        value = build()
+        self._entries[key] = value
+        if len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+        return value
+
+
+segmentCache = SegmentCache()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Iterator, Sequence
+
+from .afskModem import sliceTones
+from .goertzel import strongestTone
+from .hdlcFraming import FLAG_PATTERN, BitFrame, HdlcDeframer
+from .mfskModem import symbolsToBits
+from .nrziCodec import nrziDecode
+from .toneCorrelator import ToneCorrelator
+
+# Symbol phases demodulated over the whole signal while looking for
+# preambles. Half a symbol apart, one lies within a quarter symbol of the
+# true phase, where a clean preamble's flags still slice correctly.
+COARSE_PHASES = 2
+# Symbol phases scored over each preamble to estimate its timing, matching
+# the sub-symbol offset grid of the brute-force search.
+ACQUISITION_PHASES = 8
+# Consecutive flags required before a run counts as a preamble.
+MIN_PREAMBLE_FLAGS = 2
+# Flags' worth of bits that noise may corrupt inside one preamble before
+# its flag runs count as separate bursts.
+PREAMBLE_GAP_FLAGS = 2
+# Symbols demodulated per step while following a burst.
+BURST_STEP_SYMBOLS = 1024
+
+
+@dataclass
+class Burst:
+    """A preamble found in the signal and the symbol phases to demodulate it at.
+
+    ``phases`` are offsets in samples within one symbol, best first: the
+    interpolated estimate, then whole-sample phases next to it, then the
+    coarse acquisition phases ranked by eye opening, as fallbacks when the
+    burst fails to decode.
+    """
+
+    startSample: int
+    endSample: int
+    phases: list[float]
+
+
+class SymbolSlicer:
+    """Turns per-window tone energies into data bits for one modulation."""
+
+    def __init__(self, modulation: str, freqs: Sequence[float], bits_per_symbol: int) -> None:
+        self.modulation = modulation
+        self.freqs = list(freqs)
+        self.bitsPerSymbol = bits_per_symbol
+
+    def bits(self, energies: list[list[float]], prev_tone: int = -1) -> tuple[bytes, int]:
+        """Data bits for consecutive windows plus the last tone, for NRZI carry-over."""
+        if self.modulation == "mfsk":
+            return symbolsToBits(strongestTone(energies), self.bitsPerSymbol), prev_tone
+
+        tones = sliceTones(*energies)
+        if not tones:
+            return b"", prev_tone
+        return nrziDecode(tones, None if prev_tone < 0 else prev_tone), tones[-1]
+
+
+def phaseWindows(phase: float, samples_per_symbol: float, first: int, count: int) -> list[tuple[int, int]]:
+    """Windows ``first .. first + count - 1`` of the symbol grid starting at ``phase``.
+
+    Window edges are placed at ``floor(phase + k * samples_per_symbol)`` so
+    fractional samples-per-symbol never accumulate rounding drift.
+    """
+    windows: list[tuple[int, int]] = []
+    start = math.floor(phase + first * samples_per_symbol)
+    for k in range(first + 1, first + count + 1):
+        end = math.floor(phase + k * samples_per_symbol)
+        windows.append((start, end - start))
+        start = end
+    return windows
+
+
+def acquireBursts(
+    *,
+    correlator: ToneCorrelator,
+    slicer: SymbolSlicer,
+    samples_per_symbol: float,
+) -> list[Burst]:
+    """Locate preamble flag runs and estimate the symbol phase of each one.
+
+    The whole signal is demodulated at ``COARSE_PHASES`` phases only; the
+    finer ``ACQUISITION_PHASES`` grid is scored over each preamble's windows.
+    """
+    step = samples_per_symbol / ACQUISITION_PHASES
+    bits_per_symbol = slicer.bitsPerSymbol
+    samples_per_bit = samples_per_symbol / bits_per_symbol
+    count = int((correlator.length - samples_per_symbol) // samples_per_symbol)
+    if count <= 0:
+        return []
+
+    runs: list[tuple[int, int]] = []
+    min_run = 8 * MIN_PREAMBLE_FLAGS
+    for p in range(COARSE_PHASES):
+        phase = p * samples_per_symbol / COARSE_PHASES
+        energies = correlator.energies(phaseWindows(phase, samples_per_symbol, 0, count), slicer.freqs)
+        bits, _ = slicer.bits(energies)
+        for first_bit, end_bit in _flag_runs(bits, min_run):
+            runs.append(
+                (math.floor(phase + first_bit * samples_per_bit), math.floor(phase + end_bit * samples_per_bit))
+            )
+
+    bursts: list[Burst] = []
+    for start_sample, end_sample in _merge_runs(runs, 8 * PREAMBLE_GAP_FLAGS * samples_per_bit):
+        first = max(0, math.ceil(start_sample / samples_per_symbol))
+        last = min(count, int(end_sample // samples_per_symbol) - 1)
+        if last <= first:
+            last = min(count, first + 1)
+        scores = []
+        for p in range(ACQUISITION_PHASES):
+            windows = phaseWindows(p * step, samples_per_symbol, first, last - first)
+            scores.append(_eye_opening(correlator.energies(windows, slicer.freqs)))
+        bursts.append(Burst(startSample=start_sample, endSample=end_sample, phases=_rank_phases(scores, step)))
+    return bursts
+
+
+def demodulateBurst(
+    *,
+    correlator: ToneCorrelator,
+    slicer: SymbolSlicer,
+    samples_per_symbol: float,
+    burst: Burst,
+    phase: float,
+    max_frame_bits: int,
+) -> Iterator[tuple[BitFrame, int]]:
+    """Demodulate one burst at ``phase`` and yield the frame that follows its preamble.
+
+    Yields ``(frame, first_sample)`` where ``frame.startBit``/``endBit`` are
+    counted from the bit starting at ``first_sample``.
+    """
+    first_window = max(0, math.floor((burst.startSample - phase) / samples_per_symbol))
+    total = int((correlator.length - phase) // samples_per_symbol)
+    first_sample = math.floor(phase + first_window * samples_per_symbol)
+    preamble_bits = math.ceil((burst.endSample - burst.startSample) / samples_per_symbol) * slicer.bitsPerSymbol
+    deframer = HdlcDeframer(max_frame_bits)
+    prev_tone = -1
+    window = first_window
+    while window < total:
+        count = min(BURST_STEP_SYMBOLS, total - window)
+        energies = correlator.energies(phaseWindows(phase, samples_per_symbol, window, count), slicer.freqs)
+        bits, prev_tone = slicer.bits(energies, prev_tone)
+        frames = deframer.push(bits)
+        if frames:
+            for frame in frames:
+                yield frame, first_sample
+            return
+        window += count
+        if deframer.bitCount > preamble_bits + max_frame_bits:
+            return
+
+
+def _flag_runs(bits: bytes, min_run: int) -> list[tuple[int, int]]:
+    runs: list[tuple[int, int]] = []
+    pattern = FLAG_PATTERN * MIN_PREAMBLE_FLAGS
+    pos = bits.find(pattern)
+    while pos >= 0:
+        end = pos + len(pattern)
+        while bits.startswith(FLAG_PATTERN, end):
+            end += 8
+        if end - pos >= min_run:
+            runs.append((pos, end))
+        pos = bits.find(pattern, end)
+    return runs
+
+
+def _merge_runs(runs: list[tuple[int, int]], gap: float) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(runs):
+        if merged and start <= merged[-1][1] + gap:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+            continue
+        merged.append((start, end))
+    return merged
+
+
+def _eye_opening(energies: list[list[float]]) -> float:
+    """Mean margin between the strongest and second tone, relative to their total."""
+    total = 0.0
+    for values in map(sorted, zip(*energies)):
+        power = sum(values)
+        if power > 0:
+            total += (values[-1] - values[-2]) / power
+    return total / max(1, len(energies[0]))
+
+
+def _rank_phases(scores: list[float], step: float) -> list[float]:
+    count = len(scores)
+    order = sorted(range(count), key=lambda p: scores[p], reverse=True)
+    best = order[0]
+    before = scores[(best - 1) % count]
+    after = scores[(best + 1) % count]
+    curvature = before - 2 * scores[best] + after
+    delta = 0.0
+    if curvature < 0:
+        delta = max(-0.5, min(0.5, 0.5 * (before - after) / curvature))
+    refined = ((best + delta) % count) * step
+    period = count * step
+
+    # Whole-sample phases around the estimate come first: narrow eyes (GFSK at
+    # fractional samples per symbol) may open over only a sample or two.
+    nearby = range(math.ceil(refined - step / 2), math.floor(refined + step / 2) + 1)
+    candidates = [refined]
+    candidates += sorted((float(n % period) for n in nearby), key=lambda n: abs(n - refined))
+    candidates += [p * step for p in order]
+
+    phases: list[float] = []
+    for candidate in candidates:
+        if all(abs(candidate - existing) >= 0.5 for existing in phases):
+            phases.append(candidate)
+    return phases
@@ -1,8 +1,84 @@
 from __future__ import annotations
 
 import math
+from array import array
+from typing import NamedTuple, Optional, Sequence
 
 from .envelope import applyFade
+from .segmentCache import segmentCache
+
+
+class SynthState(NamedTuple):
+    """Where a phase-continuous synthesis stopped, so it can be resumed."""
+
+    phase: float = 0.0
+    sampleIndex: int = 0
+    boundary: float = 0.0
+
+
+def synthesizeTones(
+    freqs: Sequence[float],
+    *,
+    sample_rate: float,
+    samples_per_symbol: float,
+    amplitude: float,
+    limit: Optional[int] = None,
+    state: SynthState = SynthState(),
+) -> tuple[list[float], SynthState]:
+    """Phase-continuous sine with one frequency per symbol.
+
+    Symbol ``k`` ends at the first sample at or past ``(k + 1) *
+    samples_per_symbol``, and no samples are written at or past ``limit``.
+    Resuming from the returned state gives the same samples as one call
+    over the concatenated frequencies.
+    """
+    phase, sample_index, boundary = state
+    two_pi = math.pi * 2
+    sin = math.sin
+    out: list[float] = []
+    append = out.append
+    for freq in freqs:
+        boundary += samples_per_symbol
+        end = math.ceil(boundary)
+        if limit is not None and end > limit:
+            end = limit
+        phase_step = (2 * math.pi * freq) / sample_rate
+        for _ in range(end - sample_index):
+            phase += phase_step
+            if phase > two_pi:
+                phase -= two_pi
+            append(sin(phase) * amplitude)
+        sample_index = max(sample_index, end)
+    return out, SynthState(phase, sample_index, boundary)
+
+
+def cachedTones(
+    freqs: Sequence[float],
+    *,
+    sample_rate: float,
+    samples_per_symbol: float,
+    amplitude: float,
+) -> tuple[list[float], SynthState]:
+    """``synthesizeTones`` for a run of symbols that recurs between calls, such as preamble flags.
+
+    The samples and final state come from the segment cache after the first
+    call, so callers only synthesize what follows the run.
+    """
+    if not freqs:
+        return [], SynthState()
+    key = ("tones", sample_rate, samples_per_symbol, amplitude, tuple(freqs))
+
+    def build() -> tuple[array, SynthState]:
+        samples, state = synthesizeTones(
+            freqs,
+            sample_rate=sample_rate,
+            samples_per_symbol=samples_per_symbol,
+            amplitude=amplitude,
+        )
+        return array("d", samples), state
+
+    samples, state = segmentCache.get(key, build)
+    return samples.tolist(), state
 
 
 def toneToSamples(
@@ -15,13 +91,11 @@ def toneToSamples(
 ) -> list[float]:
     sample_count = max(1, round((duration_ms / 1000.0) * sample_rate))
     amplitude = 10 ** (level_db / 20.0)
-    phase_step = (2 * math.pi * freq) / sample_rate
-    phase = 0.0
-    out: list[float] = [0.0] * sample_count
-    for i in range(sample_count):
-        phase += phase_step
-        if phase > math.pi * 2:
-            phase -= math.pi * 2
-        out[i] = math.sin(phase) * amplitude
+    out, _ = synthesizeTones(
+        [freq],
+        sample_rate=sample_rate,
+        samples_per_symbol=sample_count,
+        amplitude=amplitude,
+    )
     applyFade(out, sample_rate, fade_ms)
     return out
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import math
+from itertools import accumulate
+from operator import mul
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+class ToneCorrelator:
+    """Integrate-and-dump tone energies over running sums.
+
+    The samples are correlated once against a cosine and a sine at every tone
+    and the products are accumulated, so the energy of any window at any
+    offset is read out with two subtractions per tone. The energy is the
+    squared DFT magnitude of the window at the tone, the same quantity the
+    Goertzel filter computes.
+    """
+
+    def __init__(self, samples: Sequence[float], sample_rate: float, freqs: Sequence[float]) -> None:
+        self.sampleRate = sample_rate
+        self.length = len(samples)
+        self._sums: dict[float, tuple[Sequence[float], Sequence[float]]] = {}
+        data = np.asarray(samples, dtype=np.float64) if np is not None else samples
+        for freq in freqs:
+            if freq not in self._sums:
+                self._sums[freq] = _running_sums(data, self.length, (2 * math.pi * freq) / sample_rate)
+
+    @property
+    def freqs(self) -> list[float]:
+        return list(self._sums)
+
+    def energies(
+        self,
+        windows: Sequence[tuple[int, int]],
+        freqs: Sequence[float],
+    ) -> list[list[float]]:
+        """Energy of every tone in ``freqs`` for every (start, length) window."""
+        if not windows:
+            return [[] for _ in freqs]
+        if np is not None:
+            starts = np.fromiter((start for start, _ in windows), dtype=np.intp, count=len(windows))
+            ends = starts + np.fromiter((length for _, length in windows), dtype=np.intp, count=len(windows))
+            out: list[list[float]] = []
+            for freq in freqs:
+                cum_i, cum_q = self._sums[freq]
+                in_phase = cum_i[ends] - cum_i[starts]
+                quadrature = cum_q[ends] - cum_q[starts]
+                out.append((in_phase * in_phase + quadrature * quadrature).tolist())
+            return out
+
+        out = []
+        for freq in freqs:
+            cum_i, cum_q = self._sums[freq]
+            tone_energies: list[float] = []
+            for start, length in windows:
+                end = start + length
+                in_phase = cum_i[end] - cum_i[start]
+                quadrature = cum_q[end] - cum_q[start]
+                tone_energies.append(in_phase * in_phase + quadrature * quadrature)
+            out.append(tone_energies)
+        return out
+
+
+def _running_sums(samples: Sequence[float], length: int, omega: float) -> tuple[Sequence[float], Sequence[float]]:
+    if np is not None:
+        phase = omega * np.arange(length, dtype=np.float64)
+        cum_i = np.zeros(length + 1, dtype=np.float64)
+        cum_q = np.zeros(length + 1, dtype=np.float64)
+        np.cumsum(samples * np.cos(phase), out=cum_i[1:])
+        np.cumsum(samples * np.sin(phase), out=cum_q[1:])
+        return cum_i, cum_q
+
+    phases = [omega * n for n in range(length)]
+    cum_i = list(accumulate(map(mul, samples, map(math.cos, phases)), initial=0.0))
+    cum_q = list(accumulate(map(mul, samples, map(math.sin, phases)), initial=0.0))
+    return cum_i, cum_q
@@ -1,132 +1,950 @@
 from __future__ import annotations
 
 import gzip as gzip_lib
-from typing import Callable, Optional, Union
+import math
+import pickle
+import warnings
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Iterator, Literal, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 from .codec.afskModem import demodAfsk
-from .codec.hdlcFraming import extractFrames
+from .codec.hdlcFraming import FLAG_BITS, extractFrames
 from .codec.jsonCodec import decodeJson
 from .codec.nrziCodec import nrziDecode
 from .codec.profile import getProfileSettings
-from .codec.frame import parseFrame
-from .codec.reedSolomonCodec import rsDecode, rsEncode
+from .codec.frame import frameLength, maxFrameBits, parseFrame
+from .codec.reedSolomonCodec import rsDecodeBlocks, rsStripParity
 from .codec.mfskModem import demodMfsk
-from .codec.bytes import concatBytes
-from .codec.crc16x25 import crc16X25
-from .codec.defaults import DEFAULT_SAMPLE_RATE
+from .codec.timing import SymbolSlicer, acquireBursts, demodulateBurst
+from .codec.toneCorrelator import ToneCorrelator
+from .codec.crc16x25 import Crc16X25
+from .codec.fmDiscriminator import FmDiscriminator, demodFm
+from .codec.decimator import DECIMATE_CUTOFF, DECIMATE_EYE_SAMPLES, decimate as decimateSamples
+from .codec.chimeDetector import (
+    CHIME_BATCH_SAMPLES,
+    ChimeSignature,
+    chimePeaks,
+    chimeScores,
+    chimeStep,
+    chimeStride,
+)
+from .codec.defaults import (
+    DEFAULT_CHIME_THRESHOLD,
+    DEFAULT_GATE_MARGIN_MS,
+    DEFAULT_GATE_THRESHOLD,
+    DEFAULT_SAMPLE_RATE,
+)
+from .codec.energyGate import (
+    GATE_BATCH_BLOCKS,
+    GATE_BLOCK_MS,
+    GATE_BRIDGE_MS,
+    GATE_MIN_MS,
+    SILENCE_POWER,
+    blockToneScores,
+    candidateSpans,
+)
+from .io.wavReader import WavReader
 from .profiles import PROFILE_NAMES, Profile, normalizeProfile
 from dataclasses import dataclass
 
-from .types import DecodeResult, ScanResult
+from .types import DecodeResult, ProbeRegion, Samples, ScanResult
+
+# Seconds of a ``WavReader`` scanned at a time when ``chunk_seconds`` is not given.
+READER_CHUNK_SECONDS = 10
+# Gate-sized blocks (about 5 s) checked for silence per step while following a burst past a chunk.
+BURST_SEARCH_BLOCKS = 250
+
+ScanTiming = Literal["offsets", "preamble"]
+DecodeSearch = Literal["first", "earliest", "full"]
+ScanGate = Literal["probe", "chime"]
+DemodEngine = Literal["correlator", "discriminator"]
+# Profiles demodulated together because they share tones, baud and symbol size.
+ProfileGroup = tuple[Profile, ...]
 
 
 def decode(
     *,
-    samples: list[float],
+    samples: Samples,
     sample_rate: Optional[int] = None,
     profile: Optional[Union[Profile, str]] = None,
     gzip_decompress: Optional[Callable[[bytes], bytes]] = None,
+    frame_cache: Optional[FrameCache] = None,
+    search: DecodeSearch = "earliest",
+    engine: DemodEngine = "correlator",
 ) -> DecodeResult:
-    results = scan(
-        samples=samples,
-        sample_rate=sample_rate,
-        profile=profile,
-        min_confidence=0.9,
-        gzip_decompress=gzip_decompress,
-    )
-    if not results:
-        raise ValueError("No valid frame found")
-    return results[0]
+    """Decode one payload, stopping at the first frame that decodes.
+
+    ``search="earliest"`` demodulates the regions ``probe`` finds, in time
+    order, so the search ends at the earliest burst that decodes. If none
+    does, for example when loud out-of-band audio hides a burst from the
+    energy gate, it carries on as ``"first"``. ``"first"`` tries the bursts
+    ``locateBursts`` finds, with the profiles their chimes name, then the
+    whole buffer for each profile, most in-band energy first (as measured by
+    ``probe``); it returns as soon as any symbol offset yields a valid frame,
+    which need not be the earliest. ``"full"`` scans everything and returns
+    the earliest result, like ``scan(...)[0]``. ``engine`` is as for ``scan``.
+    """
+    if search == "full":
+        results = scan(
+            samples=samples,
+            sample_rate=sample_rate,
+            profile=profile,
+            min_confidence=0.9,
+            gzip_decompress=gzip_decompress,
+            frame_cache=frame_cache,
+            engine=engine,
+        )
+        if not results:
+            raise ValueError("No valid frame found")
+        return results[0]
+
+    resolved_sample_rate = sample_rate or DEFAULT_SAMPLE_RATE
+    resolved_profile = normalizeProfile(profile) if profile is not None else None
+    profile_groups = _profileGroups([resolved_profile] if resolved_profile is not None else PROFILE_NAMES)
+    regions: list[ProbeRegion] = []
+    if search == "earliest" or resolved_profile is None:
+        regions = probe(samples=samples, sample_rate=resolved_sample_rate, profile=resolved_profile)
+    candidates: list[tuple[ProfileGroup, int, int]] = []
+    if search == "earliest":
+        candidates = _groupRegions(regions, profile_groups)
+    if resolved_profile is not None:
+        candidates.append((profile_groups[0], 0, len(samples)))
+    else:
+        # Bursts whose lead-in chime names their profile come first, in time
+        # order. Then whole-buffer searches, most in-band energy first (region
+        # score weighted by region length), for bursts without a chime.
+        candidates += _groupRegions(locateBursts(samples=samples, sample_rate=resolved_sample_rate), profile_groups)
+        coverage: dict[Profile, float] = {current: 0.0 for current in PROFILE_NAMES}
+        for region in regions:
+            coverage[region.profile] += region.score * (region.endSample - region.startSample)
+        ordered = sorted(profile_groups, key=lambda group: max(coverage[current] for current in group), reverse=True)
+        candidates.extend((group, 0, len(samples)) for group in ordered)
+
+    cache = frame_cache if frame_cache is not None else FrameCache()
+    for group, start, end in candidates:
+        # _scanRegion demodulates lazily, one offset at a time.
+        for _, parsed, start_sample, end_sample in _scanRegion(
+            _regionSamples(samples, start, end),
+            resolved_sample_rate,
+            group,
+            gzip_decompress,
+            frame_cache=cache,
+            engine=engine,
+        ):
+            return DecodeResult(
+                json=parsed.json,
+                profile=parsed.profile,
+                startSample=start + start_sample,
+                endSample=start + end_sample,
+                confidence=1.0,
+            )
+    raise ValueError("No valid frame found")
 
 
 def scan(
     *,
-    samples: list[float],
+    samples: Samples,
     sample_rate: Optional[int] = None,
     profile: Optional[Union[Profile, str]] = None,
     min_confidence: float = 0.8,
     gzip_decompress: Optional[Callable[[bytes], bytes]] = None,
+    gate: Union[bool, ScanGate] = False,
+    timing: ScanTiming = "offsets",
+    workers: Optional[int] = None,
+    chunk_seconds: Optional[int] = None,
+    frame_cache: Optional[FrameCache] = None,
+    engine: DemodEngine = "correlator",
+    decimate: Optional[int] = None,
 ) -> list[ScanResult]:
+    """Every payload in ``samples``, sorted by position.
+
+    ``engine`` picks how two-tone profiles are demodulated at each symbol
+    offset: ``"correlator"`` compares the energy at the mark and space tones
+    per bit, ``"discriminator"`` slices an FM discriminator's frequency
+    track (see ``FmDiscriminator``). MFSK, and ``timing="preamble"``, always
+    use the correlator.
+
+    ``decimate`` band-limits the audio and scans it at up to ``decimate``
+    times fewer samples, e.g. 4 to scan 48 kHz audio at 12 kHz. Each profile
+    group gets the largest factor that divides the rate and keeps its tones
+    and symbol timing resolvable, with either engine; a warning names the
+    groups that get less than ``decimate``. Positions are mapped back to
+    input samples on the decimated grid, so they are multiples of the factor
+    and can sit a few samples from a full-rate scan's. Near the noise floor
+    a burst can decode at one rate and not the other.
 
+    With ``workers`` above 1, ``gzip_decompress`` is sent to the worker
+    processes and must be picklable (a module-level function, not a lambda
+    or closure); otherwise ``ValueError`` is raised before scanning.
+    """
+    if workers is not None and workers > 1 and gzip_decompress is not None:
+        # Workers receive the decompressor by pickle; fail before any work is
+        # submitted rather than with a PicklingError from the pool.
+        try:
+            pickle.dumps(gzip_decompress)
+        except (pickle.PicklingError, AttributeError, TypeError) as error:
+            raise ValueError(
+                "gzip_decompress must be picklable when workers > 1, e.g. a module-level function"
+            ) from error
     resolved_sample_rate = sample_rate or DEFAULT_SAMPLE_RATE
+    # Offsets that demodulate a frame cleanly yield identical bytes; decode
+    # each distinct frame once per scan unless the caller shares a cache.
+    cache = frame_cache if frame_cache is not None else FrameCache()
     if profile is not None:
         profiles: list[Profile] = [normalizeProfile(profile)]
     else:
         profiles = list(PROFILE_NAMES)
 
+    # Profiles sharing tones, baud and symbol size are demodulated once;
+    # their frames are routed by the profile in the frame header.
+    profile_groups = _profileGroups(profiles)
+    options = (profile, min_confidence, gzip_decompress, gate, timing, workers, chunk_seconds, cache, engine)
+    if decimate is None or decimate <= 1:
+        return _scanGroups(samples, resolved_sample_rate, profile_groups, *options)
+
+    # Each group is scanned at the lowest rate it still demodulates cleanly at.
+    by_factor: dict[int, list[ProfileGroup]] = {}
+    for group in profile_groups:
+        factor = _decimationFactor(resolved_sample_rate, decimate, group[0])
+        by_factor.setdefault(factor, []).append(group)
+    reduced = [
+        f"{'/'.join(current.value for current in group)} at {factor}"
+        for factor, groups in by_factor.items()
+        if factor < decimate
+        for group in groups
+    ]
+    if reduced:
+        warnings.warn(
+            f"decimate={decimate} at {resolved_sample_rate} Hz reduced for {', '.join(reduced)}",
+            stacklevel=2,
+        )
     results: list[ScanResult] = []
-    seen_keys: set[str] = set()
+    for factor, groups in by_factor.items():
+        narrowed = samples if factor == 1 else decimateSamples(samples, factor)
+        for result in _scanGroups(narrowed, resolved_sample_rate // factor, groups, *options):
+            result.startSample *= factor
+            result.endSample = min(len(samples), result.endSample * factor)
+            results.append(result)
+    results.sort(key=lambda r: r.startSample)
+    return results
 
-    for current_profile in profiles:
-        settings = getProfileSettings(current_profile)
-        baud = settings.baud
-        samples_per_bit = resolved_sample_rate / baud
-        bits_per_symbol = settings.bitsPerSymbol or 1
-        samples_per_symbol = samples_per_bit * bits_per_symbol
-        offset_step = max(1, round(samples_per_symbol / 8))
-
-        offset = 0
-        while offset < samples_per_symbol:
-            if settings.modulation == "mfsk":
-                data_bits = demodMfsk(
-                    samples=samples,
-                    sample_rate=resolved_sample_rate,
-                    baud=baud,
-                    offset=int(offset),
-                    tones=settings.tones or [settings.markFreq, settings.spaceFreq],
-                    bits_per_symbol=bits_per_symbol,
-                )
+
+def _scanGroups(
+    samples: Samples,
+    sample_rate: int,
+    profile_groups: list[ProfileGroup],
+    profile: Optional[Union[Profile, str]],
+    min_confidence: float,
+    gzip_decompress: Optional[Callable[[bytes], bytes]],
+    gate: Union[bool, ScanGate],
+    timing: ScanTiming,
+    workers: Optional[int],
+    chunk_seconds: Optional[int],
+    cache: FrameCache,
+    engine: DemodEngine,
+) -> list[ScanResult]:
+    """``scan`` over ``profile_groups`` at ``sample_rate``."""
+    reader = isinstance(samples, WavReader)
+    if chunk_seconds is None and reader:
+        chunk_seconds = READER_CHUNK_SECONDS
+    chunk = None if chunk_seconds is None else max(1, round(chunk_seconds)) * sample_rate
+    regions: list[tuple[ProfileGroup, int, int]] = []
+    if gate == "chime":
+        regions = _groupRegions(
+            locateBursts(samples=samples, sample_rate=sample_rate, profile=profile), profile_groups
+        )
+        regions.sort(key=lambda region: profile_groups.index(region[0]))
+    else:
+        for group in profile_groups:
+            if gate:
+                spans = [
+                    (region.startSample, region.endSample)
+                    for region in probe(samples=samples, sample_rate=sample_rate, profile=group[0])
+                ]
             else:
-                tone_bits = demodAfsk(
-                    samples=samples,
-                    sample_rate=resolved_sample_rate,
-                    baud=baud,
-                    offset=int(offset),
-                    mark_freq=settings.markFreq,
-                    space_freq=settings.spaceFreq,
+                spans = [(0, len(samples))]
+            regions.extend((group, span_start, span_end) for span_start, span_end in spans)
+
+    chunked = [
+        _chunkRanges(span_start, span_end, chunk, sample_rate, 0 if reader else _chunkOverlap(group[0], sample_rate))
+        for group, span_start, span_end in regions
+    ]
+    if reader:
+        # A file is read one chunk at a time, each past its core only until
+        # the audio falls silent rather than to the longest possible frame,
+        # so with silence between bursts resident memory follows the chunk size.
+        for (group, _, span_end), ranges in zip(regions, chunked):
+            overlap = _chunkOverlap(group[0], sample_rate)
+            for index, (start, _, core_start, core_end) in enumerate(ranges):
+                end = _burstEnd(samples, sample_rate, core_end, min(span_end, core_end + overlap))
+                ranges[index] = (start, end, core_start, core_end)
+    groups = 1
+    if workers is not None and workers > 1 and timing == "offsets":
+        groups = max(1, workers // max(1, sum(len(ranges) for ranges in chunked)))
+
+    jobs: list[_ScanJob] = []
+    for index, ((profile_group, _, _), ranges) in enumerate(zip(regions, chunked)):
+        offsets = _symbolOffsets(profile_group[0], sample_rate)
+        group_count = min(groups, len(offsets))
+        for start, end, core_start, core_end in ranges:
+            for group in range(group_count):
+                jobs.append(
+                    _ScanJob(index, profile_group, start, end, core_start, core_end, offsets[group::group_count])
                 )
-                data_bits = nrziDecode(tone_bits)
 
+    if workers is not None and workers > 1 and len(jobs) > 1 and len(samples) > 0:
+        found = _scanPooled(samples, sample_rate, jobs, gzip_decompress, timing, workers, engine)
+    else:
+        found = (
+            (
+                job,
+                _scanRegion(
+                    _regionSamples(samples, job.start, job.end),
+                    sample_rate,
+                    job.profiles,
+                    gzip_decompress,
+                    timing,
+                    job.offsets,
+                    cache,
+                    engine,
+                ),
+            )
+            for job in jobs
+        )
 
-            frames = extractFrames(data_bits)
-            for frame in frames:
-                parsed = None
-                try:
-                    parsed = _decodeFrame(frame.bytes, gzip_decompress)
-                except Exception:
-                    parsed = None
-                if not parsed or parsed.profile != current_profile:
-                    continue
-                start_sample = round(offset + frame.startBit * samples_per_bit)
-                end_sample = round(offset + frame.endBit * samples_per_bit)
-                confidence = 1.0
-                if confidence < min_confidence:
-                    continue
-                key = f"{current_profile.value}:{round(start_sample / max(1, samples_per_bit / 2))}"
-                if key in seen_keys:
-                    continue
-                seen_keys.add(key)
-                results.append(
-                    ScanResult(
-                        json=parsed.json,
-                        profile=parsed.profile,
-                        startSample=start_sample,
-                        endSample=end_sample,
-                        confidence=confidence,
-                    )
+    # Detections from offset groups and chunks are put back into the order a
+    # single pass sees them (offset by offset, in time) before deduplicating.
+    detected: list[list[tuple[int, int, int, _DecodedFrame]]] = [[] for _ in regions]
+    for job, detections in found:
+        for offset, parsed, start_sample, end_sample in detections:
+            start_sample += job.start
+            end_sample += job.start
+            if job.coreStart <= start_sample < job.coreEnd:
+                detected[job.region].append((offset, start_sample, end_sample, parsed))
+
+    results: list[ScanResult] = []
+    seen_keys: set[str] = set()
+    for (profile_group, _, _), region_detections in zip(regions, detected):
+        samples_per_bit = sample_rate / getProfileSettings(profile_group[0]).baud
+        region_detections.sort(key=lambda detection: (detection[0], detection[1]))
+        for _, start_sample, end_sample, parsed in region_detections:
+            confidence = 1.0
+            if confidence < min_confidence:
+                continue
+            key = f"{parsed.profile.value}:{round(start_sample / max(1, samples_per_bit / 2))}"
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            results.append(
+                ScanResult(
+                    json=parsed.json,
+                    profile=parsed.profile,
+                    startSample=start_sample,
+                    endSample=end_sample,
+                    confidence=confidence,
                 )
-            offset += offset_step
+            )
 
     results.sort(key=lambda r: r.startSample)
     return results
 
 
+def probe(
+    *,
+    samples: Samples,
+    sample_rate: Optional[int] = None,
+    profile: Optional[Union[Profile, str]] = None,
+    threshold: float = DEFAULT_GATE_THRESHOLD,
+    margin_ms: float = DEFAULT_GATE_MARGIN_MS,
+) -> list[ProbeRegion]:
+    resolved_sample_rate = sample_rate or DEFAULT_SAMPLE_RATE
+    if profile is not None:
+        profiles: list[Profile] = [normalizeProfile(profile)]
+    else:
+        profiles = list(PROFILE_NAMES)
+
+    margin = round((margin_ms / 1000.0) * resolved_sample_rate)
+    regions: list[ProbeRegion] = []
+    for current_profile in profiles:
+        tone_freqs, window, windows_per_block = _gateLayout(current_profile, resolved_sample_rate)
+        block_size = window * windows_per_block
+        block_ms = (block_size / resolved_sample_rate) * 1000.0
+        scores: list[float] = []
+        batch_size = GATE_BATCH_BLOCKS * block_size
+        for batch_start in range(0, len(samples) - block_size + 1, batch_size):
+            scores.extend(
+                blockToneScores(
+                    samples[batch_start : batch_start + batch_size],
+                    resolved_sample_rate,
+                    tone_freqs,
+                    window,
+                    windows_per_block,
+                )
+            )
+        spans = candidateSpans(
+            scores,
+            threshold,
+            bridge=max(0, round(GATE_BRIDGE_MS / block_ms)),
+            min_length=max(1, round(GATE_MIN_MS / block_ms)),
+        )
+
+        profile_regions: list[ProbeRegion] = []
+        for first_block, end_block in spans:
+            start_sample = max(0, first_block * block_size - margin)
+            end_sample = min(len(samples), end_block * block_size + margin)
+            score = sum(scores[first_block:end_block]) / (end_block - first_block)
+            if profile_regions and start_sample <= profile_regions[-1].endSample:
+                previous = profile_regions[-1]
+                previous.endSample = end_sample
+                previous.score = max(previous.score, score)
+                continue
+            profile_regions.append(
+                ProbeRegion(profile=current_profile, startSample=start_sample, endSample=end_sample, score=score)
+            )
+        regions.extend(profile_regions)
+
+    regions.sort(key=lambda r: r.startSample)
+    return regions
+
+
+def locateBursts(
+    *,
+    samples: Samples,
+    sample_rate: Optional[int] = None,
+    profile: Optional[Union[Profile, str]] = None,
+    threshold: float = DEFAULT_CHIME_THRESHOLD,
+    margin_ms: float = DEFAULT_GATE_MARGIN_MS,
+) -> list[ProbeRegion]:
+    """Find bursts by their lead-in chime and name the profiles that could have sent them.
+
+    Every profile's lead-in (mark tone then space tone) and tail (space then
+    mark) chimes are matched-filtered over the audio. A burst runs from a
+    lead-in chime to the next tail chime of the same signature, or to the
+    next lead-in when the tail is missing. Profiles with identical chimes
+    (``afsk-fifth`` and ``gfsk-fifth``) each get a region for the same burst;
+    ``score`` is the lead-in's matched-filter score. Bursts encoded without a
+    lead-in, or with non-default chime lengths, are not found.
+    """
+    resolved_sample_rate = sample_rate or DEFAULT_SAMPLE_RATE
+    if profile is not None:
+        profiles: list[Profile] = [normalizeProfile(profile)]
+    else:
+        profiles = list(PROFILE_NAMES)
+
+    groups: dict[tuple[ChimeSignature, Optional[ChimeSignature]], list[Profile]] = {}
+    for current_profile in profiles:
+        settings = getProfileSettings(current_profile)
+        if settings.leadInToneMs <= 0:
+            continue
+        lead = _chimeSignature(
+            settings.markFreq, settings.spaceFreq, settings.leadInToneMs, settings.leadInGapMs, resolved_sample_rate
+        )
+        tail = None
+        if settings.tailToneMs > 0:
+            tail = _chimeSignature(
+                settings.spaceFreq, settings.markFreq, settings.tailToneMs, settings.tailGapMs, resolved_sample_rate
+            )
+        groups.setdefault((lead, tail), []).append(current_profile)
+    if not groups:
+        return []
+
+    signatures = list(dict.fromkeys(signature for key in groups for signature in key if signature is not None))
+    span = max(signature.length for signature in signatures)
+    stride = chimeStride(resolved_sample_rate, signatures)
+    step = chimeStep(resolved_sample_rate, stride)
+    total = len(samples)
+    starts: list[int] = []
+    scores: list[list[float]] = [[] for _ in signatures]
+    for batch_start in range(0, max(0, total - span + 1), CHIME_BATCH_SAMPLES):
+        first = -(-batch_start // step) * step
+        last = min(batch_start + CHIME_BATCH_SAMPLES, total - span + 1)
+        batch_starts = list(range(first, last, step))
+        if not batch_starts:
+            continue
+        batch = _regionSamples(samples, first, batch_starts[-1] + span)
+        batch_scores = chimeScores(
+            batch, resolved_sample_rate, signatures, [start - first for start in batch_starts], stride
+        )
+        starts.extend(batch_starts)
+        for index, signature_scores in enumerate(batch_scores):
+            scores[index].extend(signature_scores)
+    peaks = {
+        signature: chimePeaks(starts, scores[index], threshold, signature.length)
+        for index, signature in enumerate(signatures)
+    }
+
+    margin = round((margin_ms / 1000.0) * resolved_sample_rate)
+    regions: list[ProbeRegion] = []
+    for (lead, tail), group_profiles in groups.items():
+        leads = peaks[lead]
+        tails = peaks[tail] if tail is not None else []
+        for index, (start_sample, score) in enumerate(leads):
+            limit = leads[index + 1][0] if index + 1 < len(leads) else total
+            end_sample = next(
+                (t + tail.length for t, _ in tails if tail is not None and start_sample < t and t + tail.length <= limit),
+                limit,
+            )
+            for current_profile in group_profiles:
+                regions.append(
+                    ProbeRegion(
+                        profile=current_profile,
+                        startSample=max(0, start_sample - margin),
+                        endSample=min(total, end_sample + margin),
+                        score=score,
+                    )
+                )
+
+    regions.sort(key=lambda r: r.startSample)
+    return regions
+
+
+def _chimeSignature(
+    first_freq: float,
+    second_freq: float,
+    tone_ms: float,
+    gap_ms: float,
+    sample_rate: int,
+) -> ChimeSignature:
+    """The signature of ``encode.buildChime`` with these settings."""
+    tone_samples = max(1, round((tone_ms / 1000.0) * sample_rate))
+    gap_samples = max(1, round((gap_ms / 1000.0) * sample_rate)) if gap_ms > 0 else 0
+    return ChimeSignature(first_freq, second_freq, tone_samples, gap_samples)
+
+
+def _decimationFactor(sample_rate: int, limit: int, profile: Profile) -> int:
+    """The largest factor up to ``limit`` dividing ``sample_rate`` that leaves ``profile`` demodulable."""
+    settings = getProfileSettings(profile)
+    tones = sorted(settings.tones or [settings.markFreq, settings.spaceFreq])
+    # The main lobe of the keyed signal must sit below the decimator's passband edge.
+    min_rate = (tones[-1] + settings.baud / 2) / (DECIMATE_CUTOFF / 2)
+    # Both engines slice at whole-sample offsets, so a narrow tone shift
+    # needs more samples per symbol to keep the eye open.
+    symbol_rate = settings.baud / (settings.bitsPerSymbol or 1)
+    index = min(high - low for low, high in zip(tones, tones[1:])) / symbol_rate
+    min_rate = max(min_rate, symbol_rate * DECIMATE_EYE_SAMPLES / index)
+    for factor in range(limit, 1, -1):
+        if sample_rate % factor == 0 and sample_rate / factor >= min_rate:
+            return factor
+    return 1
+
+
+def _scanRegion(
+    samples: list[float],
+    sample_rate: int,
+    profiles: ProfileGroup,
+    gzip_decompress: Optional[Callable[[bytes], bytes]],
+    timing: ScanTiming = "offsets",
+    offsets: Optional[Sequence[int]] = None,
+    frame_cache: Optional[FrameCache] = None,
+    engine: DemodEngine = "correlator",
+) -> Iterator[tuple[int, _DecodedFrame, int, int]]:
+    """Demodulate ``samples`` for a group of profiles that share tones and baud.
+
+    Frames are kept when their header names one of ``profiles``.
+    """
+    settings = getProfileSettings(profiles[0])
+    if frame_cache is None:
+        frame_cache = FrameCache()
+    baud = settings.baud
+    samples_per_bit = sample_rate / baud
+    bits_per_symbol = settings.bitsPerSymbol or 1
+    samples_per_symbol = samples_per_bit * bits_per_symbol
+    if offsets is None:
+        offsets = _symbolOffsets(profiles[0], sample_rate)
+    tone_freqs = settings.tones or [settings.markFreq, settings.spaceFreq]
+    if engine == "discriminator" and timing == "offsets" and settings.modulation != "mfsk":
+        yield from _scanDiscriminated(
+            samples, sample_rate, baud, offsets, settings.markFreq, settings.spaceFreq, profiles, gzip_decompress, frame_cache
+        )
+        return
+    correlator = ToneCorrelator(samples, sample_rate, tone_freqs)
+
+    if timing == "preamble":
+        slicer = SymbolSlicer(
+            settings.modulation,
+            tone_freqs[: 1 << bits_per_symbol] if settings.modulation == "mfsk" else tone_freqs[:2],
+            bits_per_symbol,
+        )
+        yield from _scanBursts(correlator, slicer, samples_per_symbol, profiles, gzip_decompress, frame_cache)
+        return
+
+    for offset in offsets:
+        if settings.modulation == "mfsk":
+            data_bits = demodMfsk(
+                samples=samples,
+                sample_rate=sample_rate,
+                baud=baud,
+                offset=int(offset),
+                tones=tone_freqs,
+                bits_per_symbol=bits_per_symbol,
+                correlator=correlator,
+            )
+        else:
+            tone_bits = demodAfsk(
+                samples=samples,
+                sample_rate=sample_rate,
+                baud=baud,
+                offset=int(offset),
+                mark_freq=settings.markFreq,
+                space_freq=settings.spaceFreq,
+                correlator=correlator,
+            )
+            data_bits = nrziDecode(tone_bits)
+
+        for frame in extractFrames(data_bits, frameLength):
+            parsed = frame_cache.decode(frame.bytes, gzip_decompress)
+            if not parsed or parsed.profile not in profiles:
+                continue
+            start_sample = round(offset + frame.startBit * samples_per_bit)
+            end_sample = round(offset + frame.endBit * samples_per_bit)
+            yield offset, parsed, start_sample, end_sample
+
+
+def _scanDiscriminated(
+    samples: Sequence[float],
+    sample_rate: int,
+    baud: float,
+    offsets: Sequence[int],
+    mark_freq: float,
+    space_freq: float,
+    profiles: ProfileGroup,
+    gzip_decompress: Optional[Callable[[bytes], bytes]],
+    frame_cache: FrameCache,
+) -> Iterator[tuple[int, _DecodedFrame, int, int]]:
+    samples_per_bit = sample_rate / baud
+    discriminator = FmDiscriminator(samples, sample_rate, mark_freq, space_freq)
+    for offset in offsets:
+        tone_bits = demodFm(
+            samples=samples,
+            sample_rate=sample_rate,
+            baud=baud,
+            offset=int(offset),
+            mark_freq=mark_freq,
+            space_freq=space_freq,
+            discriminator=discriminator,
+        )
+        for frame in extractFrames(nrziDecode(tone_bits), frameLength):
+            parsed = frame_cache.decode(frame.bytes, gzip_decompress)
+            if not parsed or parsed.profile not in profiles:
+                continue
+            start_sample = round(offset + frame.startBit * samples_per_bit)
+            end_sample = round(offset + frame.endBit * samples_per_bit)
+            yield offset, parsed, start_sample, end_sample
+
+
+def _profileGroups(profiles: Sequence[Profile]) -> list[ProfileGroup]:
+    """Group profiles demodulated identically: same modem family, tones, baud and symbol size."""
+    groups: dict[tuple[object, ...], list[Profile]] = {}
+    for current_profile in profiles:
+        settings = getProfileSettings(current_profile)
+        bits_per_symbol = settings.bitsPerSymbol or 1
+        if settings.modulation == "mfsk":
+            tones = tuple((settings.tones or [settings.markFreq, settings.spaceFreq])[: 1 << bits_per_symbol])
+        else:
+            tones = (settings.markFreq, settings.spaceFreq)
+        key = (settings.modulation == "mfsk", tones, settings.baud, bits_per_symbol)
+        groups.setdefault(key, []).append(current_profile)
+    return [tuple(group) for group in groups.values()]
+
+
+def _groupRegions(
+    regions: Sequence[ProbeRegion],
+    profile_groups: Sequence[ProfileGroup],
+) -> list[tuple[ProfileGroup, int, int]]:
+    """Per-profile regions as ``(group, start, end)``, each group's copies of a region merged."""
+    group_of = {current: group for group in profile_groups for current in group}
+    merged = dict.fromkeys(
+        (group_of[region.profile], region.startSample, region.endSample)
+        for region in regions
+        if region.profile in group_of
+    )
+    return list(merged)
+
+
+def _regionSamples(samples: Sequence[float], start: int, end: int) -> Sequence[float]:
+    """Samples ``start .. end - 1``; a ``WavReader`` is always read, never scanned in place."""
+    if start == 0 and end == len(samples) and not isinstance(samples, WavReader):
+        return samples
+    return samples[start:end]
+
+
+def _symbolOffsets(profile: Profile, sample_rate: int) -> list[int]:
+    """Sub-symbol offsets the brute-force search demodulates a profile at."""
+    settings = getProfileSettings(profile)
+    samples_per_symbol = (sample_rate / settings.baud) * (settings.bitsPerSymbol or 1)
+    return list(range(0, math.ceil(samples_per_symbol), max(1, round(samples_per_symbol / 8))))
+
+
+def _chunkOverlap(profile: Profile, sample_rate: int) -> int:
+    """Samples past a chunk's core needed to finish the longest possible frame."""
+    settings = getProfileSettings(profile)
+    samples_per_bit = sample_rate / settings.baud
+    samples_per_symbol = samples_per_bit * (settings.bitsPerSymbol or 1)
+    return math.ceil((maxFrameBits() + len(FLAG_BITS)) * samples_per_bit + 2 * samples_per_symbol)
+
+
+def _gateLayout(profile: Profile, sample_rate: int) -> tuple[list[float], int, int]:
+    """Tones, window and windows per block the energy gate scores ``profile`` with."""
+    settings = getProfileSettings(profile)
+    bits_per_symbol = settings.bitsPerSymbol or 1
+    window = max(2, round((sample_rate / settings.baud) * bits_per_symbol))
+    windows_per_block = max(1, round((GATE_BLOCK_MS / 1000.0) * sample_rate / window))
+    tone_freqs = settings.tones or [settings.markFreq, settings.spaceFreq]
+    if settings.modulation == "mfsk":
+        tone_freqs = tone_freqs[: 1 << bits_per_symbol]
+    return tone_freqs, window, windows_per_block
+
+
+def _burstEnd(samples: Samples, sample_rate: int, position: int, limit: int) -> int:
+    """Where the audio under ``position`` first falls silent, plus a margin, capped at ``limit``.
+
+    A frame is keyed without gaps, so one that is still being sent at
+    ``position`` ends before the first block quieter than ``SILENCE_POWER``.
+    Only absolute silence ends the search: the tones' share of the energy,
+    which the gate scores, also drops under loud out-of-band audio such as
+    mains hum while the frame is still keyed. The audio is read a few
+    seconds at a time.
+    """
+    if position >= limit:
+        return limit
+    block_size = max(1, round((GATE_BLOCK_MS / 1000.0) * sample_rate))
+    margin = round((DEFAULT_GATE_MARGIN_MS / 1000.0) * sample_rate)
+    floor = SILENCE_POWER * block_size
+    batch_size = BURST_SEARCH_BLOCKS * block_size
+    for batch_start in range(position, limit, batch_size):
+        batch = samples[batch_start : min(limit, batch_start + batch_size)]
+        count = len(batch) // block_size
+        if np is not None:
+            blocks = np.asarray(batch[: count * block_size], dtype=np.float64).reshape(count, block_size)
+            silent = np.flatnonzero(np.einsum("ij,ij->i", blocks, blocks) <= floor)
+            first = int(silent[0]) if len(silent) else None
+        else:
+            first = None
+            for index in range(count):
+                block = batch[index * block_size : (index + 1) * block_size]
+                if sum(value * value for value in block) <= floor:
+                    first = index
+                    break
+        if first is not None:
+            return min(limit, batch_start + first * block_size + margin)
+    return limit
+
+
+def _chunkRanges(
+    start: int,
+    end: int,
+    chunk: Optional[int],
+    guard: int,
+    overlap: int,
+) -> list[tuple[int, int, int, int]]:
+    """Split ``[start, end)`` into ``(start, end, core_start, core_end)`` chunks.
+
+    Cores tile the range in steps of ``chunk`` samples. Each chunk is read from
+    ``guard`` samples before its core, so NRZI and flag sync settle, to
+    ``overlap`` samples after it, so every frame starting in the core ends
+    inside the chunk. ``chunk`` and ``guard`` are whole seconds, which keeps the
+    symbol grid of every chunk on the grid of the whole range.
+    """
+    if chunk is None or end - start <= chunk + overlap:
+        return [(start, end, start, end)]
+    ranges: list[tuple[int, int, int, int]] = []
+    for core_start in range(start, end, chunk):
+        core_end = min(end, core_start + chunk)
+        ranges.append((max(start, core_start - guard), min(end, core_end + overlap), core_start, core_end))
+    return ranges
+
+
+@dataclass
+class _ScanJob:
+    region: int
+    profiles: ProfileGroup
+    start: int
+    end: int
+    coreStart: int
+    coreEnd: int
+    offsets: list[int]
+
+
+def _scanPooled(
+    samples: Sequence[float],
+    sample_rate: int,
+    jobs: list[_ScanJob],
+    gzip_decompress: Optional[Callable[[bytes], bytes]],
+    timing: ScanTiming,
+    workers: int,
+    engine: DemodEngine,
+) -> list[tuple[_ScanJob, list[tuple[int, _DecodedFrame, int, int]]]]:
+    """Run scan jobs on a process pool, returning detections in job order.
+
+    The samples are copied once into shared memory as float64 so workers map
+    them instead of unpickling a copy per job. A ``WavReader`` is not copied:
+    each worker maps the file itself and reads just its job's range.
+    """
+    if isinstance(samples, WavReader):
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = [
+                pool.submit(_scanWavJob, samples.path, sample_rate, job, gzip_decompress, timing, engine) for job in jobs
+            ]
+            return [(job, future.result()) for job, future in zip(jobs, futures)]
+
+    shm = shared_memory.SharedMemory(create=True, size=8 * len(samples))
+    try:
+        _copyFloat64(shm.buf, samples)
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = [
+                pool.submit(_scanSharedJob, shm.name, len(samples), sample_rate, job, gzip_decompress, timing, engine)
+                for job in jobs
+            ]
+            return [(job, future.result()) for job, future in zip(jobs, futures)]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _copyFloat64(buffer: memoryview, samples: Samples) -> None:
+    """Write ``samples`` into ``buffer`` as float64 in one bulk copy, whatever the container."""
+    count = len(samples)
+    if np is not None:
+        target = np.ndarray((count,), dtype=np.float64, buffer=buffer)
+        target[:] = samples
+        # The shared block cannot be closed while an array still exports it.
+        del target
+        return
+    view = buffer.cast("d")
+    try:
+        if isinstance(samples, array) and samples.typecode == "d":
+            view[:count] = memoryview(samples)
+        else:
+            view[:count] = array("d", samples)
+    finally:
+        view.release()
+
+
+def _scanSharedJob(
+    name: str,
+    count: int,
+    sample_rate: int,
+    job: _ScanJob,
+    gzip_decompress: Optional[Callable[[bytes], bytes]],
+    timing: ScanTiming,
+    engine: DemodEngine,
+) -> list[tuple[int, _DecodedFrame, int, int]]:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = shm.buf.cast("d")
+        region = view[job.start : min(job.end, count)]
+        try:
+            return list(_scanRegion(region, sample_rate, job.profiles, gzip_decompress, timing, job.offsets, engine=engine))
+        finally:
+            region.release()
+            view.release()
+    finally:
+        shm.close()
+
+
+def _scanBursts(
+    correlator: ToneCorrelator,
+    slicer: SymbolSlicer,
+    samples_per_symbol: float,
+    profiles: ProfileGroup,
+    gzip_decompress: Optional[Callable[[bytes], bytes]],
+    frame_cache: FrameCache,
+) -> Iterator[tuple[int, _DecodedFrame, int, int]]:
+    samples_per_bit = samples_per_symbol / slicer.bitsPerSymbol
+    frame_bits = maxFrameBits()
+    decoded_end = -1
+    for burst in acquireBursts(correlator=correlator, slicer=slicer, samples_per_symbol=samples_per_symbol):
+        # A preamble inside a frame already decoded is part of that burst.
+        if burst.startSample < decoded_end:
+            continue
+        # The best phase is tried first; the rest only if the burst fails to decode.
+        for phase in burst.phases:
+            found = False
+            for frame, first_sample in demodulateBurst(
+                correlator=correlator,
+                slicer=slicer,
+                samples_per_symbol=samples_per_symbol,
+                burst=burst,
+                phase=phase,
+                max_frame_bits=frame_bits,
+            ):
+                parsed = frame_cache.decode(frame.bytes, gzip_decompress)
+                if not parsed or parsed.profile not in profiles:
+                    continue
+                found = True
+                start_sample = round(first_sample + frame.startBit * samples_per_bit)
+                end_sample = round(first_sample + frame.endBit * samples_per_bit)
+                decoded_end = max(decoded_end, end_sample)
+                yield 0, parsed, start_sample, end_sample
+            if found:
+                break
+
+
 @dataclass
 class _DecodedFrame:
     json: object
     profile: Profile
 
 
+class FrameCache:
+    """Size-bounded LRU of decoded frames, keyed on the raw frame bytes and decompressor.
+
+    ``scan`` uses a fresh cache per call so a frame found at several symbol
+    offsets is CRC-checked, error-corrected, decompressed and parsed once.
+    Pass one to ``scan``/``decode`` to also reuse decodes across calls, for
+    example when the same clip is scanned repeatedly. Frames that fail to
+    decode are cached too. A frame is decoded afresh for each distinct
+    ``gzip_decompress``, so one cache can be shared across decompressors.
+    Results served from the cache share the decoded JSON value, so treat it
+    as read-only. In pooled scans each worker job keeps its own cache.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self.maxEntries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[
+            tuple[bytes, Optional[Callable[[bytes], bytes]]], Optional[_DecodedFrame]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def decode(
+        self,
+        data: bytes,
+        gzip_decompress: Optional[Callable[[bytes], bytes]] = None,
+    ) -> Optional[_DecodedFrame]:
+        entries = self._entries
+        key = (data, gzip_decompress)
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        self.misses += 1
+        try:
+            parsed = _decodeFrame(data, gzip_decompress)
+        except Exception:
+            parsed = None
+        entries[key] = parsed
+        if len(entries) > self.maxEntries:
+            entries.popitem(last=False)
+        return parsed
+
+
 def _decodeFrame(
     data: bytes,
     gzip_decompress: Optional[Callable[[bytes], bytes]] = None,
@@ -145,15 +963,17 @@ def _decodeFrame(
     crc_ok = crc_expected == crc_actual
 
     if header.fecEnabled:
+        # The CRC covers the transmitted codewords, so a frame that already
+        # checks out needs no error correction: just drop the parity.
         try:
-            payload = rsDecode(payload_with_fec, header.payloadLength)
+            if crc_ok:
+                payload = rsStripParity(payload_with_fec)
+            else:
+                decoded = rsDecodeBlocks(payload_with_fec, header.payloadLength)
+                payload = decoded.payload
+                crc_ok = Crc16X25(raw[:8]).update(decoded.codewords).value == crc_expected
         except Exception:
             return None
-        if not crc_ok:
-            corrected_payload_with_fec = rsEncode(payload)
-            corrected_frame = concatBytes(raw[:8], corrected_payload_with_fec)
-            corrected_crc = crc16X25(corrected_frame)
-            crc_ok = corrected_crc == crc_expected
     else:
         if not crc_ok:
             return None
@@ -172,3 +992,16 @@ def _decodeFrame(
 
     json_value = decodeJson(payload)
     return _DecodedFrame(json=json_value, profile=header.profile)
+
+
+def _scanWavJob(
+    path: str,
+    sample_rate: int,
+    job: _ScanJob,
+    gzip_decompress: Optional[Callable[[bytes], bytes]],
+    timing: ScanTiming,
+    engine: DemodEngine,
+) -> list[tuple[int, _DecodedFrame, int, int]]:
+    with WavReader(path) as reader:
+        region = reader[job.start : job.end]
+    return list(_scanRegion(region, sample_rate, job.profiles, gzip_decompress, timing, job.offsets, engine=engine))
@@ -1,22 +1,30 @@
 from __future__ import annotations
 
 import gzip as gzip_lib
-from typing import Callable, Optional, Union
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 from .codec.afskModem import tonesToSamples
 from .codec.gfskModem import gfskTonesToSamples
 from .codec.mfskModem import mfskBitsToSamples
-from .codec.hdlcFraming import buildBitstream
+from .codec.hdlcFraming import buildBitstream, preambleBitCount
 from .codec.jsonCodec import encodeJson
 from .codec.nrziCodec import nrziEncode
 from .codec.profile import getProfileSettings, profileFlag
 from .codec.frame import buildFrame
 from .codec.reedSolomonCodec import rsEncode
+from .codec.segmentCache import segmentCache
 from .codec.tone import toneToSamples
 from .codec.constants import FLAG_FEC, FLAG_GZIP
 from .codec.defaults import DEFAULT_LEVEL_DB, DEFAULT_SAMPLE_RATE
 from .profiles import DEFAULT_PROFILE, Profile, normalizeProfile
-from .types import EncodeResult
+from .types import EncodeResult, Samples, SamplesFormat
 
 
 def encode(
@@ -38,7 +46,73 @@ def encode(
     tail_out: Optional[bool] = None,
     tail_tone_ms: Optional[float] = None,
     tail_gap_ms: Optional[float] = None,
+    samples_format: SamplesFormat = "list",
 ) -> EncodeResult:
+    """Encode ``payload`` to mono audio.
+
+    ``samples_format`` picks the container for ``samples``: ``"list"``
+    (default), ``"array"`` for an ``array('f')``, or ``"numpy"`` for a float32
+    NumPy array. The compact formats hold 4 bytes per sample.
+    """
+    encoded = _encodeSegments(
+        payload=payload,
+        sample_rate=sample_rate,
+        profile=profile,
+        fec=fec,
+        gzip=gzip,
+        gzip_compress=gzip_compress,
+        gzip_min_savings_bytes=gzip_min_savings_bytes,
+        gzip_min_savings_pct=gzip_min_savings_pct,
+        preamble_ms=preamble_ms,
+        fade_ms=fade_ms,
+        level_db=level_db,
+        lead_in=lead_in,
+        lead_in_tone_ms=lead_in_tone_ms,
+        lead_in_gap_ms=lead_in_gap_ms,
+        tail_out=tail_out,
+        tail_tone_ms=tail_tone_ms,
+        tail_gap_ms=tail_gap_ms,
+    )
+    samples = joinSamples(encoded.segments, samples_format)
+    return EncodeResult(
+        sampleRate=encoded.sampleRate,
+        profile=encoded.profile,
+        samples=samples,
+        durationMs=encoded.durationMs,
+        payloadBytes=encoded.payloadBytes,
+    )
+
+
+@dataclass
+class _EncodedSegments:
+    sampleRate: int
+    profile: Profile
+    segments: list[list[float]]
+    durationMs: float
+    payloadBytes: int
+
+
+def _encodeSegments(
+    *,
+    payload: object,
+    sample_rate: Optional[int] = None,
+    profile: Optional[Union[Profile, str]] = None,
+    fec: bool = True,
+    gzip: Union[bool, str] = "auto",
+    gzip_compress: Optional[Callable[[bytes], bytes]] = None,
+    gzip_min_savings_bytes: int = 8,
+    gzip_min_savings_pct: float = 0.08,
+    preamble_ms: Optional[float] = None,
+    fade_ms: Optional[float] = None,
+    level_db: Optional[float] = None,
+    lead_in: Optional[bool] = None,
+    lead_in_tone_ms: Optional[float] = None,
+    lead_in_gap_ms: Optional[float] = None,
+    tail_out: Optional[bool] = None,
+    tail_tone_ms: Optional[float] = None,
+    tail_gap_ms: Optional[float] = None,
+) -> _EncodedSegments:
+    """Synthesize a payload as separate lead-in, body and tail sample lists."""
     resolved_sample_rate = sample_rate or DEFAULT_SAMPLE_RATE
     resolved_profile = normalizeProfile(profile, DEFAULT_PROFILE)
     settings = getProfileSettings(resolved_profile)
@@ -72,6 +146,8 @@ def encode(
     resolved_preamble_ms = preamble_ms if preamble_ms is not None else settings.preambleMs
     resolved_fade_ms = fade_ms if fade_ms is not None else settings.fadeMs
     bitstream = buildBitstream(frame, resolved_preamble_ms, settings.baud)
+    # The preamble flags are the same for every payload, so their audio is cached.
+    preamble_bits = preambleBitCount(resolved_preamble_ms, settings.baud)
     encoded_bits = bitstream if settings.modulation == "mfsk" else nrziEncode(bitstream)
 
     db_level = level_db if level_db is not None else DEFAULT_LEVEL_DB
@@ -87,6 +163,7 @@ def encode(
             fade_ms=resolved_fade_ms,
             bt=settings.bt,
             span_symbols=settings.spanSymbols,
+            cached_prefix=preamble_bits,
         )
     elif settings.modulation == "mfsk":
         samples = mfskBitsToSamples(
@@ -97,6 +174,7 @@ def encode(
             bits_per_symbol=settings.bitsPerSymbol or 1,
             level_db=db_level,
             fade_ms=resolved_fade_ms,
+            cached_prefix=preamble_bits,
         )
     else:
         samples = tonesToSamples(
@@ -107,8 +185,10 @@ def encode(
             space_freq=settings.spaceFreq,
             level_db=db_level,
             fade_ms=resolved_fade_ms,
+            cached_prefix=preamble_bits,
         )
 
+    segments = [samples]
     lead_in_enabled = lead_in
     if lead_in_enabled is None:
         lead_in_enabled = settings.leadInToneMs > 0 or settings.leadInGapMs > 0
@@ -125,7 +205,7 @@ def encode(
                 first_freq=settings.markFreq,
                 second_freq=settings.spaceFreq,
             )
-            samples = concatSamples([lead_samples, samples])
+            segments.insert(0, lead_samples)
 
     tail_out_enabled = tail_out
     if tail_out_enabled is None:
@@ -143,14 +223,14 @@ def encode(
                 first_freq=settings.spaceFreq,
                 second_freq=settings.markFreq,
             )
-            samples = concatSamples([samples, tail_samples])
+            segments.append(tail_samples)
 
-    duration_ms = (len(samples) / resolved_sample_rate) * 1000.0
+    duration_ms = (sum(len(segment) for segment in segments) / resolved_sample_rate) * 1000.0
 
-    return EncodeResult(
+    return _EncodedSegments(
         sampleRate=resolved_sample_rate,
         profile=resolved_profile,
-        samples=samples,
+        segments=segments,
         durationMs=duration_ms,
         payloadBytes=len(encoded_payload),
     )
@@ -164,6 +244,36 @@ def buildChime(
     gap_ms: float,
     first_freq: float,
     second_freq: float,
+) -> list[float]:
+    """Two tones ``gap_ms`` apart, built once per set of settings and then copied from the segment cache."""
+    key = ("chime", sample_rate, level_db, fade_ms, tone_ms, gap_ms, first_freq, second_freq)
+    chime = segmentCache.get(
+        key,
+        lambda: array(
+            "d",
+            _synthesizeChime(
+                sample_rate=sample_rate,
+                level_db=level_db,
+                fade_ms=fade_ms,
+                tone_ms=tone_ms,
+                gap_ms=gap_ms,
+                first_freq=first_freq,
+                second_freq=second_freq,
+            ),
+        ),
+    )
+    return chime.tolist()
+
+
+def _synthesizeChime(
+    *,
+    sample_rate: float,
+    level_db: float,
+    fade_ms: float,
+    tone_ms: float,
+    gap_ms: float,
+    first_freq: float,
+    second_freq: float,
 ) -> list[float]:
     first = toneToSamples(
         freq=first_freq,
@@ -188,3 +298,30 @@ def concatSamples(chunks: list[list[float]]) -> list[float]:
     for chunk in chunks:
         out.extend(chunk)
     return out
+
+
+def joinSamples(chunks: Sequence[Samples], samples_format: SamplesFormat = "list") -> Samples:
+    """Concatenate ``chunks`` into one container of ``samples_format``."""
+    if samples_format == "list":
+        return concatSamples([_asList(chunk) for chunk in chunks])
+    if samples_format == "array":
+        out = array("f")
+        for chunk in chunks:
+            if np is not None and isinstance(chunk, np.ndarray):
+                out.frombytes(chunk.astype(np.float32).tobytes())
+            else:
+                out.fromlist(_asList(chunk))
+        return out
+    if samples_format == "numpy":
+        if np is None:
+            raise ValueError('samples_format="numpy" requires NumPy')
+        parts = [np.asarray(chunk, dtype=np.float32) for chunk in chunks if len(chunk)]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+    raise ValueError(f"Unknown samples_format {samples_format!r}")
+
+
+def _asList(chunk: Samples) -> list[float]:
+    if isinstance(chunk, list):
+        return chunk
+    tolist = getattr(chunk, "tolist", None)
+    return tolist() if tolist is not None else list(chunk)
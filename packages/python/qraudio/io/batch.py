@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TypeVar, Union
+
+from ..types import BatchEncodeResult, BatchScanResult
+from .fs import scanWavFile
+from .wav import WavFormat, encodeWav
+
+# Payloads sent to a worker per task, so IPC is paid per batch rather than
+# per payload; small payloads encode in a few milliseconds each.
+BATCH_CHUNK_PAYLOADS = 16
+# Tasks queued per worker, bounding how much of the input iterable is read ahead.
+BATCH_TASKS_PER_WORKER = 4
+
+T = TypeVar("T")
+
+
+def encodeMany(
+    payloads: Iterable[object],
+    *,
+    out_dir: Optional[Union[str, Path]] = None,
+    name_format: str = "{index:06d}.wav",
+    workers: Optional[int] = None,
+    wav_format: WavFormat = "pcm16",
+    **options,
+) -> Iterator[BatchEncodeResult]:
+    """Encode many payloads to WAV, yielding each result as it completes.
+
+    ``payloads`` is read lazily, so it can be a generator over a large file.
+    With ``workers`` above 1 the payloads are encoded in batches on a process
+    pool. Each worker keeps its own segment cache, so chimes and preambles are
+    synthesized once per worker rather than once per payload. Results come
+    back in completion order; ``index`` is the payload's position in
+    ``payloads``.
+
+    With ``out_dir`` each WAV is written there by the process that encoded it,
+    named by ``name_format``, and the result's ``wav`` is left empty. Otherwise
+    the WAV bytes are returned in ``wav``. ``options`` are passed to
+    ``encodeWav`` and must be picklable when ``workers`` is used.
+    """
+    target = str(out_dir) if out_dir is not None else None
+    if target is not None:
+        Path(target).mkdir(parents=True, exist_ok=True)
+    chunks = _chunks(enumerate(payloads), BATCH_CHUNK_PAYLOADS)
+    for results in _runTasks(_encodeChunk, chunks, workers, target, name_format, wav_format, options):
+        yield from results
+
+
+def scanMany(
+    paths: Iterable[Union[str, Path]],
+    *,
+    workers: Optional[int] = None,
+    **options,
+) -> Iterator[BatchScanResult]:
+    """Scan many WAV files, yielding each file's detections as soon as it is scanned.
+
+    ``paths`` is read lazily. With ``workers`` above 1 the files are spread
+    over a process pool, one file per task, and each worker memory-maps its
+    file through ``scanWavFile``. Results come back in completion order. A
+    file that cannot be read or scanned yields a result with ``error`` set
+    instead of stopping the batch. ``options`` are passed to ``scanWavFile``
+    and must be picklable when ``workers`` is used.
+    """
+    yield from _runTasks(_scanFile, (str(path) for path in paths), workers, options)
+
+
+def _runTasks(
+    task: Callable[..., T],
+    items: Iterable[object],
+    workers: Optional[int],
+    *args: object,
+) -> Iterator[T]:
+    """``task(item, *args)`` for every item, in-process or on a pool, in completion order."""
+    if workers is None or workers <= 1:
+        for item in items:
+            yield task(item, *args)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending: set[Future[T]] = set()
+        for item in items:
+            pending.add(pool.submit(task, item, *args))
+            if len(pending) >= workers * BATCH_TASKS_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _chunks(items: Iterable[tuple[int, object]], size: int) -> Iterator[list[tuple[int, object]]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _encodeChunk(
+    chunk: list[tuple[int, object]],
+    out_dir: Optional[str],
+    name_format: str,
+    wav_format: WavFormat,
+    options: dict[str, object],
+) -> list[BatchEncodeResult]:
+    results: list[BatchEncodeResult] = []
+    for index, payload in chunk:
+        encoded = encodeWav(payload=payload, wav_format=wav_format, return_samples=False, **options)
+        path: Optional[str] = None
+        wav = encoded.wav
+        if out_dir is not None:
+            path = str(Path(out_dir) / name_format.format(index=index))
+            Path(path).write_bytes(wav)
+            wav = b""
+        results.append(
+            BatchEncodeResult(
+                index=index,
+                profile=encoded.profile,
+                sampleRate=encoded.sampleRate,
+                durationMs=encoded.durationMs,
+                payloadBytes=encoded.payloadBytes,
+                wavBytes=len(encoded.wav),
+                path=path,
+                wav=wav,
+            )
+        )
+    return results
+
+
+def _scanFile(path: str, options: dict[str, object]) -> BatchScanResult:
+    try:
+        results = scanWavFile(path=path, **options)
+    except Exception as exc:
+        return BatchScanResult(path=path, results=[], error=str(exc) or type(exc).__name__)
+    return BatchScanResult(path=path, results=results)
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
+from ..decode import decode, scan
 from .wav import (
-    decodeWav,
     encodeWav,
     prependPayloadToWav,
-    scanWav,
     WavFormat,
 )
+from .wavReader import WavReader, openWav
 from ..profiles import Profile
 from ..types import DecodeResult, EncodeWavResult, PrependWavResult, ScanResult
 
@@ -28,22 +29,34 @@ def encodeWavFile(
 
 def decodeWavFile(
     *,
-    path: Union[str, Path],
+    path: Union[str, Path, WavReader],
     profile: Optional[Union[Profile, str]] = None,
+    sample_rate: Optional[int] = None,
     **options,
 ) -> DecodeResult:
-    data = Path(path).read_bytes()
-    return decodeWav(wav_bytes=data, profile=profile, **options)
+    with _openReader(path) as reader:
+        return decode(
+            samples=reader,
+            sample_rate=sample_rate or reader.sampleRate,
+            profile=profile,
+            **options,
+        )
 
 
 def scanWavFile(
     *,
-    path: Union[str, Path],
+    path: Union[str, Path, WavReader],
     profile: Optional[Union[Profile, str]] = None,
+    sample_rate: Optional[int] = None,
     **options,
 ) -> list[ScanResult]:
-    data = Path(path).read_bytes()
-    return scanWav(wav_bytes=data, profile=profile, **options)
+    with _openReader(path) as reader:
+        return scan(
+            samples=reader,
+            sample_rate=sample_rate or reader.sampleRate,
+            profile=profile,
+            **options,
+        )
 
 
 def prependPayloadToWavFile(
@@ -58,3 +71,12 @@ def prependPayloadToWavFile(
     result = prependPayloadToWav(wav_bytes=data, payload=payload, wav_format=wav_format, **options)
     Path(out_path).write_bytes(result.wav)
     return result
+
+
+@contextmanager
+def _openReader(path: Union[str, Path, WavReader]) -> Iterator[WavReader]:
+    if isinstance(path, WavReader):
+        yield path
+        return
+    with openWav(path) as reader:
+        yield reader
@@ -1,12 +1,29 @@
 from __future__ import annotations
 
 import struct
-from typing import Literal, Optional, Union
+import sys
+from array import array
+from typing import Literal, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 from ..decode import decode, scan
-from ..encode import encode
+from ..encode import _encodeSegments, encode, joinSamples
 from ..profiles import Profile, normalizeProfile
-from ..types import DecodeResult, EncodeResult, EncodeWavResult, PrependWavResult, ScanResult, WavData
+from ..types import (
+    DecodeResult,
+    EncodeResult,
+    EncodeWavResult,
+    PrependWavResult,
+    Samples,
+    SamplesFormat,
+    ScanResult,
+    WavData,
+)
+from .wavReader import frameBuffer, mixdown, parseWavLayout
 
 WavFormat = Literal["pcm16", "float32"]
 
@@ -15,16 +32,26 @@ def encodeWav(
     *,
     payload: object,
     wav_format: WavFormat = "pcm16",
+    return_samples: bool = True,
+    samples_format: SamplesFormat = "list",
     **encode_options,
 ) -> EncodeWavResult:
-    result = encode(payload=payload, **encode_options)
-    wav = encodeWavSamples(samples=result.samples, sample_rate=result.sampleRate, fmt=wav_format)
+    """Encode straight to WAV bytes.
+
+    The lead-in, body and tail are packed into the WAV as they come out of
+    the modulators, without joining them into one float list first. Pass
+    ``return_samples=False`` to leave ``samples`` empty in the result when
+    only the WAV bytes are needed, and ``samples_format`` to get them as an
+    ``array('f')`` or float32 NumPy array, as for ``encode``.
+    """
+    encoded = _encodeSegments(payload=payload, **encode_options)
+    wav = _wavBytes(encoded.segments, encoded.sampleRate, wav_format)
     return EncodeWavResult(
-        sampleRate=result.sampleRate,
-        profile=result.profile,
-        samples=result.samples,
-        durationMs=result.durationMs,
-        payloadBytes=result.payloadBytes,
+        sampleRate=encoded.sampleRate,
+        profile=encoded.profile,
+        samples=joinSamples(encoded.segments if return_samples else [], samples_format),
+        durationMs=encoded.durationMs,
+        payloadBytes=encoded.payloadBytes,
         wav=wav,
     )
 
@@ -87,120 +114,82 @@ def prependPayloadToWav(
     pre_samples = secondsToSamples(sample_rate, pre_pad)
     post_samples = secondsToSamples(sample_rate, post_pad)
 
-    combined = [0.0] * (
-        pre_samples + len(payload_result.samples) + post_samples + len(input_data.samples)
+    wav_out = _wavBytes(
+        [[0.0] * pre_samples, payload_result.samples, [0.0] * post_samples, input_data.samples],
+        sample_rate,
+        wav_format,
     )
-    combined[pre_samples : pre_samples + len(payload_result.samples)] = payload_result.samples
-    offset = pre_samples + len(payload_result.samples) + post_samples
-    combined[offset : offset + len(input_data.samples)] = input_data.samples
-
-    wav_out = encodeWavSamples(samples=combined, sample_rate=sample_rate, fmt=wav_format)
     return PrependWavResult(wav=wav_out, payload=payload_result, sampleRate=sample_rate)
 
 
-def encodeWavSamples(*, samples: list[float], sample_rate: int, fmt: WavFormat = "pcm16") -> bytes:
+def encodeWavSamples(*, samples: Samples, sample_rate: int, fmt: WavFormat = "pcm16") -> bytes:
+    return _wavBytes([samples], sample_rate, fmt)
+
+
+def _wavBytes(segments: Sequence[Sequence[float]], sample_rate: int, fmt: WavFormat) -> bytes:
+    """A mono WAV file holding ``segments`` back to back."""
     num_channels = 1
     bits_per_sample = 32 if fmt == "float32" else 16
     bytes_per_sample = bits_per_sample // 8
     block_align = num_channels * bytes_per_sample
     byte_rate = sample_rate * block_align
-    data_size = len(samples) * bytes_per_sample
-    header_size = 44
-
-    buffer = bytearray(header_size + data_size)
-    buffer[0:4] = b"RIFF"
-    struct.pack_into("<I", buffer, 4, 36 + data_size)
-    buffer[8:12] = b"WAVE"
-
-    buffer[12:16] = b"fmt "
-    struct.pack_into("<I", buffer, 16, 16)
-    struct.pack_into("<H", buffer, 20, 3 if fmt == "float32" else 1)
-    struct.pack_into("<H", buffer, 22, num_channels)
-    struct.pack_into("<I", buffer, 24, sample_rate)
-    struct.pack_into("<I", buffer, 28, byte_rate)
-    struct.pack_into("<H", buffer, 32, block_align)
-    struct.pack_into("<H", buffer, 34, bits_per_sample)
-
-    buffer[36:40] = b"data"
-    struct.pack_into("<I", buffer, 40, data_size)
-
-    offset = header_size
-    if fmt == "float32":
-        for sample in samples:
-            struct.pack_into("<f", buffer, offset, clamp(sample))
-            offset += 4
-    else:
-        for sample in samples:
-            value = int(round(clamp(sample) * 32767))
-            struct.pack_into("<h", buffer, offset, value)
-            offset += 2
-
-    return bytes(buffer)
-
-
-def decodeWavSamples(*, wav_bytes: bytes) -> WavData:
-    if len(wav_bytes) < 12:
-        raise ValueError("Invalid WAV header")
-    if wav_bytes[0:4] != b"RIFF" or wav_bytes[8:12] != b"WAVE":
-        raise ValueError("Invalid WAV header")
-
-    offset = 12
-    fmt_tag = None
-    channels = 0
-    sample_rate = 0
-    bits_per_sample = 0
-    data_offset = 0
-    data_size = 0
-
-    while offset + 8 <= len(wav_bytes):
-        chunk_id = wav_bytes[offset : offset + 4]
-        chunk_size = struct.unpack_from("<I", wav_bytes, offset + 4)[0]
-        chunk_data_offset = offset + 8
-
-        if chunk_id == b"fmt ":
-            fmt_tag = struct.unpack_from("<H", wav_bytes, chunk_data_offset)[0]
-            channels = struct.unpack_from("<H", wav_bytes, chunk_data_offset + 2)[0]
-            sample_rate = struct.unpack_from("<I", wav_bytes, chunk_data_offset + 4)[0]
-            bits_per_sample = struct.unpack_from("<H", wav_bytes, chunk_data_offset + 14)[0]
-        elif chunk_id == b"data":
-            data_offset = chunk_data_offset
-            data_size = chunk_size
-
-        offset = chunk_data_offset + chunk_size + (chunk_size % 2)
-
-    if fmt_tag is None or data_offset == 0:
-        raise ValueError("WAV missing fmt or data chunk")
-    if channels < 1:
-        raise ValueError("Invalid WAV channel count")
+    data_size = sum(len(segment) for segment in segments) * bytes_per_sample
+
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        3 if fmt == "float32" else 1,
+        num_channels,
+        sample_rate,
+        byte_rate,
+        block_align,
+        bits_per_sample,
+        b"data",
+        data_size,
+    )
+    return b"".join([header, *(_packSamples(segment, fmt) for segment in segments)])
 
-    bytes_per_sample = bits_per_sample // 8
-    total_frames = data_size // (bytes_per_sample * channels)
-    samples: list[float] = []
-
-    if fmt_tag == 1 and bits_per_sample == 16:
-        frame_offset = data_offset
-        for _ in range(total_frames):
-            total = 0.0
-            for _ in range(channels):
-                value = struct.unpack_from("<h", wav_bytes, frame_offset)[0]
-                total += value / 32768.0
-                frame_offset += 2
-            samples.append(total / channels)
-        fmt = "pcm16"
-    elif fmt_tag == 3 and bits_per_sample == 32:
-        frame_offset = data_offset
-        for _ in range(total_frames):
-            total = 0.0
-            for _ in range(channels):
-                value = struct.unpack_from("<f", wav_bytes, frame_offset)[0]
-                total += value
-                frame_offset += 4
-            samples.append(total / channels)
-        fmt = "float32"
-    else:
-        raise ValueError(f"Unsupported WAV format {fmt_tag} with {bits_per_sample} bits")
 
-    return WavData(sampleRate=sample_rate, channels=channels, format=fmt, samples=samples)
+def _packSamples(samples: Sequence[float], fmt: WavFormat) -> bytes:
+    """Clamp to [-1, 1] and convert to little-endian PCM16 or float32 in bulk."""
+    if not len(samples):
+        return b""
+    if np is not None:
+        clipped = np.clip(np.asarray(samples, dtype=np.float64), -1.0, 1.0)
+        if fmt == "float32":
+            return clipped.astype("<f4").tobytes()
+        # np.rint rounds half to even, like round().
+        return np.rint(clipped * 32767).astype("<i2").tobytes()
+
+    if fmt == "float32":
+        packed = array("f", map(clamp, samples))
+    else:
+        packed = array("h", [round(clamp(sample) * 32767) for sample in samples])
+    if sys.byteorder != "little":  # pragma: no cover - WAV data is little-endian
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def decodeWavSamples(*, wav_bytes: bytes, samples_format: SamplesFormat = "list") -> WavData:
+    """Mix a PCM16 or float32 WAV down to mono samples in a ``samples_format`` container.
+
+    The data chunk is converted in bulk, with the same arithmetic as ``WavReader``.
+    """
+    layout = parseWavLayout(wav_bytes)
+    fmt = layout.format
+    frame_count = layout.availableFrames(len(wav_bytes))
+    frames = frameBuffer(wav_bytes, layout, frame_count)
+    try:
+        mono = mixdown(frames, layout.channels, 32768.0 if fmt == "pcm16" else None, 0, frame_count)
+    finally:
+        if isinstance(frames, memoryview):
+            frames.release()
+    samples = joinSamples([mono], samples_format)
+    return WavData(sampleRate=layout.sampleRate, channels=layout.channels, format=fmt, samples=samples)
 
 
 def secondsToSamples(sample_rate: int, seconds: float) -> int:
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Literal, Optional, Union, overload
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+# Frames mixed down per block by ``WavReader.blocks``.
+DEFAULT_BLOCK_FRAMES = 1 << 16
+
+
+@dataclass
+class WavLayout:
+    formatTag: int
+    channels: int
+    sampleRate: int
+    bitsPerSample: int
+    dataOffset: int
+    dataSize: int
+
+    @property
+    def format(self) -> Literal["pcm16", "float32"]:
+        if self.formatTag == 1 and self.bitsPerSample == 16:
+            return "pcm16"
+        if self.formatTag == 3 and self.bitsPerSample == 32:
+            return "float32"
+        raise ValueError(f"Unsupported WAV format {self.formatTag} with {self.bitsPerSample} bits")
+
+    @property
+    def frameCount(self) -> int:
+        return self.dataSize // ((self.bitsPerSample // 8) * self.channels)
+
+    def availableFrames(self, buffer_size: int) -> int:
+        """Whole frames actually present in a buffer of ``buffer_size`` bytes, for truncated files."""
+        available = max(0, min(self.dataSize, buffer_size - self.dataOffset))
+        return available // ((self.bitsPerSample // 8) * self.channels)
+
+
+def parseWavLayout(buffer: Union[bytes, mmap.mmap]) -> WavLayout:
+    """Walk the RIFF chunk table and return where the sample data lives."""
+    if len(buffer) < 12:
+        raise ValueError("Invalid WAV header")
+    if buffer[0:4] != b"RIFF" or buffer[8:12] != b"WAVE":
+        raise ValueError("Invalid WAV header")
+
+    offset = 12
+    fmt_tag = None
+    channels = 0
+    sample_rate = 0
+    bits_per_sample = 0
+    data_offset = 0
+    data_size = 0
+
+    while offset + 8 <= len(buffer):
+        chunk_id = buffer[offset : offset + 4]
+        chunk_size = struct.unpack_from("<I", buffer, offset + 4)[0]
+        chunk_data_offset = offset + 8
+
+        if chunk_id == b"fmt ":
+            fmt_tag = struct.unpack_from("<H", buffer, chunk_data_offset)[0]
+            channels = struct.unpack_from("<H", buffer, chunk_data_offset + 2)[0]
+            sample_rate = struct.unpack_from("<I", buffer, chunk_data_offset + 4)[0]
+            bits_per_sample = struct.unpack_from("<H", buffer, chunk_data_offset + 14)[0]
+        elif chunk_id == b"data":
+            data_offset = chunk_data_offset
+            data_size = chunk_size
+
+        offset = chunk_data_offset + chunk_size + (chunk_size % 2)
+
+    if fmt_tag is None or data_offset == 0:
+        raise ValueError("WAV missing fmt or data chunk")
+    if channels < 1:
+        raise ValueError("Invalid WAV channel count")
+
+    return WavLayout(
+        formatTag=fmt_tag,
+        channels=channels,
+        sampleRate=sample_rate,
+        bitsPerSample=bits_per_sample,
+        dataOffset=data_offset,
+        dataSize=data_size,
+    )
+
+
+def frameBuffer(buffer: Union[bytes, mmap.mmap], layout: WavLayout, frame_count: int):
+    """The data chunk as typed frames, without copying it.
+
+    A ``(frames, channels)`` NumPy array when NumPy is installed, otherwise a
+    flat ``memoryview`` of interleaved 'h' or 'f' values.
+    """
+    pcm16 = layout.format == "pcm16"
+    if np is not None:
+        return np.frombuffer(
+            buffer, dtype="<i2" if pcm16 else "<f4", count=frame_count * layout.channels, offset=layout.dataOffset
+        ).reshape(frame_count, layout.channels)
+    data_end = layout.dataOffset + frame_count * (layout.bitsPerSample // 8) * layout.channels
+    return memoryview(buffer)[layout.dataOffset : data_end].cast("h" if pcm16 else "f")
+
+
+def mixdown(frames, channels: int, scale: Optional[float], start: int, end: int):
+    """Mono float samples for frames ``start .. end - 1`` of a ``frameBuffer``.
+
+    PCM values are divided by ``scale`` before the channels are averaged,
+    the same arithmetic for NumPy ``float64`` and ``list[float]`` results.
+    """
+    if not isinstance(frames, memoryview):
+        block = frames[start:end]
+        total = block[:, 0].astype(np.float64)
+        if scale is not None:
+            total /= scale
+        for channel in range(1, channels):
+            values = block[:, channel].astype(np.float64)
+            if scale is not None:
+                values /= scale
+            total += values
+        if channels > 1:
+            total /= channels
+        return total
+
+    view = frames
+    if sys.byteorder != "little":  # pragma: no cover - WAV data is little-endian
+        swapped = array(view.format, view[start * channels : end * channels])
+        swapped.byteswap()
+        view = memoryview(swapped)
+        start, end = 0, end - start
+    first = view[start * channels : end * channels : channels]
+    total = [value / scale for value in first] if scale is not None else [float(value) for value in first]
+    for channel in range(1, channels):
+        values = view[start * channels + channel : end * channels : channels]
+        if scale is not None:
+            total = [acc + value / scale for acc, value in zip(total, values)]
+        else:
+            total = [acc + value for acc, value in zip(total, values)]
+    if channels > 1:
+        total = [acc / channels for acc in total]
+    return total
+
+
+class WavReader:
+    """A WAV file mapped into memory and read as mono float samples.
+
+    Only the chunk table is parsed up front. The data chunk stays in the
+    page cache as a typed buffer, and channel mixdown and int-to-float scaling
+    happen for just the frames that are sliced, with the same arithmetic as
+    ``decodeWavSamples``. Slices are NumPy ``float64`` arrays when NumPy is
+    installed and ``list[float]`` otherwise, so the reader can be passed as
+    ``samples`` to ``scan``/``decode``.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = str(path)
+        with open(self.path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            layout = parseWavLayout(self._mmap)
+            self.format = layout.format
+        except Exception:
+            self._mmap.close()
+            raise
+        self.sampleRate = layout.sampleRate
+        self.channels = layout.channels
+        self.frameCount = layout.availableFrames(len(self._mmap))
+
+        self._scale = 32768.0 if self.format == "pcm16" else None
+        self._frames = frameBuffer(self._mmap, layout, self.frameCount)
+
+    def __len__(self) -> int:
+        return self.frameCount
+
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+
+    @overload
+    def __getitem__(self, index: slice): ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.frameCount)
+            if step != 1:
+                raise ValueError("WavReader slices must be contiguous")
+            return self.read(start, max(start, stop))
+        if index < 0:
+            index += self.frameCount
+        if not 0 <= index < self.frameCount:
+            raise IndexError("WAV sample index out of range")
+        return float(self.read(index, index + 1)[0])
+
+    def read(self, start: int, end: int):
+        """Mixed-down samples for frames ``start .. end - 1``."""
+        return mixdown(self._frames, self.channels, self._scale, start, end)
+
+    def blocks(self, block_frames: int = DEFAULT_BLOCK_FRAMES) -> Iterator[tuple[int, object]]:
+        """Yield ``(start_frame, samples)`` for consecutive blocks of the file."""
+        for start in range(0, self.frameCount, block_frames):
+            yield start, self.read(start, min(self.frameCount, start + block_frames))
+
+    def close(self) -> None:
+        if self._mmap.closed:
+            return
+        if isinstance(self._frames, memoryview):
+            self._frames.release()
+        self._frames = None
+        self._mmap.close()
+
+    def __enter__(self) -> WavReader:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def openWav(path: Union[str, Path]) -> WavReader:
+    return WavReader(path)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Callable, Optional, Sequence, Union
+
+from .codec.afskModem import sliceTones
+from .codec.defaults import DEFAULT_SAMPLE_RATE
+from .codec.frame import frameLength, maxFrameBits
+from .codec.goertzel import strongestTone, symbolRatio
+from .codec.hdlcFraming import BitFrame, HdlcDeframer
+from .codec.mfskModem import symbolsToBits
+from .codec.nrziCodec import nrziDecode
+from .codec.profile import ProfileSettings, getProfileSettings
+from .codec.toneCorrelator import ToneCorrelator
+from .decode import FrameCache, ProfileGroup, _profileGroups
+from .profiles import PROFILE_NAMES, Profile, normalizeProfile
+from .types import ScanResult
+
+
+class StreamScanner:
+    """Scan live audio pushed in chunks of any size.
+
+    Each tone set is demodulated at the same sub-symbol offsets as ``scan``,
+    but every offset keeps its own window position, NRZI level and HDLC
+    deframer between pushes, so a push only demodulates the samples that
+    arrived since the last one plus the partial symbol left over from it.
+    Samples live in a fixed-capacity ring buffer and are demodulated once at
+    least ``scan_interval_ms`` of new audio has accumulated. Detections carry
+    absolute sample positions counted from the first sample pushed.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: Optional[int] = None,
+        profile: Optional[Union[Profile, str]] = None,
+        min_confidence: float = 0.8,
+        gzip_decompress: Optional[Callable[[bytes], bytes]] = None,
+        buffer_ms: float = 1000.0,
+        scan_interval_ms: float = 20.0,
+        frame_cache: Optional[FrameCache] = None,
+    ) -> None:
+        self.sampleRate = sample_rate or DEFAULT_SAMPLE_RATE
+        if profile is not None:
+            self.profiles: list[Profile] = [normalizeProfile(profile)]
+        else:
+            self.profiles = list(PROFILE_NAMES)
+        self.minConfidence = min_confidence
+        self.gzipDecompress = gzip_decompress
+        # Every lane that catches a frame cleanly delivers the same bytes.
+        self.frameCache = frame_cache if frame_cache is not None else FrameCache()
+
+        # Profiles sharing tones and baud demodulate identically, so they share a plan.
+        self._plans = [_ProfilePlan(group, self.sampleRate) for group in _profileGroups(self.profiles)]
+        self._guard = max(math.ceil(plan.samplesPerSymbol) + 1 for plan in self._plans)
+        self._interval = max(1, round((scan_interval_ms / 1000.0) * self.sampleRate))
+        capacity = max(2 * self._guard + self._interval, round((buffer_ms / 1000.0) * self.sampleRate))
+        self._ring = _SampleRing(capacity)
+        self.reset()
+
+    @property
+    def samplesReceived(self) -> int:
+        return self._ring.end
+
+    def reset(self) -> None:
+        self._ring.clear()
+        self._unprocessed = 0
+        for plan in self._plans:
+            plan.reset()
+
+    def push(self, chunk: Sequence[float]) -> list[ScanResult]:
+        results: list[ScanResult] = []
+        pos = 0
+        while pos < len(chunk):
+            room = self._ring.capacity - self._guard - self._unprocessed
+            piece = chunk[pos : pos + room]
+            self._ring.write(piece)
+            self._unprocessed += len(piece)
+            pos += len(piece)
+            if self._unprocessed >= self._interval:
+                results.extend(self._process())
+        results.sort(key=lambda r: r.startSample)
+        return results
+
+    def flush(self) -> list[ScanResult]:
+        """Demodulate samples still held back by ``scan_interval_ms``."""
+        if self._unprocessed == 0:
+            return []
+        results = self._process()
+        results.sort(key=lambda r: r.startSample)
+        return results
+
+    def _process(self) -> list[ScanResult]:
+        self._unprocessed = 0
+        end = self._ring.end
+        segment_start = min(plan.pendingStart() for plan in self._plans)
+        segment_start = max(segment_start, end - self._ring.capacity)
+        segment = self._ring.read(segment_start, end)
+
+        results: list[ScanResult] = []
+        for plan in self._plans:
+            correlator = ToneCorrelator(segment, self.sampleRate, plan.freqs)
+            for lane in plan.lanes:
+                windows = lane.advance(end)
+                if not windows:
+                    continue
+                relative = [(start - segment_start, length) for start, length in windows]
+                energies = correlator.energies(relative, plan.freqs)
+                for frame in lane.deframer.push(plan.toBits(lane, energies)):
+                    result = self._decode(plan, lane, frame)
+                    if result is not None:
+                        results.append(result)
+        return results
+
+    def _decode(self, plan: _ProfilePlan, lane: _Lane, frame: BitFrame) -> Optional[ScanResult]:
+        parsed = self.frameCache.decode(frame.bytes, self.gzipDecompress)
+        if not parsed or parsed.profile not in plan.profiles:
+            return None
+        start_sample = round(lane.offset + frame.startBit * plan.samplesPerBit)
+        end_sample = round(lane.offset + frame.endBit * plan.samplesPerBit)
+        confidence = 1.0
+        if confidence < self.minConfidence:
+            return None
+        if start_sample <= plan.lastEndSample:
+            return None
+        plan.lastEndSample = end_sample
+        return ScanResult(
+            json=parsed.json,
+            profile=parsed.profile,
+            startSample=start_sample,
+            endSample=end_sample,
+            confidence=confidence,
+        )
+
+
+class _Lane:
+    def __init__(self, offset: int, samples_per_symbol: float, max_frame_bits: int) -> None:
+        self.offset = offset
+        ratio = symbolRatio(samples_per_symbol)
+        self._numerator = ratio.numerator
+        self._denominator = ratio.denominator
+        self.deframer = HdlcDeframer(max_frame_bits, frameLength)
+        self.reset()
+
+    def reset(self) -> None:
+        self.start = self.offset
+        self.symbol = 1
+        self.prevTone: Optional[int] = None
+        self.deframer.reset()
+
+    def advance(self, available: int) -> list[tuple[int, int]]:
+        windows: list[tuple[int, int]] = []
+        limit = (available - self.offset) * self._denominator
+        while self.symbol * self._numerator <= limit:
+            end = self.offset + (self.symbol * self._numerator) // self._denominator
+            length = end - self.start
+            if length > 1:
+                windows.append((self.start, length))
+            self.start = end
+            self.symbol += 1
+        return windows
+
+
+class _ProfilePlan:
+    def __init__(self, profiles: ProfileGroup, sample_rate: int) -> None:
+        settings: ProfileSettings = getProfileSettings(profiles[0])
+        self.profiles = profiles
+        self.modulation = settings.modulation
+        self.bitsPerSymbol = settings.bitsPerSymbol or 1
+        self.samplesPerBit = sample_rate / settings.baud
+        self.samplesPerSymbol = self.samplesPerBit * self.bitsPerSymbol
+        tones = settings.tones or [settings.markFreq, settings.spaceFreq]
+        self.freqs = tones[: 1 << self.bitsPerSymbol] if self.modulation == "mfsk" else tones[:2]
+
+        offset_step = max(1, round(self.samplesPerSymbol / 8))
+        frame_bits = maxFrameBits()
+        self.lanes: list[_Lane] = []
+        offset = 0
+        while offset < self.samplesPerSymbol:
+            self.lanes.append(_Lane(int(offset), self.samplesPerSymbol, frame_bits))
+            offset += offset_step
+        self.lastEndSample = -1
+
+    def reset(self) -> None:
+        for lane in self.lanes:
+            lane.reset()
+        self.lastEndSample = -1
+
+    def pendingStart(self) -> int:
+        return min(lane.start for lane in self.lanes)
+
+    def toBits(self, lane: _Lane, energies: list[list[float]]) -> bytes:
+        if self.modulation == "mfsk":
+            return symbolsToBits(strongestTone(energies), self.bitsPerSymbol)
+
+        tones = sliceTones(*energies)
+        data_bits = nrziDecode(tones, lane.prevTone)
+        lane.prevTone = tones[-1]
+        return data_bits
+
+
+class _SampleRing:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * capacity))
+        self.end = 0
+
+    def clear(self) -> None:
+        self.end = 0
+
+    def write(self, chunk: Sequence[float]) -> None:
+        count = len(chunk)
+        if count > self.capacity:
+            raise ValueError("Chunk larger than ring buffer capacity")
+        index = self.end % self.capacity
+        first = min(count, self.capacity - index)
+        self._data[index : index + first] = array("d", chunk[:first])
+        if first < count:
+            self._data[0 : count - first] = array("d", chunk[first:])
+        self.end += count
+
+    def read(self, start: int, end: int) -> array:
+        if start < self.end - self.capacity or end > self.end:
+            raise ValueError("Requested samples are no longer buffered")
+        first = start % self.capacity
+        last = first + (end - start)
+        if last <= self.capacity:
+            return self._data[first:last]
+        return self._data[first:] + self._data[: last - self.capacity]
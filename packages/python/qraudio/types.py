@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Literal
+from typing import Any, Literal, Optional, Sequence
 
 from .profiles import Profile
 
+# Mono audio: a list, a float ``array`` ('f' or 'd'), a float ``memoryview`` or
+# a NumPy array. Inputs are indexed and sliced in place, never copied to a list.
+Samples = Sequence[float]
+# Container for returned samples: list[float], array('f') or a float32 NumPy array.
+SamplesFormat = Literal["list", "array", "numpy"]
+
 
 @dataclass
 class EncodeResult:
     sampleRate: int
     profile: Profile
-    samples: list[float]
+    samples: Samples
     durationMs: float
     payloadBytes: int
 
@@ -27,12 +33,20 @@ class DecodeResult:
 ScanResult = DecodeResult
 
 
+@dataclass
+class ProbeRegion:
+    profile: Profile
+    startSample: int
+    endSample: int
+    score: float
+
+
 @dataclass
 class WavData:
     sampleRate: int
     channels: int
     format: Literal["pcm16", "float32"]
-    samples: list[float]
+    samples: Samples
 
 
 @dataclass
@@ -40,6 +54,25 @@ class EncodeWavResult(EncodeResult):
     wav: bytes
 
 
+@dataclass
+class BatchEncodeResult:
+    index: int
+    profile: Profile
+    sampleRate: int
+    durationMs: float
+    payloadBytes: int
+    wavBytes: int
+    path: Optional[str] = None
+    wav: bytes = b""
+
+
+@dataclass
+class BatchScanResult:
+    path: str
+    results: list[ScanResult]
+    error: Optional[str] = None
+
+
 @dataclass
 class PrependWavResult:
     wav: bytes
@@ -66,3 +66,87 @@ def test_cli_roundtrip() -> None:
         assert found
 
         assert prepend_wav_path.read_bytes()
+
+
+def test_cli_batch_encode() -> None:
+    with TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        payloads = [{"batch": index, "tags": ["a"] * index} for index in range(20)]
+        batch_path = tmp_path / "payloads.jsonl"
+        batch_path.write_text("\n".join(json.dumps(payload) for payload in payloads) + "\n")
+
+        out_dir = tmp_path / "out"
+        result = run_cli(
+            ["encode", "--batch", str(batch_path), "--out-dir", str(out_dir), "--workers", "2", "--profile", "mfsk"]
+        )
+        assert result.returncode == 0, result.stderr
+
+        manifest = [json.loads(line) for line in (out_dir / "manifest.jsonl").read_text().splitlines()]
+        assert sorted(entry["index"] for entry in manifest) == list(range(len(payloads)))
+        for entry in manifest:
+            wav_path = out_dir / entry["path"]
+            assert wav_path.stat().st_size == entry["wavBytes"]
+            assert entry["profile"] == "mfsk" and entry["durationMs"] > 0
+
+        decoded = run_cli(["decode", "--in", str(out_dir / "000007.wav")])
+        assert json.loads(decoded.stdout) == payloads[7]
+
+
+def test_cli_batch_scan_resumes() -> None:
+    with TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        in_dir = tmp_path / "aired"
+        (in_dir / "day2").mkdir(parents=True)
+        names = ["a.wav", "b.wav", "day2/c.wav"]
+        for index, name in enumerate(names):
+            payload_path = tmp_path / f"payload{index}.json"
+            payload_path.write_text(json.dumps({"spot": index}))
+            result = run_cli(["encode", "--file", str(payload_path), "--out", str(in_dir / name), "--profile", "mfsk"])
+            assert result.returncode == 0
+        (in_dir / "broken.wav").write_bytes(b"not a wav")
+
+        out_path = tmp_path / "scan.jsonl"
+        result = run_cli(["scan", "--in-dir", str(in_dir), "--workers", "2", "--profile", "mfsk", "--out", str(out_path)])
+        assert result.returncode == 0, result.stderr
+        records = [json.loads(line) for line in out_path.read_text().splitlines()]
+        detections = {Path(r["file"]).name: r["payload"] for r in records if "payload" in r}
+        assert detections == {"a.wav": {"spot": 0}, "b.wav": {"spot": 1}, "c.wav": {"spot": 2}}
+        statuses = {Path(r["file"]).name: r["status"] for r in records if "status" in r}
+        assert statuses == {"a.wav": "done", "b.wav": "done", "c.wav": "done", "broken.wav": "error"}
+
+        # Drop the last file's records and leave a half-written line, as after a crash.
+        lines = out_path.read_text().splitlines(keepends=True)
+        last_done = max(i for i, line in enumerate(lines) if '"status": "done"' in line)
+        interrupted = Path(json.loads(lines[last_done])["file"]).name
+        kept = [line for line in lines if interrupted not in line or "payload" in line]
+        partial = "".join(kept) + '{"file": "' + interrupted
+        out_path.write_text(partial)
+
+        result = run_cli(["scan", "--in-dir", str(in_dir), "--profile", "mfsk", "--out", str(out_path), "--resume"])
+        assert result.returncode == 0, result.stderr
+        text = out_path.read_text()
+        assert text.startswith(partial + "\n")
+        resumed = []
+        for line in text.splitlines():
+            try:
+                resumed.append(json.loads(line))
+            except ValueError:
+                continue
+        assert resumed[len(kept)] == {"status": "interrupted"}
+        rescanned = [Path(r["file"]).name for r in resumed[len(kept) + 1 :] if "status" in r]
+        assert sorted(rescanned) == sorted({interrupted, "broken.wav"})
+
+        # A detection counts when the next status record is its file's done record.
+        counted: list[str] = []
+        block: list[dict] = []
+        for record in resumed:
+            if "status" not in record:
+                block.append(record)
+                continue
+            if record["status"] == "done":
+                counted.extend(Path(r["file"]).name for r in block if r["file"] == record["file"])
+            block = []
+        counts = [r["detections"] for r in resumed if r.get("status") == "done"]
+        assert len(counts) == 3
+        assert set(counted) == {"a.wav", "b.wav", "c.wav"}
+        assert len(counted) == sum(counts)
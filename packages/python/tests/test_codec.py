@@ -1,9 +1,10 @@
+import math
 import random
 
 import pytest
 
-from qraudio.codec.crc16x25 import crc16X25
-from qraudio.codec.reedSolomonCodec import rsDecode, rsEncode
+from qraudio.codec.crc16x25 import Crc16X25, crc16X25
+from qraudio.codec.reedSolomonCodec import rsDecode, rsDecodeBlocks, rsEncode, rsStripParity
 
 
 def text_bytes(text: str) -> bytes:
@@ -15,6 +16,18 @@ def test_crc16_x25_check_value() -> None:
     assert crc16X25(data) == 0x906E
 
 
+def test_crc16_x25_incremental_matches_one_shot() -> None:
+    rng = random.Random(4)
+    data = bytes(rng.randrange(256) for _ in range(300))
+    crc = Crc16X25()
+    for start in range(0, len(data), 7):
+        crc.update(data[start : start + 7])
+    assert crc.value == crc16X25(data)
+    assert crc.digest() == bytes([crc.value & 0xFF, crc.value >> 8])
+    assert Crc16X25(text_bytes("123456789")).value == 0x906E
+    assert Crc16X25().value == crc16X25(b"")
+
+
 def test_reed_solomon_corrects_errors() -> None:
     payload = bytes([i & 0xFF for i in range(120)])
     encoded = rsEncode(payload)
@@ -53,3 +66,247 @@ def test_reed_solomon_fails_on_too_many_errors() -> None:
 
     with pytest.raises(Exception):
         rsDecode(bytes(corrupted), len(payload))
+
+
+def test_reed_solomon_reports_corrected_symbols() -> None:
+    rng = random.Random(3)
+    payload = bytes(rng.randrange(256) for _ in range(223 * 3 + 40))
+    encoded = rsEncode(payload)
+    corrupted = bytearray(encoded)
+    for block, count in enumerate([0, 16, 5, 1]):
+        for pos in rng.sample(range(255), count):
+            corrupted[block * 255 + pos] ^= rng.randrange(1, 256)
+
+    result = rsDecodeBlocks(bytes(corrupted), len(payload))
+    assert result.payload == payload
+    assert result.codewords == encoded
+    assert result.correctedSymbols == [0, 16, 5, 1]
+    assert rsStripParity(encoded)[: len(payload)] == payload
+
+
+def test_reed_solomon_blocks_match_pure_python(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("numpy")
+    from qraudio.codec import reedSolomonCodec as rs_module
+
+    rng = random.Random(6)
+    payload = bytes(rng.randrange(256) for _ in range(223 * 20 + 17))
+    encoded = rsEncode(payload)
+    corrupted = bytearray(encoded)
+    for block in range(0, len(corrupted), 255):
+        for _ in range(rng.randrange(0, 17)):
+            corrupted[block + rng.randrange(255)] ^= rng.randrange(1, 256)
+    decoded = rsDecode(bytes(corrupted), len(payload))
+
+    monkeypatch.setattr(rs_module, "np", None)
+    assert rsEncode(payload) == encoded
+    assert rsDecode(bytes(corrupted), len(payload)) == decoded == payload
+
+
+def test_goertzel_bank_matches_pure_python(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("numpy")
+    from qraudio.codec import goertzel as goertzel_module
+    from qraudio.codec.afskModem import demodAfsk
+    from qraudio.codec.mfskModem import demodMfsk
+
+    rng = random.Random(1)
+    samples = [rng.uniform(-1.0, 1.0) for _ in range(44100 // 4)]
+
+    def demod_all() -> list[list[int]]:
+        out = []
+        for offset in (0, 5, 11):
+            out.append(
+                demodAfsk(
+                    samples=samples,
+                    sample_rate=44100,
+                    baud=1200,
+                    offset=offset,
+                    mark_freq=1200,
+                    space_freq=2200,
+                )
+            )
+            out.append(
+                demodMfsk(
+                    samples=samples,
+                    sample_rate=44100,
+                    baud=600,
+                    offset=offset,
+                    tones=[600, 900, 1200, 1500],
+                    bits_per_symbol=2,
+                )
+            )
+        return out
+
+    vectorized = demod_all()
+    monkeypatch.setattr(goertzel_module, "np", None)
+    assert demod_all() == vectorized
+
+
+def test_tone_correlator_matches_goertzel() -> None:
+    from qraudio.codec.goertzel import goertzel, symbolWindows
+    from qraudio.codec.toneCorrelator import ToneCorrelator
+
+    rng = random.Random(2)
+    samples = [rng.uniform(-1.0, 1.0) for _ in range(4800)]
+    freqs = [1200.0, 2200.0]
+    correlator = ToneCorrelator(samples, 48000, freqs)
+    windows = symbolWindows(sample_count=len(samples), samples_per_symbol=40.0, offset=15)
+    energies = correlator.energies(windows, freqs)
+
+    for idx, freq in enumerate(freqs):
+        for (start, length), energy in zip(windows, energies[idx]):
+            expected = goertzel(samples=samples, start=start, length=length, freq=freq, sample_rate=48000)
+            assert energy == pytest.approx(expected, rel=1e-9, abs=1e-9)
+
+
+def test_hdlc_deframer_matches_extract_frames() -> None:
+    from qraudio.codec.hdlcFraming import HdlcDeframer, buildBitstream, extractFrames
+
+    rng = random.Random(3)
+    bits: list[int] = [rng.randrange(2) for _ in range(300)]
+    for size in (12, 40, 90):
+        bits.extend(buildBitstream(bytes(rng.randrange(256) for _ in range(size)), 50, 1200))
+        bits.extend(rng.randrange(2) for _ in range(77))
+
+    deframer = HdlcDeframer()
+    streamed = []
+    pos = 0
+    while pos < len(bits):
+        step = rng.randrange(1, 64)
+        streamed.extend(deframer.push(bits[pos : pos + step]))
+        pos += step
+
+    assert streamed == extractFrames(bits)
+    assert len(streamed) >= 3
+
+
+def test_packed_bitstream_matches_int_lists() -> None:
+    from qraudio.codec.hdlcFraming import _bit_destuff, _bit_stuff, buildBitstream, extractFrames
+    from qraudio.codec.nrziCodec import nrziDecode, nrziEncode
+
+    rng = random.Random(4)
+    bits: list[int] = [rng.randrange(2) for _ in range(200)]
+    payloads = [bytes(rng.randrange(256) for _ in range(size)) for size in (10, 64)]
+    for payload in payloads:
+        bits.extend(buildBitstream(payload, 50, 1200))
+        bits.extend([1] * 7 + [0])
+    tones = nrziEncode(bits)
+
+    packed = nrziDecode(bytes(tones))
+    assert packed == nrziDecode(tones)
+    assert packed[1:] == bytes(bits[1:])
+    assert nrziDecode(tones[100:], tones[99]) == packed[100:]
+    assert [frame.bytes for frame in extractFrames(packed)] == payloads
+    assert extractFrames(packed) == extractFrames(list(packed))
+
+    data = [rng.randrange(2) for _ in range(500)] + [1] * 12
+    assert _bit_destuff(bytes(_bit_stuff(data))) == bytes(data)
+
+
+def test_extract_frames_checks_header_before_body() -> None:
+    from qraudio.codec.constants import FLAG_FEC
+    from qraudio.codec.frame import buildFrame, frameLength, parseFrame
+    from qraudio.codec.hdlcFraming import buildBitstream, extractFrames
+
+    payload = b'{"ok":true}'
+    plain = buildFrame(payload, len(payload), 0)
+    protected = buildFrame(rsEncode(payload), len(payload), FLAG_FEC)
+    assert frameLength(plain) == len(plain)
+    assert frameLength(protected) == len(protected) == 8 + 255 + 2
+    assert frameLength(b"QRA2" + plain[4:]) is None
+
+    truncated = plain[:-1]
+    garbage = bytes(range(40))
+    bits = []
+    for frame in (plain, truncated, garbage, protected):
+        bits.extend(buildBitstream(frame, 10, 1200))
+
+    assert [frame.bytes for frame in extractFrames(bits)] == [plain, truncated, garbage, protected]
+    assert [frame.bytes for frame in extractFrames(bits, frameLength)] == [plain, protected]
+    assert parseFrame(truncated) is None
+
+
+def test_cached_preamble_splices_phase_continuously() -> None:
+    from qraudio.codec.afskModem import tonesToSamples
+    from qraudio.codec.gfskModem import gfskTonesToSamples
+    from qraudio.codec.hdlcFraming import buildBitstream, preambleBitCount
+    from qraudio.codec.mfskModem import mfskBitsToSamples
+    from qraudio.codec.nrziCodec import nrziEncode
+    from qraudio.codec.segmentCache import segmentCache
+
+    rng = random.Random(19)
+    prefix = preambleBitCount(40, 1200)
+    common = {"sample_rate": 44100, "baud": 1200, "level_db": -6, "fade_ms": 5}
+    for size in (3, 20):
+        bits = buildBitstream(bytes(rng.randrange(256) for _ in range(size)), 40, 1200)
+        tones = nrziEncode(bits)
+        modulators = [
+            lambda cached: tonesToSamples(
+                tones=tones, mark_freq=1200, space_freq=2200, cached_prefix=cached, **common
+            ),
+            lambda cached: gfskTonesToSamples(
+                tones=tones, mark_freq=880, space_freq=1320, bt=1.0, span_symbols=4, cached_prefix=cached, **common
+            ),
+            lambda cached: mfskBitsToSamples(
+                bits=bits, tones=[600, 900, 1200, 1500], bits_per_symbol=2, cached_prefix=cached, **common
+            ),
+        ]
+        for modulate in modulators:
+            segmentCache.clear()
+            reference = modulate(0)
+            assert modulate(prefix) == reference
+            assert len(segmentCache) > 0
+            assert modulate(prefix) == reference
+
+
+def test_gaussian_shape_matches_direct_filter() -> None:
+    from qraudio.codec.gfskModem import _bitStarts, gaussianFilter, gaussianShape
+
+    rng = random.Random(22)
+    tones = [rng.randrange(2) for _ in range(120)] + [1] * 9 + [0]
+    for samples_per_bit, bt, span in ((40.0, 1.0, 4), (36.75, 0.5, 3), (6.6667, 1.0, 4), (40.0, 0.0, 4)):
+        starts = _bitStarts(len(tones), samples_per_bit)
+        nrz: list[float] = []
+        for index, bit in enumerate(tones):
+            nrz.extend([1.0 if bit == 1 else -1.0] * (starts[index + 1] - starts[index]))
+        shaped = gaussianShape(tones, starts, samples_per_bit, bt, span)
+        expected = gaussianFilter(nrz, samples_per_bit, bt, span)
+        assert len(shaped) == len(expected)
+        assert max(abs(a - b) for a, b in zip(shaped, expected)) < 1e-12
+
+
+def test_long_gfsk_burst_matches_wrapped_phase_reference(monkeypatch: pytest.MonkeyPatch) -> None:
+    from qraudio.codec import gfskModem
+
+    rng = random.Random(22)
+    tones = [rng.randrange(2) for _ in range(15000)]
+    sample_rate, baud, amplitude = 48000, 1200, 10 ** (-6 / 20.0)
+    starts = gfskModem._bitStarts(len(tones), sample_rate / baud)
+    shaped = gfskModem.gaussianShape(tones, starts, sample_rate / baud, 1.0, 4)
+    # The modulator before step-response shaping: phase wrapped once per sample.
+    reference: list[float] = []
+    phase = 0.0
+    for value in shaped:
+        phase += (2 * math.pi * (1100 + -220 * value)) / sample_rate
+        if phase > math.pi * 2:
+            phase -= math.pi * 2
+        reference.append(math.sin(phase) * amplitude)
+
+    common = {"tones": tones, "sample_rate": sample_rate, "baud": baud, "mark_freq": 880, "space_freq": 1320}
+    for numpy_module in (gfskModem.np, None):
+        monkeypatch.setattr(gfskModem, "np", numpy_module)
+        samples = gfskModem.gfskTonesToSamples(level_db=-6, fade_ms=0, cached_prefix=400, **common)
+        assert len(samples) == len(reference) == 600000
+        assert max(abs(a - b) for a, b in zip(samples, reference)) < 1e-9
+
+
+def test_fm_discriminator_matches_pure_python(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("numpy")
+    from qraudio.codec import fmDiscriminator as fm_module
+
+    rng = random.Random(23)
+    samples = [rng.uniform(-1.0, 1.0) for _ in range(44100 // 4)]
+    windows = [(start, 37) for start in range(0, len(samples) - 37, 29)]
+    vectorized = fm_module.FmDiscriminator(samples, 44100, 880, 1320).deviations(windows)
+    monkeypatch.setattr(fm_module, "np", None)
+    pure = fm_module.FmDiscriminator(samples, 44100, 880, 1320).deviations(windows)
+    assert max(abs(a - b) for a, b in zip(vectorized, pure)) < 1e-9
@@ -40,3 +40,15 @@ def test_scan_with_moderate_noise() -> None:
     results = scan(samples=combined, sample_rate=encoded.sampleRate, profile=DEFAULT_PROFILE)
     assert len(results) > 0
     assert results[0].json == payload
+
+
+def test_discriminator_scans_noisy_gfsk() -> None:
+    payload = {"__type": "noise", "value": 2}
+    encoded = encode(payload=payload, profile="gfsk-fifth")
+    noisy = add_white_noise(encoded.samples, 9)
+
+    silence = [0.0] * round(encoded.sampleRate * 0.2)
+    combined = silence + noisy + silence
+
+    results = scan(samples=combined, sample_rate=encoded.sampleRate, profile="gfsk-fifth", engine="discriminator")
+    assert [result.json for result in results][:1] == [payload]
@@ -0,0 +1,63 @@
+import gzip
+import importlib
+import random
+
+import pytest
+
+from qraudio import decodeWav, encode, encodeMany, encodeWav, scan
+
+
+def test_parallel_scan_matches_serial() -> None:
+    rng = random.Random(11)
+    first = encode(payload={"__type": "parallel", "n": 1}, profile="afsk-bell")
+    second = encode(payload={"__type": "parallel", "n": 2}, profile="mfsk")
+    gap = [rng.gauss(0.0, 0.01) for _ in range(first.sampleRate // 2)]
+    combined = gap + first.samples + gap + second.samples + gap
+
+    serial = scan(samples=combined, sample_rate=first.sampleRate)
+    pooled = scan(samples=combined, sample_rate=first.sampleRate, workers=4)
+    assert {r.json["n"] for r in serial} == {1, 2}
+    assert pooled == serial
+
+    gated = scan(samples=combined, sample_rate=first.sampleRate, gate=True, workers=3)
+    assert gated == scan(samples=combined, sample_rate=first.sampleRate, gate=True)
+
+
+def test_parallel_scan_rejects_unpicklable_decompressor() -> None:
+    encoded = encode(payload={"__type": "parallel", "n": 3}, profile="afsk-bell")
+    with pytest.raises(ValueError, match="picklable"):
+        scan(samples=encoded.samples, sample_rate=encoded.sampleRate, workers=2, gzip_decompress=lambda b: gzip.decompress(b))
+    pooled = scan(samples=encoded.samples, sample_rate=encoded.sampleRate, workers=2, gzip_decompress=gzip.decompress)
+    assert pooled and pooled == scan(samples=encoded.samples, sample_rate=encoded.sampleRate)
+
+
+def test_chunked_scan_matches_single_buffer(monkeypatch) -> None:
+    decode_module = importlib.import_module("qraudio.decode")
+
+    # Real overlaps cover a 65535-byte frame (minutes of audio); shrink them so
+    # short payloads straddle several chunk boundaries.
+    monkeypatch.setattr(decode_module, "_chunkOverlap", lambda profile, sample_rate: 4 * sample_rate)
+    rng = random.Random(5)
+    combined: list[float] = []
+    for index, profile in enumerate(["afsk-bell", "mfsk", "afsk-fifth", "afsk-bell"]):
+        encoded = encode(payload={"i": index}, profile=profile)
+        combined += [rng.gauss(0.0, 0.01) for _ in range(rng.randrange(1000, 3 * encoded.sampleRate))]
+        combined += encoded.samples
+
+    whole = scan(samples=combined)
+    assert {r.json["i"] for r in whole} == {0, 1, 2, 3}
+    for chunk_seconds in (2, 3):
+        assert scan(samples=combined, chunk_seconds=chunk_seconds) == whole
+
+
+def test_encode_many_matches_encode_wav() -> None:
+    payloads = [{"__type": "batch", "n": index} for index in range(40)]
+    serial = list(encodeMany(iter(payloads), profile="afsk-fifth", gzip=False))
+    pooled = sorted(encodeMany(iter(payloads), profile="afsk-fifth", gzip=False, workers=3), key=lambda r: r.index)
+
+    assert [result.index for result in serial] == list(range(len(payloads)))
+    for result, other, payload in zip(serial, pooled, payloads):
+        expected = encodeWav(payload=payload, profile="afsk-fifth", gzip=False)
+        assert result.wav == other.wav == expected.wav
+        assert result.wavBytes == len(expected.wav) and result.durationMs == expected.durationMs
+    assert decodeWav(wav_bytes=pooled[12].wav).json == payloads[12]
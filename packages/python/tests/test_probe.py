@@ -0,0 +1,68 @@
+import random
+
+from qraudio import DEFAULT_PROFILE, encode, locateBursts, probe, scan
+
+
+def test_probe_finds_payload_region() -> None:
+    payload = {"__type": "probe", "value": 3}
+    encoded = encode(payload=payload, profile=DEFAULT_PROFILE)
+    rng = random.Random(7)
+    lead = [rng.gauss(0.0, 0.05) for _ in range(encoded.sampleRate * 2)]
+    tail = [0.0] * encoded.sampleRate
+    combined = lead + encoded.samples + tail
+
+    regions = probe(samples=combined, sample_rate=encoded.sampleRate, profile=DEFAULT_PROFILE)
+    assert len(regions) == 1
+    assert regions[0].startSample <= len(lead)
+    assert regions[0].endSample >= len(lead) + len(encoded.samples) - encoded.sampleRate // 20
+
+    gated = scan(samples=combined, sample_rate=encoded.sampleRate, profile=DEFAULT_PROFILE, gate=True)
+    full = scan(samples=combined, sample_rate=encoded.sampleRate, profile=DEFAULT_PROFILE)
+    assert len(full) > 0
+    assert [r.json for r in gated] == [r.json for r in full]
+    assert all(r.json == payload for r in gated)
+    assert [r.startSample for r in gated] == [r.startSample for r in full]
+
+
+def test_probe_ignores_silence_and_noise() -> None:
+    rng = random.Random(8)
+    samples = [0.0] * 48000 + [rng.uniform(-0.3, 0.3) for _ in range(48000)]
+    assert probe(samples=samples, sample_rate=48000) == []
+
+
+def test_locate_bursts_identifies_profiles() -> None:
+    samples: list[float] = []
+    starts = []
+    for profile in ("mfsk", "afsk-bell"):
+        samples.extend([0.0] * 12000)
+        starts.append(len(samples))
+        samples.extend(encode(payload={"profile": profile}, profile=profile).samples)
+    samples.extend([0.0] * 12000)
+
+    regions = locateBursts(samples=samples, sample_rate=48000)
+    assert [(r.profile.value, abs(r.startSample + 2400 - start) < 240) for r, start in zip(regions, starts)] == [
+        ("mfsk", True),
+        ("afsk-bell", True),
+    ]
+    assert regions[0].endSample < starts[1]
+
+    gated = scan(samples=samples, sample_rate=48000, gate="chime")
+    assert [r.json for r in gated if r.profile.value == "mfsk"][0] == {"profile": "mfsk"}
+    assert [r.json for r in gated if r.profile.value == "afsk-bell"][0] == {"profile": "afsk-bell"}
+    assert all(r.profile.value == r.json["profile"] for r in gated)
+
+
+def test_locate_bursts_ignores_tones_aliased_onto_a_chime() -> None:
+    import math
+
+    from qraudio.codec.profile import getProfileSettings
+
+    # The mfsk chime is read every 10th sample at 48 kHz; these tones would
+    # fold onto its 900 Hz and 1200 Hz halves without the low-pass.
+    settings = getProfileSettings("mfsk")
+    tone = round(settings.leadInToneMs / 1000 * 48000)
+    samples = [0.0] * 12000
+    for freq in (settings.markFreq + 4800, settings.spaceFreq + 4800):
+        samples.extend(0.5 * math.sin(2 * math.pi * freq * n / 48000) for n in range(tone))
+    samples.extend([0.0] * 12000)
+    assert locateBursts(samples=samples, sample_rate=48000, profile="mfsk") == []
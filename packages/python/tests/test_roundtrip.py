@@ -1,6 +1,10 @@
 import gzip
+import math
+import random
 
-from qraudio import PROFILE_NAMES, decode, decodeWav, encode, encodeWav, scan
+import pytest
+
+from qraudio import PROFILE_NAMES, FrameCache, decode, decodeWav, encode, encodeWav, probe, scan
 
 
 def test_roundtrip() -> None:
@@ -46,3 +50,106 @@ def test_roundtrip() -> None:
             wav_result = encodeWav(payload=payload, profile=profile)
             wav_decoded = decodeWav(wav_bytes=wav_result.wav, profile=profile)
             assert wav_decoded.json == payload
+
+
+def test_frame_cache_decodes_each_frame_once() -> None:
+    encoded = encode(payload={"cached": True, "items": list(range(50))}, gzip=True)
+    cache = FrameCache(max_entries=4)
+    first = scan(samples=encoded.samples, sample_rate=encoded.sampleRate, frame_cache=cache)
+    assert first and first[0].json == {"cached": True, "items": list(range(50))}
+    assert cache.misses == len(cache) <= 4
+    assert cache.hits > 0
+
+    misses = cache.misses
+    second = scan(samples=encoded.samples, sample_rate=encoded.sampleRate, frame_cache=cache)
+    assert [r.json for r in second] == [r.json for r in first]
+    assert cache.misses == misses
+
+
+def test_frame_cache_keys_on_the_decompressor() -> None:
+    payload = {"cached": True, "items": list(range(50))}
+    encoded = encode(payload=payload, gzip=True)
+    cache = FrameCache()
+
+    def failing(data: bytes) -> bytes:
+        raise ValueError("decompressor unavailable")
+
+    failed = scan(samples=encoded.samples, sample_rate=encoded.sampleRate, frame_cache=cache, gzip_decompress=failing)
+    assert failed == []
+    results = scan(samples=encoded.samples, sample_rate=encoded.sampleRate, frame_cache=cache)
+    assert results and results[0].json == payload
+
+
+def test_decode_search_modes() -> None:
+    early = encode(payload={"order": 1}, profile="afsk-fifth")
+    late = encode(payload={"order": 2}, profile="afsk-bell")
+    gap = [0.0] * round(early.sampleRate * 0.3)
+    combined = gap + early.samples + gap + late.samples + gap
+
+    full = decode(samples=combined, sample_rate=early.sampleRate, search="full")
+    earliest = decode(samples=combined, sample_rate=early.sampleRate, search="earliest")
+    assert full.json == earliest.json == {"order": 1}
+    assert earliest.profile == full.profile
+    assert abs(earliest.startSample - full.startSample) < 40
+
+    default = decode(samples=combined, sample_rate=early.sampleRate)
+    assert (default.json, default.startSample) == (earliest.json, earliest.startSample)
+    first = decode(samples=combined, sample_rate=early.sampleRate, search="first")
+    assert first.json in ({"order": 1}, {"order": 2})
+    only_late = decode(samples=combined, sample_rate=early.sampleRate, profile="afsk-bell")
+    assert only_late.json == {"order": 2}
+    assert only_late.startSample > len(gap) + len(early.samples)
+
+
+def test_decode_falls_back_when_hum_hides_the_burst() -> None:
+    payload = {"hum": True}
+    encoded = encode(payload=payload, profile="mfsk")
+    # Loud 60 Hz hum keeps the in-band energy under the gate threshold.
+    hum = [
+        sample + 0.4 * math.sin(2 * math.pi * 60 * index / encoded.sampleRate)
+        for index, sample in enumerate(encoded.samples)
+    ]
+    assert probe(samples=hum, sample_rate=encoded.sampleRate, profile="mfsk") == []
+    for search in ("earliest", "first", "full"):
+        assert decode(samples=hum, sample_rate=encoded.sampleRate, search=search).json == payload
+
+
+def test_shared_tone_profiles_are_told_apart_by_header() -> None:
+    afsk = encode(payload={"profile": "afsk-fifth"}, profile="afsk-fifth")
+    gfsk = encode(payload={"profile": "gfsk-fifth"}, profile="gfsk-fifth")
+    gap = [0.0] * round(afsk.sampleRate * 0.1)
+    combined = afsk.samples + gap + gfsk.samples
+
+    hits = scan(samples=combined, sample_rate=afsk.sampleRate)
+    assert {(hit.profile.value, hit.json["profile"]) for hit in hits} == {
+        ("afsk-fifth", "afsk-fifth"),
+        ("gfsk-fifth", "gfsk-fifth"),
+    }
+    only_gfsk = scan(samples=combined, sample_rate=afsk.sampleRate, profile="gfsk-fifth")
+    assert [hit.json for hit in only_gfsk] == [{"profile": "gfsk-fifth"}]
+
+
+def test_decimated_scan_finds_what_the_full_rate_scan_finds() -> None:
+    # Noise at which decimating the discriminator by 6 used to lose afsk-bell.
+    rng = random.Random(1)
+    gap = [0.0] * 4801
+    combined: list[float] = []
+    for profile in PROFILE_NAMES:
+        combined += gap + encode(payload={"profile": profile.value}, profile=profile, gzip=False).samples
+    combined += gap
+    combined = [sample + rng.gauss(0, 0.05) for sample in combined]
+
+    for engine, expected in (
+        ("correlator", {"afsk-bell", "mfsk"}),
+        ("discriminator", {"afsk-bell", "afsk-fifth", "gfsk-fifth", "mfsk"}),
+    ):
+        full = scan(samples=combined, engine=engine)
+        with pytest.warns(UserWarning, match="decimate=6 at 48000 Hz reduced"):
+            hits = scan(samples=combined, decimate=6, engine=engine)
+        # Each burst is detected by the same payloads either way.
+        assert {(hit.profile.value, hit.json["profile"]) for hit in hits} == {
+            (hit.profile.value, hit.json["profile"]) for hit in full
+        }
+        assert {hit.json["profile"] for hit in full} >= expected
+        for hit in hits:
+            assert 0 < hit.endSample <= len(combined)
@@ -0,0 +1,43 @@
+from qraudio import DEFAULT_PROFILE, PROFILE_NAMES, StreamScanner, encode, scan
+
+
+def push_in_chunks(scanner: StreamScanner, samples: list[float], sizes: list[int]) -> list:
+    results = []
+    pos = 0
+    index = 0
+    while pos < len(samples):
+        size = sizes[index % len(sizes)]
+        results.extend(scanner.push(samples[pos : pos + size]))
+        pos += size
+        index += 1
+    results.extend(scanner.flush())
+    return results
+
+
+def test_stream_scanner_matches_scan() -> None:
+    payload = {"__type": "stream", "value": 5}
+    encoded = encode(payload=payload, profile=DEFAULT_PROFILE)
+    silence = [0.0] * round(encoded.sampleRate * 0.3)
+    combined = silence + encoded.samples + silence + encoded.samples + silence
+
+    expected = scan(samples=combined, sample_rate=encoded.sampleRate, profile=DEFAULT_PROFILE)
+    scanner = StreamScanner(sample_rate=encoded.sampleRate, profile=DEFAULT_PROFILE)
+    results = push_in_chunks(scanner, combined, [512, 4096, 33])
+
+    assert [r.json for r in results] == [r.json for r in expected]
+    assert [r.startSample for r in results] == [r.startSample for r in expected]
+
+
+def test_stream_scanner_all_profiles() -> None:
+    samples: list[float] = []
+    payloads = []
+    for index, profile in enumerate(PROFILE_NAMES):
+        payload = {"profile": profile.value, "index": index}
+        payloads.append(payload)
+        samples.extend([0.0] * 9000)
+        samples.extend(encode(payload=payload, profile=profile).samples)
+
+    scanner = StreamScanner(sample_rate=48000, buffer_ms=250)
+    results = push_in_chunks(scanner, samples, [48000])
+    assert [r.json for r in results] == payloads
+    assert scanner.samplesReceived == len(samples)
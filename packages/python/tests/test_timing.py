@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from qraudio import encode, scan
+
+
+@pytest.mark.parametrize("profile", ["afsk-bell", "afsk-fifth", "gfsk-fifth", "mfsk"])
+@pytest.mark.parametrize("sample_rate", [48000, 44100])
+def test_preamble_timing_finds_payload(profile: str, sample_rate: int) -> None:
+    payload = {"__type": "timing", "profile": profile}
+    encoded = encode(payload=payload, profile=profile, sample_rate=sample_rate)
+    rng = random.Random(sample_rate)
+    lead = [rng.gauss(0.0, 0.01) for _ in range(rng.randrange(1000, 5000))]
+    combined = lead + encoded.samples + [0.0] * 2000
+
+    results = scan(samples=combined, sample_rate=sample_rate, profile=profile, timing="preamble")
+    assert [r.json for r in results] == [payload]
+
+    # The frame lands within a symbol of where the offset search puts it.
+    samples_per_symbol = sample_rate / 600
+    offsets = scan(samples=combined, sample_rate=sample_rate, profile=profile)
+    assert min(abs(r.startSample - results[0].startSample) for r in offsets) <= samples_per_symbol
+
+
+def test_acquisition_demodulates_the_signal_at_coarse_phases_only() -> None:
+    from qraudio.codec.timing import SymbolSlicer, acquireBursts
+    from qraudio.codec.toneCorrelator import ToneCorrelator
+
+    encoded = encode(payload={"__type": "timing", "noisy": True}, profile="gfsk-fifth")
+    rng = random.Random(1)
+    combined = [rng.gauss(0.0, 0.01) for _ in range(48000 * 5)] + encoded.samples + [0.0] * 2000
+    combined = [sample + rng.gauss(0.0, 0.04) for sample in combined]
+
+    class CountingCorrelator(ToneCorrelator):
+        windows = 0
+
+        def energies(self, windows, freqs):
+            self.windows += len(windows)
+            return super().energies(windows, freqs)
+
+    correlator = CountingCorrelator(combined, encoded.sampleRate, [880, 1320])
+    slicer = SymbolSlicer("afsk", [880, 1320], 1)
+    bursts = acquireBursts(correlator=correlator, slicer=slicer, samples_per_symbol=encoded.sampleRate / 1200)
+    # Flag runs broken up by noise merge into the one preamble they belong to.
+    assert len(bursts) == 1
+    # Two passes over the signal, then the phase grid over the preamble alone.
+    assert correlator.windows < 3 * len(combined) / 40
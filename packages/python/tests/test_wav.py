@@ -0,0 +1,48 @@
+import struct
+from array import array
+
+from qraudio import decode, decodeWavSamples, encode, encodeWav, encodeWavSamples, scan
+
+
+def test_encode_wav_samples_clamps_and_rounds() -> None:
+    samples = [0.0, 0.5, -0.5, 1.5, -1.5, 0.5 / 32767, 1.5 / 32767, -2.5 / 32767]
+    wav = encodeWavSamples(samples=samples, sample_rate=8000, fmt="pcm16")
+    values = struct.unpack_from(f"<{len(samples)}h", wav, 44)
+    assert list(values) == [0, 16384, -16384, 32767, -32767, 0, 2, -2]
+
+    wav = encodeWavSamples(samples=samples, sample_rate=8000, fmt="float32")
+    values = struct.unpack_from(f"<{len(samples)}f", wav, 44)
+    assert list(values) == [struct.unpack("<f", struct.pack("<f", max(-1.0, min(1.0, s))))[0] for s in samples]
+
+
+def test_encode_wav_matches_encode() -> None:
+    payload = {"__type": "wav", "value": 5}
+    for wav_format in ("pcm16", "float32"):
+        result = encodeWav(payload=payload, wav_format=wav_format, gzip=False)
+        samples = encode(payload=payload, gzip=False).samples
+        assert result.samples == samples
+        assert result.wav == encodeWavSamples(samples=samples, sample_rate=result.sampleRate, fmt=wav_format)
+        assert len(decodeWavSamples(wav_bytes=result.wav).samples) == len(samples)
+
+        lean = encodeWav(payload=payload, wav_format=wav_format, gzip=False, return_samples=False)
+        assert lean.samples == []
+        assert lean.wav == result.wav
+        assert lean.durationMs == result.durationMs
+
+
+def test_compact_sample_containers() -> None:
+    payload = {"__type": "wav", "value": 6}
+    samples = encode(payload=payload, gzip=False).samples
+    compact = encode(payload=payload, gzip=False, samples_format="array").samples
+    assert isinstance(compact, array) and compact.typecode == "f"
+    assert compact.tolist() == array("f", samples).tolist()
+
+    assert decode(samples=compact).json == payload
+    assert [hit.json for hit in scan(samples=memoryview(compact))] == [payload]
+    assert [hit.json for hit in scan(samples=array("d", samples), workers=2)] == [payload]
+
+    wav = encodeWav(payload=payload, gzip=False, samples_format="array")
+    assert wav.samples.tolist() == compact.tolist()
+    assert len(encodeWav(payload=payload, return_samples=False, samples_format="array").samples) == 0
+    decoded = decodeWavSamples(wav_bytes=wav.wav, samples_format="array")
+    assert decoded.samples.tolist() == array("f", decodeWavSamples(wav_bytes=wav.wav).samples).tolist()
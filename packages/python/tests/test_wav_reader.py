@@ -0,0 +1,109 @@
+import random
+import struct
+from pathlib import Path
+
+from qraudio import (
+    DEFAULT_PROFILE,
+    decodeWavFile,
+    decodeWavSamples,
+    encodeWav,
+    openWav,
+    scanWav,
+    scanWavFile,
+)
+
+
+def make_wav(frames: list[list[float]], sample_rate: int, fmt: str) -> bytes:
+    channels = len(frames[0])
+    bits = 32 if fmt == "float32" else 16
+    block_align = channels * bits // 8
+    data = bytearray()
+    for frame in frames:
+        for value in frame:
+            if fmt == "float32":
+                data += struct.pack("<f", value)
+            else:
+                data += struct.pack("<h", int(round(value * 32767)))
+    header = b"RIFF" + struct.pack("<I", 36 + 12 + len(data)) + b"WAVE"
+    header += b"fmt " + struct.pack(
+        "<IHHIIHH", 16, 3 if fmt == "float32" else 1, channels, sample_rate, sample_rate * block_align, block_align, bits
+    )
+    header += b"LIST" + struct.pack("<I", 4) + b"INFO"
+    return header + b"data" + struct.pack("<I", len(data)) + bytes(data)
+
+
+def test_wav_reader_matches_decode_wav_samples(tmp_path: Path) -> None:
+    rng = random.Random(3)
+    for fmt in ("pcm16", "float32"):
+        for channels in (1, 2, 3):
+            frames = [[rng.uniform(-1.0, 1.0) for _ in range(channels)] for _ in range(257)]
+            wav = make_wav(frames, 22050, fmt)
+            path = tmp_path / f"{fmt}-{channels}.wav"
+            path.write_bytes(wav)
+
+            expected = decodeWavSamples(wav_bytes=wav)
+            with openWav(path) as reader:
+                assert (reader.sampleRate, reader.channels, reader.format) == (22050, channels, fmt)
+                assert len(reader) == len(expected.samples)
+                assert list(reader[:]) == expected.samples
+                assert list(reader[100:140]) == expected.samples[100:140]
+                assert reader[-1] == expected.samples[-1]
+                blocks = [value for _, block in reader.blocks(block_frames=64) for value in block]
+                assert blocks == expected.samples
+
+
+def test_scan_wav_file_reads_mapped_file(tmp_path: Path) -> None:
+    payload = {"__type": "mmap", "value": 8}
+    encoded = encodeWav(payload=payload, profile=DEFAULT_PROFILE)
+    path = tmp_path / "payload.wav"
+    path.write_bytes(encoded.wav)
+
+    expected = scanWav(wav_bytes=encoded.wav, profile=DEFAULT_PROFILE)
+    assert scanWavFile(path=path, profile=DEFAULT_PROFILE) == expected
+    assert decodeWavFile(path=path, profile=DEFAULT_PROFILE).json == payload
+    with openWav(path) as reader:
+        assert scanWavFile(path=reader, profile=DEFAULT_PROFILE, workers=2) == expected
+
+
+def test_scan_wav_file_reads_chunks_past_bursts(tmp_path: Path, monkeypatch) -> None:
+    import sys
+
+    from qraudio import WavReader, encode, encodeWavSamples
+
+    decode_module = sys.modules["qraudio.decode"]
+    monkeypatch.setattr(decode_module, "READER_CHUNK_SECONDS", 1)
+    payload = {"__type": "chunked", "value": "x" * 200}
+    burst = encode(payload=payload, profile=DEFAULT_PROFILE, sample_rate=8000).samples
+    # The burst runs across the boundaries at 1 s and 2 s.
+    samples = [0.0] * 7000 + burst + [0.0] * 20000
+    path = tmp_path / "long.wav"
+    path.write_bytes(encodeWavSamples(samples=samples, sample_rate=8000))
+
+    reads: list[int] = []
+    read = WavReader.read
+    monkeypatch.setattr(WavReader, "read", lambda self, start, end: reads.append(end - start) or read(self, start, end))
+    hits = scanWavFile(path=path, profile=DEFAULT_PROFILE)
+    assert hits and hits[0].json == payload
+    assert hits == scanWav(wav_bytes=path.read_bytes(), profile=DEFAULT_PROFILE)
+    # No read reaches the longest-frame overlap; each follows the burst instead.
+    assert max(reads) < len(burst) + 3 * 8000
+
+
+def test_scan_wav_file_keeps_bursts_under_hum(tmp_path: Path) -> None:
+    import math
+
+    from qraudio import encode, encodeWavSamples, scan
+
+    sample_rate = 48000
+    payload = {"__type": "hum", "value": "x" * 120}
+    burst = encode(payload=payload, profile="mfsk", sample_rate=sample_rate).samples
+    samples = [0.0] * (8 * sample_rate) + list(burst) + [0.0] * (4 * sample_rate)
+    # Mains hum keeps the tones' share of the energy low while the burst is keyed.
+    samples = [value + 0.4 * math.sin(2 * math.pi * 60 * n / sample_rate) for n, value in enumerate(samples)]
+    path = tmp_path / "hum.wav"
+    path.write_bytes(encodeWavSamples(samples=samples, sample_rate=sample_rate, fmt="float32"))
+
+    mixed = decodeWavSamples(wav_bytes=path.read_bytes()).samples
+    expected = scan(samples=mixed, sample_rate=sample_rate, profile="mfsk")
+    assert expected and expected[0].json == payload
+    assert scanWavFile(path=path, profile="mfsk") == expected